@@ -0,0 +1,108 @@
+"""
+Microbenchmarks for the per-market and per-order hot paths: pricing,
+time to expiry, title parsing, EIP-712 signing and order payload building.
+
+    python benchmarks/bench_micro.py [--number 2000] [--repeat 5] [--output micro.json]
+"""
+import argparse
+import itertools
+
+import numpy as np
+
+from harness import measure, print_results, save_results
+from mock_exchange import generate_markets
+
+from analytics import ProbabilityEngine, market_deadline
+from api_client import build_order_payload
+from auth import LimitlessAuth
+from market_parser import MarketParser, parse_title
+
+def bench_pricing(number, repeat):
+    results = {
+        "calculate_probability": measure(
+            lambda: ProbabilityEngine.calculate_probability(95_000.0, 100_000.0, 0.05), number, repeat),
+    }
+    for size in (500, 5000):
+        rng = np.random.default_rng(7)
+        strikes = 95_000.0 * rng.uniform(0.6, 1.4, size)
+        expiries = rng.uniform(1 / 8760, 30 / 365, size)
+        results[f"calculate_probabilities[n={size}]"] = measure(
+            lambda: ProbabilityEngine.calculate_probabilities(95_000.0, strikes, expiries),
+            max(1, number // 20), repeat, batch=size)
+    return results
+
+def bench_expiry(number, repeat):
+    markets = generate_markets(5000)
+    deadlines = [m["deadline"] for m in markets]
+    cached = [market_deadline(m) for m in markets]
+    iso = itertools.cycle(deadlines)
+    return {
+        "get_time_to_expiry[iso]": measure(lambda: ProbabilityEngine.get_time_to_expiry(next(iso)), number, repeat),
+        "get_times_to_expiry[n=5000]": measure(
+            lambda: ProbabilityEngine.get_times_to_expiry(cached), max(1, number // 20), repeat, batch=5000),
+    }
+
+def bench_parsing(number, repeat):
+    markets = [(m["title"], m["slug"]) for m in generate_markets(number)]
+    titles = itertools.cycle(title for title, _ in markets)
+    parser = MarketParser()
+    for title, slug in markets:
+        parser.parse(title, slug)
+    hits = itertools.cycle(markets)
+    return {
+        "parse_title": measure(lambda: parse_title(next(titles)), number, repeat),
+        "MarketParser.parse[cached]": measure(lambda: parser.parse(*next(hits)), number, repeat),
+    }
+
+def bench_orders(number, repeat):
+    auth = LimitlessAuth()
+    # What login would have filled in; signing itself never touches the network
+    auth.user_data = {"id": 1, "rank": {"feeRateBps": 0}}
+    salts = itertools.count()
+    token_id = str(10**20)
+
+    def order():
+        return {
+            "salt": 1_700_000_000_000 + next(salts),
+            "maker": auth.get_address(),
+            "signer": auth.get_address(),
+            "taker": "0x0000000000000000000000000000000000000000",
+            "tokenId": token_id,
+            "makerAmount": 500_000,
+            "takerAmount": 1_000_000,
+            "expiration": "0",
+            "nonce": 0,
+            "feeRateBps": 0,
+            "side": 0,
+            "signatureType": 0,
+        }
+
+    number = max(1, number // 10)
+    return {
+        "LimitlessAuth.sign_order": measure(lambda: auth.sign_order(order()), number, repeat),
+        "build_order_payload": measure(
+            lambda: build_order_payload(auth, "bitcoin-above-0", token_id, 0, 55, 10), number, repeat),
+    }
+
+def run(number=2000, repeat=5):
+    results = {}
+    results.update(bench_pricing(number, repeat))
+    results.update(bench_expiry(number, repeat))
+    results.update(bench_parsing(number, repeat))
+    results.update(bench_orders(number, repeat))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timed repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat)
+    print_results(results)
+    if args.output:
+        save_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+End-to-end CryptoPriceStrategy scan cycle against local mock endpoints,
+as the number of active markets grows.
+
+    python benchmarks/bench_scan.py [--markets 50,500,5000] [--repeat 3] [--client both] [--output scan.json]
+
+Each cycle does a conditional catalog refresh, prices every market,
+fetches the candidates' orderbooks and sizes signals (no orders are
+placed). The client's rate limiter is lifted so the numbers reflect our
+own compute and I/O, not the venue's request budget.
+"""
+import argparse
+import asyncio
+import time
+
+from harness import print_results, save_results, summarize
+from mock_endpoints import MockEndpoints
+
+from config import Config
+from log import suppressed
+from rate_limiter import CANCEL, MARKET_DATA, ORDER, RateLimiter
+
+UNLIMITED = dict(global_rps=1e9, global_burst=1e9, category_rps={ORDER: 1e9, CANCEL: 1e9, MARKET_DATA: 1e9})
+
+def _strategy(client, mock):
+    from data_feed import DataFeed
+    from market_catalog import MarketCatalog
+    from strategies.crypto_strategy import CryptoPriceStrategy
+
+    client.limiter = RateLimiter(**UNLIMITED)
+    data_feed = DataFeed(stale_after=3600)
+    data_feed.BASE_URL = mock.binance_url
+    catalog = MarketCatalog(client, page_size=500, refresh_interval=0)
+    return CryptoPriceStrategy(client, data_feed=data_feed, catalog=catalog), catalog
+
+def bench_sync(mock, repeat):
+    from api_client import LimitlessClient
+
+    client = LimitlessClient()
+    try:
+        strategy, catalog = _strategy(client, mock)
+        catalog.refresh()
+        strategy.run()  # warm up: prices, parser cache, connections
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            strategy.run()
+            samples.append((time.perf_counter() - start) * 1e3)
+        return samples
+    finally:
+        client.close()
+
+def bench_async(mock, repeat):
+    from async_client import AsyncLimitlessClient
+
+    async def run():
+        async with AsyncLimitlessClient() as client:
+            strategy, catalog = _strategy(client, mock)
+            await catalog.refresh_async()
+            await strategy.run_async()
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await strategy.run_async()
+                samples.append((time.perf_counter() - start) * 1e3)
+            return samples
+    return asyncio.run(run())
+
+def run(sizes=(50, 500, 5000), repeat=3, clients=("sync", "async")):
+    results = {}
+    for size in sizes:
+        with MockEndpoints(markets=size) as mock:
+            Config.API_URL = mock.url
+            for kind in clients:
+                bench = bench_sync if kind == "sync" else bench_async
+                requests_before = mock.requests
+                with suppressed():
+                    samples = bench(mock, repeat)
+                results[f"scan_cycle[{kind},markets={size}]"] = summarize(
+                    samples, unit="ms", markets=size, client=kind,
+                    requests_per_cycle=(mock.requests - requests_before) / (repeat + 1),
+                )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--markets", default="50,500,5000", help="Comma-separated market counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed cycles per market count")
+    parser.add_argument("--client", choices=("sync", "async", "both"), default="both")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    clients = ("sync", "async") if args.client == "both" else (args.client,)
+    results = run([int(n) for n in args.markets.split(",")], args.repeat, clients)
+    print_results(results)
+    if args.output:
+        save_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Scan throughput of the CPU-bound part of a cycle (parse + price every
+market) as it is split over worker processes, the way SHARDS does.
+
+    python benchmarks/bench_sharding.py [--markets 5000] [--shards 1,2,4] [--cycles 20] [--output sharding.json]
+
+Every worker reads prices from one SharedPrices block and evaluates only
+its Shard of the catalog. Throughput should grow close to linearly until
+the shard count reaches the number of cores.
+"""
+import argparse
+import multiprocessing
+import time
+
+from harness import print_results, save_results, summarize
+from mock_exchange import SPOT, generate_markets
+
+from sharding import Shard, SharedPriceFeed, SharedPrices
+
+def evaluate_shard(index, count, prices_spec, markets, cycles, results):
+    from strategies.crypto_strategy import CryptoPriceStrategy
+
+    prices = SharedPrices.attach(prices_spec)
+    try:
+        strategy = CryptoPriceStrategy(None, data_feed=SharedPriceFeed(prices, stale_after=float("inf")),
+                                       shard=Shard(index, count))
+        owned = strategy.owned_markets(markets)
+        strategy.evaluate_markets(owned)  # warm the parser cache
+        start = time.perf_counter()
+        for _ in range(cycles):
+            strategy.evaluate_markets(owned)
+        results.put((len(owned) * cycles, time.perf_counter() - start))
+    finally:
+        prices.close()
+
+def run(markets=5000, shards=(1, 2, 4), cycles=20):
+    context = multiprocessing.get_context("spawn")
+    catalog = generate_markets(markets)
+    prices = SharedPrices()
+    now = time.time()
+    for pair, price in SPOT.items():
+        prices.publish(pair, price, now, (0.0, 0.6, [0.6] * len(prices.horizons)))
+    results = {}
+    try:
+        for count in shards:
+            queue = context.Queue()
+            workers = [context.Process(target=evaluate_shard, args=(i, count, prices.spec(), catalog, cycles, queue))
+                       for i in range(count)]
+            for worker in workers:
+                worker.start()
+            done = [queue.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            # Workers run side by side, so the slowest one sets the pace
+            rate = sum(n for n, _ in done) / max(elapsed for _, elapsed in done)
+            results[f"shard_scan[shards={count},markets={markets}]"] = summarize(
+                [rate], unit="markets/s", shards=count, markets=markets, cycles=cycles)
+    finally:
+        prices.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--markets", type=int, default=5000)
+    parser.add_argument("--shards", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--cycles", type=int, default=20, help="Scans per worker")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    results = run(args.markets, [int(n) for n in args.shards.split(",")], args.cycles)
+    print_results(results)
+    print(f"({multiprocessing.cpu_count()} cores)")
+    if args.output:
+        save_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Per-order EIP-712 signing cost: encode_typed_data path vs OrderSigner.
+
+    python benchmarks/bench_signing.py [--orders 500] [--processes 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Throwaway key so the benchmark never needs a real wallet
+os.environ.setdefault("PRIVATE_KEY", "0x" + "11" * 32)
+
+from auth import LimitlessAuth
+
+def make_orders(auth, count):
+    address = auth.get_address()
+    return [{
+        "salt": 1_700_000_000_000 + i,
+        "maker": address,
+        "signer": address,
+        "taker": "0x0000000000000000000000000000000000000000",
+        "tokenId": str(10**70 + i),
+        "makerAmount": 500_000 + i,
+        "takerAmount": 1_000_000,
+        "expiration": "0",
+        "nonce": 0,
+        "feeRateBps": 0,
+        "side": i % 2,
+        "signatureType": 0,
+    } for i in range(count)]
+
+def per_order_us(fn, orders):
+    start = time.perf_counter()
+    for order in orders:
+        fn(order)
+    return (time.perf_counter() - start) / len(orders) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    auth = LimitlessAuth()
+    orders = make_orders(auth, args.orders)
+    assert auth.sign_order(orders[0]) == auth.sign_order_reference(orders[0])
+
+    reference = per_order_us(auth.sign_order_reference, orders)
+    fast = per_order_us(auth.sign_order, orders)
+    digest = per_order_us(auth.signer.digest, orders)
+
+    print(f"encode_typed_data + sign_message: {reference:9.1f} us/order")
+    print(f"OrderSigner.sign:                 {fast:9.1f} us/order  ({reference / fast:.1f}x)")
+    print(f"  of which hashing (digest):      {digest:9.1f} us/order")
+
+    if args.processes > 1:
+        auth.sign_orders(orders[:args.processes * 2], processes=args.processes)  # warm the pool
+        start = time.perf_counter()
+        auth.sign_orders(orders, processes=args.processes)
+        batch = (time.perf_counter() - start) / len(orders) * 1e6
+        auth.signer.close()
+        print(f"sign_orders ({args.processes} processes):       {batch:9.1f} us/order")
+
+if __name__ == "__main__":
+    main()
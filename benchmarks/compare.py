@@ -0,0 +1,58 @@
+"""
+Compare two benchmark result files by median and flag regressions.
+
+    python benchmarks/compare.py baseline.json candidate.json [--threshold 0.10]
+
+Exits non-zero when any benchmark is more than `threshold` slower, so it
+can gate a CI job.
+"""
+import argparse
+import json
+import sys
+
+def compare(baseline, candidate, threshold=0.10):
+    """Rows of (name, base median, new median, ratio, status) for benchmarks in both runs."""
+    rows = []
+    for name in sorted(set(baseline) | set(candidate)):
+        if name not in baseline or name not in candidate:
+            rows.append((name, baseline.get(name, {}).get("median"), candidate.get(name, {}).get("median"),
+                         None, "only in " + ("candidate" if name in candidate else "baseline")))
+            continue
+        old, new = baseline[name]["median"], candidate[name]["median"]
+        ratio = new / old if old else float("inf")
+        if ratio > 1 + threshold:
+            status = "SLOWER"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = ""
+        rows.append((name, old, new, ratio, status))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change treated as significant")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"baseline  {baseline['meta'].get('revision')}  {baseline['meta'].get('timestamp')}")
+    print(f"candidate {candidate['meta'].get('revision')}  {candidate['meta'].get('timestamp')}")
+    rows = compare(baseline["results"], candidate["results"], args.threshold)
+    width = max((len(row[0]) for row in rows), default=0)
+    for name, old, new, ratio, status in rows:
+        if ratio is None:
+            print(f"{name:<{width}}  {status}")
+        else:
+            print(f"{name:<{width}}  {old:12.2f} -> {new:12.2f}  {ratio:6.2f}x  {status}")
+
+    if any(row[4] == "SLOWER" for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Shared timing and result helpers for the benchmark scripts.
+
+Results are JSON so runs from different versions can be diffed with
+compare.py:
+
+    {"meta": {...}, "results": {"<name>": {"unit": "us", "median": ..., ...}}}
+"""
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Throwaway key so the benchmarks never need a real wallet
+os.environ.setdefault("PRIVATE_KEY", "0x" + "11" * 32)
+
+def measure(fn, number=1000, repeat=5, warmup=1, **params):
+    """
+    Time `number` calls of fn, `repeat` times, and return per-call
+    statistics in microseconds. The median is the figure to compare; min
+    shows the noise-free floor. Extra keyword arguments are recorded with
+    the result (e.g. batch size).
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return summarize(samples, number=number, **params)
+
+def summarize(samples, unit="us", **params):
+    return {
+        "unit": unit,
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "repeat": len(samples),
+        **params,
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def metadata():
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+def save_results(path, results):
+    """Write results with run metadata; returns the document written."""
+    document = {"meta": metadata(), "results": results}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return document
+
+def print_results(results):
+    width = max((len(name) for name in results), default=0)
+    for name, result in results.items():
+        print(f"{name:<{width}}  median {result['median']:12.2f} {result['unit']}  "
+              f"(min {result['min']:.2f}, stdev {result['stdev']:.2f})")
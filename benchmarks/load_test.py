@@ -0,0 +1,137 @@
+"""
+Load test the async client stack against the mock exchange.
+
+    python benchmarks/load_test.py [--workers 64] [--duration 10] [--markets 500]
+                                   [--latency-ms 2] [--error-rate 0.01] [--rate-limit 2000] [--url URL]
+
+The mock runs in its own process (or pass --url to use one already
+running), so client and server don't share a GIL. Each worker loops over
+a mix of orderbook reads, order placements and cancels through
+AsyncLimitlessClient, with retries, re-login and rate limiting live.
+"""
+import argparse
+import asyncio
+import collections
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from harness import save_results, summarize
+
+from async_client import AsyncLimitlessClient
+from log import suppressed
+from metrics import METRICS
+from mock_exchange import generate_markets
+from rate_limiter import CANCEL, MARKET_DATA, ORDER, RateLimiter
+
+UNLIMITED = dict(global_rps=1e9, global_burst=1e9, category_rps={ORDER: 1e9, CANCEL: 1e9, MARKET_DATA: 1e9})
+
+def spawn_exchange(args):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    command = [
+        sys.executable, os.path.join(os.path.dirname(__file__), "..", "src", "mock_exchange.py"),
+        "--port", str(port), "--markets", str(args.markets),
+        "--latency-ms", str(args.latency_ms), "--error-rate", str(args.error_rate),
+    ]
+    if args.rate_limit:
+        command += ["--rate-limit", str(args.rate_limit)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while True:
+        try:
+            urllib.request.urlopen(f"{url}/auth/signing-message", timeout=1)
+            return process, url
+        except OSError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                raise RuntimeError("Mock exchange did not start")
+            time.sleep(0.1)
+
+async def worker(client, markets, stop_at, outcomes, rng):
+    placed = []
+    while time.monotonic() < stop_at:
+        market = rng.choice(markets)
+        roll = rng.random()
+        try:
+            if roll < 0.8:
+                op = "orderbook"
+                await client.get_orderbook(market["slug"])
+            elif roll < 0.95 or not placed:
+                op = "order"
+                order = await client.create_order(
+                    market["slug"], market["tokens"]["yes"], rng.randint(0, 1), rng.randint(5, 95), rng.randint(1, 20))
+                if order.get("remainingSize"):
+                    placed.append(order["id"])
+            else:
+                op = "cancel"
+                await client.cancel_orders([placed.pop()])
+            outcomes[op, "ok"] += 1
+        except Exception:
+            outcomes[op, "error"] += 1
+
+async def run(url, args):
+    markets = generate_markets(args.markets)
+    outcomes = collections.Counter()
+    client = AsyncLimitlessClient(pool_size=args.workers, max_concurrency=args.workers)
+    client.api_url = client.auth.api_url = url
+    if not args.client_limits:
+        client.limiter = RateLimiter(**UNLIMITED)
+    async with client:
+        rng = random.Random(args.seed)
+        stop_at = time.monotonic() + args.duration
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, markets, stop_at, outcomes, random.Random(rng.random()))
+                               for _ in range(args.workers)))
+        elapsed = time.perf_counter() - start
+    return outcomes, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Use a mock exchange that is already running")
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--markets", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, help="Server-side requests per second before 429s")
+    parser.add_argument("--client-limits", action="store_true", help="Keep the client's configured rate limits")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    process, url = (None, args.url) if args.url else spawn_exchange(args)
+    try:
+        with suppressed():
+            outcomes, elapsed = asyncio.run(run(url, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    total = sum(outcomes.values())
+    print(f"{total} operations in {elapsed:.1f}s: {total / elapsed:,.0f} ops/s with {args.workers} workers")
+    for (op, result), count in sorted(outcomes.items()):
+        print(f"  {op:<10} {result:<6} {count}")
+    results = {}
+    for entry in METRICS.snapshot().get("http_request_seconds", []):
+        labels = entry["labels"]
+        print(f"  {labels['method']:<6} {labels['endpoint']:<32} n={entry['count']:<7} "
+              f"p50={entry['p50'] * 1e3:7.2f}ms  p99={entry['p99'] * 1e3:7.2f}ms")
+        results[f"http[{labels['method']} {labels['endpoint']}]"] = {
+            **summarize([entry["p50"] * 1e3], unit="ms", count=entry["count"]), "p99": entry["p99"] * 1e3,
+        }
+    for entry in METRICS.snapshot().get("http_retries_total", []):
+        print(f"  retries ({entry['labels']['reason']}): {entry['value']}")
+    if args.output:
+        results["throughput"] = {**summarize([total / elapsed], unit="ops/s"), "workers": args.workers}
+        save_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Local stand-ins for the Limitless API and the Binance price endpoint, so
+benchmarks run offline and repeatably.
+
+    with MockEndpoints(markets=500) as mock:
+        Config.API_URL = mock.url
+        data_feed.BASE_URL = mock.binance_url
+
+The Limitless side is src/mock_exchange.py; this adds Binance's
+/api/v3/ticker/price on the same server. Markets and books are generated
+from a seed, so every run sees the same data.
+"""
+from aiohttp import web
+
+import harness  # noqa: F401  (puts src on the path)
+from mock_exchange import SPOT, MockExchange
+
+class MockEndpoints(MockExchange):
+    def __init__(self, markets=50, seed=7, **faults):
+        super().__init__(markets=markets, seed=seed, **faults)
+        self.app.router.add_get("/api/v3/ticker/price", self.ticker_price)
+
+    @property
+    def binance_url(self):
+        return f"{self.url}/api/v3"
+
+    async def ticker_price(self, request):
+        symbol = request.query.get("symbol", "")
+        if symbol not in SPOT:
+            return web.json_response({"msg": "Invalid symbol."}, status=400)
+        return web.json_response({"symbol": symbol, "price": str(SPOT[symbol])})
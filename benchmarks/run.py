@@ -0,0 +1,36 @@
+"""
+Run the whole benchmark suite offline and save one results file.
+
+    python benchmarks/run.py [--output benchmarks/results/<rev>.json] [--markets 50,500,5000] [--quick]
+
+Compare two runs with compare.py.
+"""
+import argparse
+import os
+
+import bench_micro
+import bench_scan
+from harness import git_revision, print_results, save_results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<revision>.json)")
+    parser.add_argument("--markets", default="50,500,5000", help="Comma-separated market counts for the scan")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations and only 50 markets; for smoke runs")
+    args = parser.parse_args()
+
+    sizes = [50] if args.quick else [int(n) for n in args.markets.split(",")]
+    repeat = 2 if args.quick else args.repeat
+    results = {}
+    results.update(bench_micro.run(number=200 if args.quick else 2000, repeat=repeat))
+    results.update(bench_scan.run(sizes, repeat=repeat))
+    print_results(results)
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"{git_revision() or 'unknown'}.json")
+    save_results(output, results)
+    print(f"Saved {output}")
+
+if __name__ == "__main__":
+    main()
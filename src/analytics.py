@@ -1,5 +1,69 @@
+import datetime
+import functools
 import math
 import time
+import numpy as np
+try:
+    from .metrics import timer
+    from .log import get_logger
+    from .volatility import SECONDS_PER_YEAR
+except ImportError:
+    from metrics import timer
+    from log import get_logger
+    from volatility import SECONDS_PER_YEAR
+
+logger = get_logger("analytics")
+
+# Abramowitz & Stegun 7.1.26 coefficients for erf (|error| < 1.5e-7)
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+_INV_SQRT_2 = 1.0 / math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+# Wall clock at import minus the monotonic clock; see monotonic_time()
+_EPOCH_OFFSET = time.time() - time.monotonic()
+
+def monotonic_time():
+    """
+    Epoch seconds that never step: the wall clock sampled once at import,
+    advanced by time.monotonic(). An NTP correction mid-run can't make every
+    market's time to expiry jump at once.
+    """
+    return _EPOCH_OFFSET + time.monotonic()
+
+@functools.lru_cache(maxsize=8192)
+def parse_deadline(deadline_iso):
+    """
+    ISO-8601 deadline ("2024-12-31T23:59:59Z", or with an offset) as a UTC
+    epoch float, or None if missing/unparseable. Naive times are taken as UTC.
+    Memoized, since the same deadlines come back every cycle.
+    """
+    if not deadline_iso or not isinstance(deadline_iso, str):
+        return None
+    if deadline_iso.endswith("Z"):
+        deadline_iso = deadline_iso[:-1] + "+00:00"
+    try:
+        deadline = datetime.datetime.fromisoformat(deadline_iso)
+    except ValueError:
+        return None
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=datetime.timezone.utc)
+    return deadline.timestamp()
+
+def market_deadline(market):
+    """
+    A market's deadline as an epoch float (None if unknown), parsed on first
+    use and cached on the record under "_deadline_ts", the key MarketCatalog
+    fills in when it indexes a market.
+    """
+    try:
+        return market["_deadline_ts"]
+    except KeyError:
+        pass
+    deadline = market["_deadline_ts"] = parse_deadline(market.get("deadline"))
+    if deadline is None and market.get("deadline"):
+        logger.warning("Unparseable deadline for %s: %r", market.get("slug"), market["deadline"])
+    return deadline
 
 class ProbabilityEngine:
     """
@@ -43,25 +107,105 @@ class ProbabilityEngine:
             return 0.0
 
     @staticmethod
-    def get_time_to_expiry(deadline_iso):
+    def norm_cdf_array(x):
+        """Vectorized standard normal CDF (NumPy has no erf)."""
+        z = np.abs(x) * _INV_SQRT_2
+        t = 1.0 / (1.0 + _ERF_P * z)
+        a1, a2, a3, a4, a5 = _ERF_A
+        poly = t * (a1 + t * (a2 + t * (a3 + t * (a4 + t * a5))))
+        erf = 1.0 - poly * np.exp(-z * z)
+        return 0.5 * (1.0 + np.copysign(erf, x))
+
+    @staticmethod
+    @timer("probability_seconds", method="vectorized")
+    def calculate_probabilities(current_prices, strike_prices, times_to_expiry_years, volatilities=0.6,
+                                risk_free_rate=0.05, greeks=False):
+        """
+        Batch version of calculate_probability: N(d2) for arrays of inputs in
+        one vectorized pass. Inputs broadcast against each other, so a single
+        spot can be priced against many strikes/expiries.
+
+        Edge cases match the scalar version: T <= 0 settles to 1.0/0.0 on
+        S > K, and non-positive prices or volatility give 0.0.
+
+        :param greeks: Also return sensitivities of N(d2)
+        :return: probability array, or a dict with "probability", "delta",
+                 "gamma" and "vega" arrays when greeks=True
+        """
+        S, K, T, sigma = np.broadcast_arrays(
+            np.asarray(current_prices, dtype=float),
+            np.asarray(strike_prices, dtype=float),
+            np.asarray(times_to_expiry_years, dtype=float),
+            np.asarray(volatilities, dtype=float),
+        )
+        r = risk_free_rate
+
+        expired = T <= 0
+        valid = ~expired & (S > 0) & (K > 0) & (sigma > 0)
+
+        # Substitute harmless values in masked-out slots so the math below
+        # never sees log(<=0) or division by zero
+        S_v = np.where(valid, S, 1.0)
+        K_v = np.where(valid, K, 1.0)
+        T_v = np.where(valid, T, 1.0)
+        sigma_v = np.where(valid, sigma, 1.0)
+
+        sigma_sqrt_t = sigma_v * np.sqrt(T_v)
+        d2 = (np.log(S_v / K_v) + (r - 0.5 * sigma_v ** 2) * T_v) / sigma_sqrt_t
+
+        prob = np.where(valid, ProbabilityEngine.norm_cdf_array(d2), 0.0)
+        prob = np.where(expired, (S > K).astype(float), prob)
+
+        if not greeks:
+            return prob
+
+        # Sensitivities of N(d2) (the binary's value, not a vanilla call)
+        pdf = np.exp(-0.5 * d2 * d2) * _INV_SQRT_2PI
+        d1 = d2 + sigma_sqrt_t
+        delta = pdf / (S_v * sigma_sqrt_t)
+        gamma = -pdf * d1 / (S_v * S_v * sigma_sqrt_t * sigma_sqrt_t)
+        vega = -pdf * d1 / sigma_v
+
+        return {
+            "probability": prob,
+            "delta": np.where(valid, delta, 0.0),
+            "gamma": np.where(valid, gamma, 0.0),
+            "vega": np.where(valid, vega, 0.0),
+        }
+
+    @staticmethod
+    def get_time_to_expiry(deadline, now=None):
+        """
+        Years from now to a deadline, floored at 0 (also 0 if it is unknown).
+
+        :param deadline: ISO-8601 string or epoch seconds (see market_deadline)
+        :param now: Epoch seconds to measure from (defaults to monotonic_time();
+                    the backtester passes its simulated time)
+        """
+        if isinstance(deadline, str):
+            deadline = parse_deadline(deadline)
+        if deadline is None:
+            return 0.0
+        if now is None:
+            now = monotonic_time()
+        return max(0.0, (deadline - now) / SECONDS_PER_YEAR)
+
+    @staticmethod
+    def get_times_to_expiry(deadlines, now=None):
         """
-        Calculate years to expiry from ISO timestamp.
+        Batch version of get_time_to_expiry, measuring every deadline from
+        the same `now` (one clock read for a whole scan).
+
+        :param deadlines: Epoch seconds (None/NaN where unknown) or ISO strings
+        :return: array of years to expiry, 0.0 for past or unknown deadlines
         """
         try:
-            # Simple parsing, assuming UTC "Z" or similar
-            # For robustness, we might want dateutil, but let's try basic strptime
-            # Format example: "2024-12-31T23:59:59Z"
-            import datetime
-            
-            # Remove Z if present
-            deadline_iso = deadline_iso.replace("Z", "+00:00")
-            
-            deadline = datetime.datetime.fromisoformat(deadline_iso)
-            now = datetime.datetime.now(datetime.timezone.utc)
-            
-            diff = deadline - now
-            years = diff.total_seconds() / (365.25 * 24 * 60 * 60)
-            return max(0, years)
-        except Exception as e:
-            print(f"[Analytics] Error parsing deadline {deadline_iso}: {e}")
-            return 0
+            deadlines = np.asarray(deadlines, dtype=float)
+        except (TypeError, ValueError):
+            # ISO strings in the mix
+            deadlines = np.asarray([parse_deadline(d) if isinstance(d, str) else d for d in deadlines], dtype=float)
+        if now is None:
+            now = monotonic_time()
+        years = (deadlines - now) / SECONDS_PER_YEAR
+        # NaN (unknown) compares False, so it lands on 0.0 too
+        return np.where(years > 0, years, 0.0)
@@ -1,24 +1,229 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 try:
     from .config import Config
     from .auth import LimitlessAuth
+    from .session_manager import SessionManager
+    from .rate_limiter import RateLimiter, classify
+    from .metrics import METRICS, route
+    from .log import get_logger
 except ImportError:
     from config import Config
     from auth import LimitlessAuth
+    from session_manager import SessionManager
+    from rate_limiter import RateLimiter, classify
+    from metrics import METRICS, route
+    from log import get_logger
+
+logger = get_logger("api_client")
+
+def build_unsigned_order(auth, token_id, side, price_cents, amount_shares, expiration_ts=0, salt=None):
+    """
+    Build the EIP-712 Order fields for a GTC order, before signing.
+    Returns (order_payload, price_dollars).
+    """
+    # 1. Prepare Order Data
+    user_address = auth.get_address()
+    if salt is None:
+        salt = int(time.time() * 1000) + (24 * 60 * 60 * 1000) # 24h validity for salt
+    
+    # Amounts calculation (USDC has 6 decimals)
+    scaling_factor = 1_000_000
+    price_dollars = price_cents / 100.0
+    
+    # Maker amount = what we give. Taker amount = what we get.
+    # This logic depends on BUY vs SELL and how the contract expects it.
+    # Based on docs:
+    # BUY (side 0): Maker gives USDC, Taker gives Shares.
+    # SELL (side 1): Maker gives Shares, Taker gives USDC.
+    
+    # However, the API/Contract often simplifies this to "makerAmount" and "takerAmount" 
+    # relative to the asset being traded vs the quote currency.
+    # Let's follow the Python example logic:
+    # makerAmount = cost in USDC (if buying)
+    # takerAmount = amount of shares (if buying)
+    
+    total_cost_usdc = price_dollars * amount_shares
+    
+    if side == 0: # BUY
+        maker_amount = int(total_cost_usdc * scaling_factor)
+        taker_amount = int(amount_shares * scaling_factor)
+    else: # SELL
+        # If selling, we give shares (makerAmount) and want USDC (takerAmount)
+        maker_amount = int(amount_shares * scaling_factor)
+        taker_amount = int(total_cost_usdc * scaling_factor)
+
+    fee_rate_bps = auth.user_data.get("rank", {}).get("feeRateBps", 0)
+
+    order_payload = {
+        "salt": salt,
+        "maker": user_address,
+        "signer": user_address,
+        "taker": "0x0000000000000000000000000000000000000000",
+        "tokenId": str(token_id),
+        "makerAmount": maker_amount,
+        "takerAmount": taker_amount,
+        "expiration": str(expiration_ts),
+        "nonce": 0,
+        "feeRateBps": fee_rate_bps,
+        "side": side,
+        "signatureType": 0, # EOA
+    }
+
+    return order_payload, price_dollars
+
+def wrap_signed_order(auth, market_slug, order_payload, price_dollars, signature):
+    """Wrap a signed order into the POST /orders body."""
+    if not signature.startswith("0x"):
+        signature = "0x" + signature
+
+    return {
+        "order": {
+            **order_payload,
+            "price": price_dollars,
+            "signature": signature
+        },
+        "ownerId": auth.user_data["id"],
+        "orderType": "GTC",
+        "marketSlug": market_slug
+    }
+
+def build_order_payload(auth, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+    """
+    Build and sign the POST /orders body for a single GTC order.
+    Shared by the sync and async clients so both submit identical payloads.
+    """
+    order_payload, price_dollars = build_unsigned_order(auth, token_id, side, price_cents, amount_shares, expiration_ts)
+    signature = auth.sign_order(order_payload)
+    return wrap_signed_order(auth, market_slug, order_payload, price_dollars, signature)
+
+def build_order_payloads(auth, orders, processes=None):
+    """
+    Build and sign POST /orders bodies for a batch of orders.
+    Each order is a dict with market_slug, token_id, side, price_cents,
+    amount_shares and optionally expiration_ts. Salts are made unique
+    within the batch, and signing goes through auth.sign_orders.
+    """
+    base_salt = int(time.time() * 1000) + (24 * 60 * 60 * 1000)
+    unsigned = [
+        build_unsigned_order(
+            auth, order["token_id"], order["side"], order["price_cents"], order["amount_shares"],
+            order.get("expiration_ts", 0), salt=base_salt + i,
+        )
+        for i, order in enumerate(orders)
+    ]
+    signatures = auth.sign_orders([payload for payload, _ in unsigned], processes=processes)
+    return [
+        wrap_signed_order(auth, order["market_slug"], payload, price_dollars, signature)
+        for order, (payload, price_dollars), signature in zip(orders, unsigned, signatures)
+    ]
+
+def resting_order_key(order):
+    """
+    (token_id, side, price_cents) for an open order returned by the API.
+    Side is normalized to 0 (BUY) / 1 (SELL).
+    """
+    token_id = order.get("tokenId", order.get("token"))
+    side = order.get("side")
+    if isinstance(side, str):
+        side = 0 if side.upper() == "BUY" else 1
+    return str(token_id), int(side), int(round(float(order["price"]) * 100))
+
+def resting_order_size(order):
+    for field in ("remainingSize", "size", "originalSize"):
+        if order.get(field) is not None:
+            return float(order[field])
+    return 0.0
+
+def diff_quotes(resting_orders, desired_quotes, size_tolerance=1e-6):
+    """
+    Compare resting orders with the quotes we want in a market.
+    Quotes are dicts with token_id, side, price_cents and amount_shares.
+    A resting order is kept when a desired quote has the same token, side,
+    price and size. Returns (keep, cancel, place): resting orders to leave
+    alone, resting orders to cancel, and desired quotes to submit.
+    """
+    wanted = {}
+    for quote in desired_quotes:
+        key = (str(quote["token_id"]), int(quote["side"]), int(quote["price_cents"]))
+        wanted.setdefault(key, []).append(quote)
+
+    keep, cancel = [], []
+    for order in resting_orders:
+        key = resting_order_key(order)
+        matches = wanted.get(key, [])
+        size = resting_order_size(order)
+        for i, quote in enumerate(matches):
+            if abs(quote["amount_shares"] - size) <= size_tolerance:
+                keep.append(order)
+                del matches[i]
+                break
+        else:
+            cancel.append(order)
+
+    place = [quote for quotes in wanted.values() for quote in quotes]
+    return keep, cancel, place
 
 class LimitlessClient:
     def __init__(self):
         self.auth = LimitlessAuth()
         self.api_url = Config.API_URL
         self.session = requests.Session()
-        # Initial login
-        self.refresh_session()
+        # Login happens in the background and is renewed before the cookie
+        # expires; the first request waits for it if it hasn't finished
+        self.sessions = SessionManager(self.auth, self._install_cookie)
+        self.sessions.start_background()
+        self.limiter = RateLimiter()
+        # Optional MarketDataRecorder that receives every orderbook fetched
+        self.recorder = None
 
-    def refresh_session(self):
-        cookie = self.auth.login()
+    def _install_cookie(self, cookie):
         self.session.cookies.set("limitless_session", cookie)
 
+    def refresh_session(self):
+        self.sessions.refresh()
+
+    def close(self):
+        self.sessions.stop_background()
+        self.session.close()
+
+    def _request(self, method, path, **kwargs):
+        """
+        Send an authenticated, rate-limited request. A 401 triggers one
+        re-login and exactly one retry; a 429 is retried after the
+        limiter's backoff, up to RATE_LIMIT_MAX_RETRIES times.
+        """
+        category = classify(method, path)
+        endpoint = route(path)
+        cookie = self.sessions.ensure()
+        kwargs.setdefault("timeout", Config.HTTP_TIMEOUT)
+        url = f"{self.api_url}{path}"
+        reauthed = False
+        retries = 0
+        with METRICS.timer("http_request_seconds", method=method, endpoint=endpoint).time():
+            while True:
+                self.limiter.acquire(category)
+                METRICS.counter("http_requests_total", method=method, endpoint=endpoint).inc()
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except requests.RequestException:
+                    METRICS.counter("http_errors_total", method=method, endpoint=endpoint).inc()
+                    raise
+                backoff = self.limiter.on_response(response.status_code, response.headers)
+                if backoff is not None and retries < Config.RATE_LIMIT_MAX_RETRIES:
+                    METRICS.counter("http_retries_total", reason="rate_limit").inc()
+                    retries += 1
+                    continue
+                if response.status_code == 401 and not reauthed:
+                    METRICS.counter("http_retries_total", reason="auth").inc()
+                    cookie = self.sessions.refresh(stale_cookie=cookie)
+                    reauthed = True
+                    continue
+                if response.status_code >= 400:
+                    METRICS.counter("http_errors_total", method=method, endpoint=endpoint).inc()
+                return response
+
     def _get_headers(self):
         return {
             "Content-Type": "application/json",
@@ -28,23 +233,63 @@ class LimitlessClient:
     def get_active_markets(self, limit=100):
         """Retrieve active markets."""
         params = {"limit": limit, "sortBy": "newest"}
-        response = self.session.get(f"{self.api_url}/markets/active", params=params)
+        response = self._request("GET", "/markets/active", params=params)
         response.raise_for_status()
         return response.json()
 
+    def get_active_markets_page(self, page=1, limit=100, etag=None, last_modified=None):
+        """
+        Retrieve one page of active markets, newest first.
+        Sends If-None-Match / If-Modified-Since when given.
+        Returns (payload, etag, last_modified); payload is None on 304 Not Modified.
+        """
+        params = {"page": page, "limit": limit, "sortBy": "newest"}
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = self._request("GET", "/markets/active", params=params, headers=headers)
+        if response.status_code == 304:
+            return None, etag, last_modified
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag"), response.headers.get("Last-Modified")
+
     def get_market_details(self, slug):
         """Get details for a specific market."""
-        response = self.session.get(f"{self.api_url}/markets/{slug}")
+        response = self._request("GET", f"/markets/{slug}")
         response.raise_for_status()
         return response.json()
 
     def get_orderbook(self, slug):
         """Get orderbook for a market."""
-        response = self.session.get(f"{self.api_url}/markets/{slug}/orderbook")
+        response = self._request("GET", f"/markets/{slug}/orderbook")
         if response.status_code == 404:
             return None
         response.raise_for_status()
-        return response.json()
+        book = response.json()
+        if self.recorder is not None:
+            self.recorder.record_snapshot(slug, book)
+        return book
+
+    def get_orderbooks(self, slugs):
+        """
+        Get orderbooks for several markets, keyed by slug.
+        The sync client fetches them one after another; AsyncLimitlessClient
+        provides the concurrent version.
+        """
+        return {slug: self.get_orderbook(slug) for slug in slugs}
+
+    def build_order_payload(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        """
+        Build and sign the POST /orders body for a single GTC order.
+        side: 0 for BUY, 1 for SELL
+        price_cents: Limit price in cents (e.g. 50 for $0.50)
+        amount_shares: Number of shares
+        """
+        # Needs user_data from login (owner id, fee rate)
+        self.sessions.ensure()
+        return build_order_payload(self.auth, market_slug, token_id, side, price_cents, amount_shares, expiration_ts)
 
     def create_order(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
         """
@@ -53,84 +298,108 @@ class LimitlessClient:
         price_cents: Limit price in cents (e.g. 50 for $0.50)
         amount_shares: Number of shares
         """
-        # 1. Prepare Order Data
-        user_address = self.auth.get_address()
-        salt = int(time.time() * 1000) + (24 * 60 * 60 * 1000) # 24h validity for salt
-        
-        # Amounts calculation (USDC has 6 decimals)
-        scaling_factor = 1_000_000
-        price_dollars = price_cents / 100.0
-        
-        # Maker amount = what we give. Taker amount = what we get.
-        # This logic depends on BUY vs SELL and how the contract expects it.
-        # Based on docs:
-        # BUY (side 0): Maker gives USDC, Taker gives Shares.
-        # SELL (side 1): Maker gives Shares, Taker gives USDC.
-        
-        # However, the API/Contract often simplifies this to "makerAmount" and "takerAmount" 
-        # relative to the asset being traded vs the quote currency.
-        # Let's follow the Python example logic:
-        # makerAmount = cost in USDC (if buying)
-        # takerAmount = amount of shares (if buying)
-        
-        total_cost_usdc = price_dollars * amount_shares
-        
-        if side == 0: # BUY
-            maker_amount = int(total_cost_usdc * scaling_factor)
-            taker_amount = int(amount_shares * scaling_factor)
-        else: # SELL
-            # If selling, we give shares (makerAmount) and want USDC (takerAmount)
-            maker_amount = int(amount_shares * scaling_factor)
-            taker_amount = int(total_cost_usdc * scaling_factor)
-
-        fee_rate_bps = self.auth.user_data.get("rank", {}).get("feeRateBps", 0)
-
-        order_payload = {
-            "salt": salt,
-            "maker": user_address,
-            "signer": user_address,
-            "taker": "0x0000000000000000000000000000000000000000",
-            "tokenId": str(token_id),
-            "makerAmount": maker_amount,
-            "takerAmount": taker_amount,
-            "expiration": str(expiration_ts),
-            "nonce": 0,
-            "feeRateBps": fee_rate_bps,
-            "side": side,
-            "signatureType": 0, # EOA
-        }
+        final_payload = self.build_order_payload(market_slug, token_id, side, price_cents, amount_shares, expiration_ts)
+        return self.submit_order(final_payload)
 
-        # 2. Sign Order
-        signature = self.auth.sign_order(order_payload)
-        if not signature.startswith("0x"):
-            signature = "0x" + signature
-
-        # 3. Submit Order
-        final_payload = {
-            "order": {
-                **order_payload,
-                "price": price_dollars,
-                "signature": signature
-            },
-            "ownerId": self.auth.user_data["id"],
-            "orderType": "GTC",
-            "marketSlug": market_slug
-        }
-        
-        response = self.session.post(
-            f"{self.api_url}/orders",
+    def submit_order(self, final_payload):
+        """Submit an order body that was already built and signed (see build_order_payload)."""
+        response = self._request(
+            "POST",
+            "/orders",
             json=final_payload,
             headers=self._get_headers()
         )
         
         if response.status_code != 201:
-            print(f"Order failed: {response.text}")
+            logger.error("Order failed: %s", response.text)
             response.raise_for_status()
             
         return response.json()
 
+    def _submit_for_result(self, order, final_payload):
+        try:
+            response = self._request(
+                "POST",
+                "/orders",
+                json=final_payload,
+                headers=self._get_headers()
+            )
+            if response.status_code != 201:
+                response.raise_for_status()
+            return {"order": order, "ok": True, "response": response.json(), "error": None}
+        except Exception as e:
+            return {"order": order, "ok": False, "response": None, "error": str(e)}
+
+    def create_orders(self, orders, max_concurrency=None):
+        """
+        Build, sign and submit a batch of orders concurrently.
+        Each order is a dict with market_slug, token_id, side, price_cents,
+        amount_shares and optionally expiration_ts.
+        Returns one result per order, in order: {"order", "ok", "response", "error"}.
+        A failed order doesn't stop the rest of the batch.
+        """
+        orders = list(orders)
+        if not orders:
+            return []
+        self.sessions.ensure()
+        payloads = build_order_payloads(self.auth, orders)
+        workers = min(len(orders), max_concurrency or Config.HTTP_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._submit_for_result, orders, payloads))
+
+    def get_open_orders(self, slug):
+        """Get our resting orders in a market."""
+        response = self._request("GET", f"/markets/{slug}/user-orders")
+        response.raise_for_status()
+        data = response.json()
+        return data.get("orders", []) if isinstance(data, dict) else data
+
+    def get_positions(self):
+        """Get our positions across all markets."""
+        response = self._request("GET", "/portfolio/positions")
+        response.raise_for_status()
+        return response.json()
+
+    def get_balance(self):
+        """Get our USDC balance."""
+        response = self._request("GET", "/portfolio/balance")
+        response.raise_for_status()
+        return response.json()
+
+    def cancel_order(self, order_id):
+        """Cancel a single order."""
+        response = self._request("DELETE", f"/orders/{order_id}")
+        response.raise_for_status()
+        return response.json()
+
+    def cancel_orders(self, order_ids):
+        """Cancel several orders in one request."""
+        response = self._request(
+            "POST",
+            "/orders/cancel-batch",
+            json={"orderIds": list(order_ids)},
+            headers=self._get_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+
     def cancel_all_orders(self, slug):
         """Cancel all orders for a market."""
-        response = self.session.delete(f"{self.api_url}/orders/all/{slug}")
+        response = self._request("DELETE", f"/orders/all/{slug}")
         response.raise_for_status()
         return response.json()
+
+    def replace_quotes(self, slug, desired_quotes):
+        """
+        Move our resting orders in a market to desired_quotes, touching only
+        what changed. Quotes are dicts with token_id, side, price_cents and
+        amount_shares. Stale orders are cancelled in one batch first, so we
+        are never quoting old and new sizes at once; if that cancel fails
+        nothing new is placed. Returns {"kept", "cancelled", "placed"}.
+        """
+        keep, cancel, place = diff_quotes(self.get_open_orders(slug), desired_quotes)
+        cancelled = [order["id"] for order in cancel]
+        if cancelled:
+            self.cancel_orders(cancelled)
+        placed = self.create_orders([{**quote, "market_slug": slug} for quote in place])
+        return {"kept": keep, "cancelled": cancelled, "placed": placed}
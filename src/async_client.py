@@ -0,0 +1,292 @@
+import asyncio
+import aiohttp
+try:
+    from .config import Config
+    from .auth import LimitlessAuth
+    from .api_client import build_order_payload, build_order_payloads, diff_quotes
+    from .session_manager import SessionManager
+    from .rate_limiter import RateLimiter, classify
+    from .metrics import METRICS, route
+    from .log import get_logger
+except ImportError:
+    from config import Config
+    from auth import LimitlessAuth
+    from api_client import build_order_payload, build_order_payloads, diff_quotes
+    from session_manager import SessionManager
+    from rate_limiter import RateLimiter, classify
+    from metrics import METRICS, route
+    from log import get_logger
+
+logger = get_logger("async_client")
+
+class AsyncLimitlessClient:
+    """
+    asyncio version of LimitlessClient with the same method names.
+    All calls share one aiohttp session backed by a bounded keep-alive
+    connection pool, so many orderbooks can be fetched in one round trip.
+
+    Usage:
+        async with AsyncLimitlessClient() as client:
+            books = await client.get_orderbooks(slugs)
+    """
+    def __init__(self, pool_size=None, max_concurrency=None, timeout=None, keepalive=None):
+        """
+        :param pool_size: Max open connections to the API host
+        :param max_concurrency: Max in-flight requests per get_orderbooks fan-out
+        :param timeout: Total per-request timeout in seconds
+        :param keepalive: Seconds an idle pooled connection is kept open
+        """
+        self.auth = LimitlessAuth()
+        self.api_url = Config.API_URL
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.max_concurrency = max_concurrency or Config.HTTP_MAX_CONCURRENCY
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.keepalive = keepalive or Config.HTTP_KEEPALIVE
+        self.session = None
+        self.sessions = SessionManager(self.auth, self._install_cookie)
+        self.limiter = RateLimiter()
+        # Optional MarketDataRecorder that receives every orderbook fetched
+        self.recorder = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Open the pooled session, log in and keep the login fresh in the background."""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive,
+                ttl_dns_cache=300,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self._get_headers(),
+            )
+        await self.sessions.ensure_async()
+        self.sessions.start_background_async()
+
+    async def close(self):
+        await self.sessions.stop_background_async()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _install_cookie(self, cookie):
+        self.session.cookie_jar.update_cookies({"limitless_session": cookie})
+
+    async def refresh_session(self):
+        await self.sessions.refresh_async()
+
+    async def _request(self, method, path, **kwargs):
+        """
+        Send an authenticated, rate-limited request and return the aiohttp
+        response (use it as a context manager). A 401 triggers one re-login
+        and exactly one retry; a 429 is retried after the limiter's backoff,
+        up to RATE_LIMIT_MAX_RETRIES times.
+        """
+        category = classify(method, path)
+        endpoint = route(path)
+        cookie = await self.sessions.ensure_async()
+        url = f"{self.api_url}{path}"
+        reauthed = False
+        retries = 0
+        # Times until the response headers arrive; the body is read by the caller
+        with METRICS.timer("http_request_seconds", method=method, endpoint=endpoint).time():
+            while True:
+                await self.limiter.acquire_async(category)
+                METRICS.counter("http_requests_total", method=method, endpoint=endpoint).inc()
+                try:
+                    response = await self.session.request(method, url, **kwargs)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    METRICS.counter("http_errors_total", method=method, endpoint=endpoint).inc()
+                    raise
+                backoff = self.limiter.on_response(response.status, response.headers)
+                if backoff is not None and retries < Config.RATE_LIMIT_MAX_RETRIES:
+                    METRICS.counter("http_retries_total", reason="rate_limit").inc()
+                    response.release()
+                    retries += 1
+                    continue
+                if response.status == 401 and not reauthed:
+                    METRICS.counter("http_retries_total", reason="auth").inc()
+                    response.release()
+                    cookie = await self.sessions.refresh_async(stale_cookie=cookie)
+                    reauthed = True
+                    continue
+                if response.status >= 400:
+                    METRICS.counter("http_errors_total", method=method, endpoint=endpoint).inc()
+                return response
+
+    def _get_headers(self):
+        return {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+
+    async def get_active_markets(self, limit=100):
+        """Retrieve active markets."""
+        params = {"limit": limit, "sortBy": "newest"}
+        async with await self._request("GET", "/markets/active", params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def get_active_markets_page(self, page=1, limit=100, etag=None, last_modified=None):
+        """
+        Retrieve one page of active markets, newest first.
+        Sends If-None-Match / If-Modified-Since when given.
+        Returns (payload, etag, last_modified); payload is None on 304 Not Modified.
+        """
+        params = {"page": page, "limit": limit, "sortBy": "newest"}
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with await self._request("GET", "/markets/active", params=params, headers=headers) as response:
+            if response.status == 304:
+                return None, etag, last_modified
+            response.raise_for_status()
+            return await response.json(), response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    async def get_market_details(self, slug):
+        """Get details for a specific market."""
+        async with await self._request("GET", f"/markets/{slug}") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def get_orderbook(self, slug):
+        """Get orderbook for a market."""
+        async with await self._request("GET", f"/markets/{slug}/orderbook") as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            book = await response.json()
+        if self.recorder is not None:
+            self.recorder.record_snapshot(slug, book)
+        return book
+
+    async def get_orderbooks(self, slugs, max_concurrency=None):
+        """
+        Fetch orderbooks for many markets concurrently, keyed by slug.
+        At most max_concurrency requests are in flight at once. A market whose
+        fetch fails maps to None so one bad slug doesn't sink the whole scan.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def fetch(slug):
+            async with semaphore:
+                try:
+                    return await self.get_orderbook(slug)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning("Error fetching orderbook for %s: %s", slug, e)
+                    return None
+
+        slugs = list(slugs)
+        books = await asyncio.gather(*(fetch(slug) for slug in slugs))
+        return dict(zip(slugs, books))
+
+    def build_order_payload(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        """Build and sign the POST /orders body for a single GTC order."""
+        return build_order_payload(self.auth, market_slug, token_id, side, price_cents, amount_shares, expiration_ts)
+
+    async def create_order(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        """
+        Create and submit an order.
+        side: 0 for BUY, 1 for SELL
+        price_cents: Limit price in cents (e.g. 50 for $0.50)
+        amount_shares: Number of shares
+        """
+        await self.sessions.ensure_async()
+        final_payload = self.build_order_payload(market_slug, token_id, side, price_cents, amount_shares, expiration_ts)
+        return await self.submit_order(final_payload)
+
+    async def submit_order(self, final_payload):
+        """Submit an order body that was already built and signed (see build_order_payload)."""
+        async with await self._request("POST", "/orders", json=final_payload) as response:
+            if response.status != 201:
+                logger.error("Order failed: %s", await response.text())
+                response.raise_for_status()
+            return await response.json()
+
+    async def _submit_for_result(self, order, final_payload, semaphore):
+        async with semaphore:
+            try:
+                async with await self._request("POST", "/orders", json=final_payload) as response:
+                    if response.status != 201:
+                        response.raise_for_status()
+                    return {"order": order, "ok": True, "response": await response.json(), "error": None}
+            except Exception as e:
+                return {"order": order, "ok": False, "response": None, "error": str(e)}
+
+    async def create_orders(self, orders, max_concurrency=None):
+        """
+        Build, sign and submit a batch of orders concurrently.
+        Each order is a dict with market_slug, token_id, side, price_cents,
+        amount_shares and optionally expiration_ts.
+        Returns one result per order, in order: {"order", "ok", "response", "error"}.
+        A failed order doesn't stop the rest of the batch.
+        """
+        orders = list(orders)
+        if not orders:
+            return []
+        await self.sessions.ensure_async()
+        payloads = build_order_payloads(self.auth, orders)
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        return await asyncio.gather(*(
+            self._submit_for_result(order, payload, semaphore) for order, payload in zip(orders, payloads)
+        ))
+
+    async def get_open_orders(self, slug):
+        """Get our resting orders in a market."""
+        async with await self._request("GET", f"/markets/{slug}/user-orders") as response:
+            response.raise_for_status()
+            data = await response.json()
+            return data.get("orders", []) if isinstance(data, dict) else data
+
+    async def get_positions(self):
+        """Get our positions across all markets."""
+        async with await self._request("GET", "/portfolio/positions") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def get_balance(self):
+        """Get our USDC balance."""
+        async with await self._request("GET", "/portfolio/balance") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def cancel_order(self, order_id):
+        """Cancel a single order."""
+        async with await self._request("DELETE", f"/orders/{order_id}") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def cancel_orders(self, order_ids):
+        """Cancel several orders in one request."""
+        async with await self._request("POST", "/orders/cancel-batch", json={"orderIds": list(order_ids)}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def cancel_all_orders(self, slug):
+        """Cancel all orders for a market."""
+        async with await self._request("DELETE", f"/orders/all/{slug}") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def replace_quotes(self, slug, desired_quotes):
+        """
+        Move our resting orders in a market to desired_quotes, touching only
+        what changed. See LimitlessClient.replace_quotes.
+        """
+        keep, cancel, place = diff_quotes(await self.get_open_orders(slug), desired_quotes)
+        cancelled = [order["id"] for order in cancel]
+        if cancelled:
+            await self.cancel_orders(cancelled)
+        placed = await self.create_orders([{**quote, "market_slug": slug} for quote in place])
+        return {"kept": keep, "cancelled": cancelled, "placed": placed}
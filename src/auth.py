@@ -5,23 +5,33 @@ from eth_account import Account
 from eth_account.messages import encode_defunct, encode_typed_data
 try:
     from .config import Config
+    from .order_signer import OrderSigner
+    from .log import get_logger
 except ImportError:
     from config import Config
+    from order_signer import OrderSigner
+    from log import get_logger
+
+logger = get_logger("auth")
 
 class LimitlessAuth:
     def __init__(self):
         Config.validate()
         self.account = Account.from_key(Config.PRIVATE_KEY)
+        self.signer = OrderSigner(Config.PRIVATE_KEY)
         self.session_cookie = None
+        self.session_expires_at = 0.0
         self.user_data = None
         self.api_url = Config.API_URL
+        # Pooled connection for auth calls, so re-login reuses the TLS session
+        self.http = requests.Session()
 
     def get_address(self):
         return self.account.address
 
     def get_signing_message(self):
         """Fetch the signing message from the API."""
-        response = requests.get(f"{self.api_url}/auth/signing-message")
+        response = self.http.get(f"{self.api_url}/auth/signing-message", timeout=Config.HTTP_TIMEOUT)
         response.raise_for_status()
         return response.text
 
@@ -41,20 +51,41 @@ class LimitlessAuth:
             "Content-Type": "application/json"
         }
         
-        response = requests.post(
+        response = self.http.post(
             f"{self.api_url}/auth/login",
             headers=headers,
-            json={"client": "eoa"}
+            json={"client": "eoa"},
+            timeout=Config.HTTP_TIMEOUT
         )
         response.raise_for_status()
         
         self.session_cookie = response.cookies.get("limitless_session")
+        self.session_expires_at = self._cookie_expiry(response.cookies)
         self.user_data = response.json()
-        print(f"Authenticated as: {self.user_data.get('account')}")
+        logger.info("Authenticated as: %s", self.user_data.get('account'))
         return self.session_cookie
 
+    @staticmethod
+    def _cookie_expiry(cookies):
+        """Epoch expiry of the session cookie, or now + SESSION_TTL if it has none."""
+        for cookie in cookies:
+            if cookie.name == "limitless_session" and cookie.expires:
+                return float(cookie.expires)
+        return time.time() + Config.SESSION_TTL
+
     def sign_order(self, order_payload, market_type="CLOB"):
-        """Sign an order using EIP-712."""
+        """Sign an order using EIP-712 (precomputed domain and type hashes)."""
+        return self.signer.sign(order_payload, market_type)
+
+    def sign_orders(self, order_payloads, market_type="CLOB", processes=None):
+        """Sign a batch of orders, optionally across a process pool."""
+        return self.signer.sign_batch(order_payloads, market_type, processes)
+
+    def sign_order_reference(self, order_payload, market_type="CLOB"):
+        """
+        Sign an order using EIP-712 via encode_typed_data.
+        Slow reference path kept to cross-check and benchmark sign_order.
+        """
         contract_address = Config.CLOB_CFT_ADDR if market_type == "CLOB" else Config.NEGRISK_CFT_ADDR
         
         domain_data = {
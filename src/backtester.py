@@ -0,0 +1,401 @@
+import argparse
+import gzip
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+try:
+    from .data_feed import DataFeed
+    from .log import setup_logging, suppressed
+    from .orderbook import OrderBook
+    from .portfolio import PortfolioService
+    from .recorder import load_recording
+    from .volatility import VolatilityEngine
+except ImportError:
+    from data_feed import DataFeed
+    from log import setup_logging, suppressed
+    from orderbook import OrderBook
+    from portfolio import PortfolioService
+    from recorder import load_recording
+    from volatility import VolatilityEngine
+
+# Recorded event types, one JSON object per line, ordered by "ts" (epoch seconds):
+#   {"ts": ..., "type": "markets", "markets": [...]}           get_active_markets response
+#   {"ts": ..., "type": "orderbook", "slug": ..., "book": {...}} get_orderbook response
+#   {"ts": ..., "type": "delta", "slug": ..., "side": "bids" | "asks", "price": ..., "size": ...}
+#   {"ts": ..., "type": "price", "pair": "BTCUSDT", "price": ...} DataFeed tick
+#   {"ts": ..., "type": "resolution", "slug": ..., "outcome": "YES" | "NO"}
+MARKETS = "markets"
+ORDERBOOK = "orderbook"
+DELTA = "delta"
+PRICE = "price"
+RESOLUTION = "resolution"
+
+def load_events(path):
+    """
+    Stream recorded events without loading them whole: from a
+    MarketDataRecorder directory, or a JSON Lines file (optionally .gz).
+    """
+    if os.path.isdir(path):
+        yield from load_recording(path)
+        return
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+class SimClock:
+    """Simulated time; strategies read it through their `clock` attribute."""
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+class ReplayDataFeed(DataFeed):
+    """
+    DataFeed serving recorded ticks as of the simulated time. Never falls
+    back to REST, and feeds the same VolatilityEngine as live trading.
+    """
+    def __init__(self, clock, volatility=None):
+        super().__init__(volatility=volatility or VolatilityEngine())
+        self.clock = clock
+
+    def record(self, pair, price, timestamp):
+        self.ticks[pair] = (price, timestamp)
+        self.volatility.update(pair, price, timestamp)
+
+    def get_crypto_price(self, symbol="BTC"):
+        tick = self.ticks.get(self._pair(symbol))
+        return tick[0] if tick is not None else None
+
+class SimulatedClient:
+    """
+    Stand-in for LimitlessClient that answers from recorded data and fills
+    orders against the recorded book.
+
+    Fills are immediate-or-cancel: an order takes every level at or better
+    than its limit, up to its size, and the rest is dropped. Taken liquidity
+    stays consumed until the next recorded snapshot of that market, so
+    repeated orders cannot fill against the same depth twice.
+
+    Books are YES-token books. Buying NO at q is modelled as selling YES
+    at 1 - q, selling NO as buying YES.
+    """
+    def __init__(self, clock, starting_cash=1000.0, fee_rate_bps=0):
+        self.clock = clock
+        self.cash = starting_cash
+        self.starting_cash = starting_cash
+        self.fee_rate = fee_rate_bps / 10_000
+        self.markets = []
+        self.markets_by_slug = {}
+        self.books = {}
+        self.positions = {}       # token_id -> shares
+        self.cost_basis = {}      # token_id -> USDC paid for the current shares
+        self.token_markets = {}   # token_id -> (slug, "YES" | "NO")
+        self.resolved = {}        # slug -> "YES" | "NO"
+        self.fills = []
+        self.orders = 0
+        self.fees = 0.0
+
+    # --- Recorded data ---
+
+    def load_markets(self, markets):
+        self.markets = markets
+        for market in markets:
+            slug = market.get('slug')
+            if slug is None:
+                continue
+            self.markets_by_slug[slug] = market
+            tokens = market.get('tokens') or {}
+            for outcome in ("yes", "no"):
+                if tokens.get(outcome) is not None:
+                    self.token_markets[str(tokens[outcome])] = (slug, outcome.upper())
+
+    def load_orderbook(self, slug, snapshot):
+        book = self.books.get(slug)
+        if book is None:
+            self.books[slug] = OrderBook.from_snapshot(snapshot, slug)
+        else:
+            book.apply_snapshot(snapshot)
+
+    def apply_delta(self, slug, side, price, size):
+        book = self.books.get(slug)
+        if book is None:
+            book = self.books[slug] = OrderBook(slug)
+        book.apply_delta(side, price, size)
+
+    def resolve(self, slug, outcome):
+        """Settle every position in a market at 1.0 (winning token) or 0.0."""
+        self.resolved[slug] = outcome
+        for token_id, (token_slug, token_outcome) in self.token_markets.items():
+            if token_slug != slug:
+                continue
+            shares = self.positions.pop(token_id, 0.0)
+            self.cost_basis.pop(token_id, None)
+            if token_outcome == outcome:
+                self.cash += shares
+
+    # --- LimitlessClient interface ---
+
+    def get_active_markets(self, limit=100):
+        return [m for m in self.markets if m.get('slug') not in self.resolved][:limit]
+
+    def get_market_details(self, slug):
+        return self.markets_by_slug.get(slug)
+
+    def get_orderbook(self, slug):
+        """The simulated book, including liquidity our own fills have taken."""
+        book = self.books.get(slug)
+        if book is None:
+            return None
+        return {
+            "bids": [{"price": price, "size": size} for price, size in book.bids.levels()],
+            "asks": [{"price": price, "size": size} for price, size in book.asks.levels()],
+        }
+
+    def get_orderbooks(self, slugs):
+        return {slug: self.get_orderbook(slug) for slug in slugs}
+
+    def get_open_orders(self, slug):
+        return []  # every order is immediate-or-cancel
+
+    def get_balance(self):
+        return {"balance": self.cash}
+
+    def get_positions(self):
+        positions = []
+        for token_id, shares in self.positions.items():
+            slug, outcome = self.token_markets.get(token_id, (None, "YES"))
+            market = self.markets_by_slug.get(slug, {})
+            positions.append({
+                "market": {"slug": slug, "title": market.get("title", "")},
+                "tokenId": token_id, "outcome": outcome, "size": shares,
+                "avgPrice": self.cost_basis.get(token_id, 0.0) / shares if shares else 0.0,
+            })
+        return positions
+
+    def cancel_order(self, order_id):
+        return {}
+
+    def cancel_orders(self, order_ids):
+        return {}
+
+    def cancel_all_orders(self, slug):
+        return {}
+
+    def create_order(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        self.orders += 1
+        token_id = str(token_id)
+        book = self.books.get(market_slug)
+        _, outcome = self.token_markets.get(token_id, (market_slug, "YES"))
+        limit = price_cents / 100.0
+        buying = side == 0
+        if book is None or market_slug in self.resolved:
+            return {"id": f"sim-{self.orders}", "status": "CANCELLED", "filledSize": 0.0}
+
+        # Trade on the YES book: buying YES or selling NO lifts the asks
+        if buying == (outcome == "YES"):
+            book_side, yes_limit = book.asks, limit if outcome == "YES" else 1.0 - limit
+            in_limit = lambda price: price <= yes_limit + 1e-9
+        else:
+            book_side, yes_limit = book.bids, 1.0 - limit if outcome == "NO" else limit
+            in_limit = lambda price: price >= yes_limit - 1e-9
+
+        filled = notional = 0.0
+        for yes_price, size in book_side.levels():
+            if filled >= amount_shares or not in_limit(yes_price):
+                break
+            take = min(size, amount_shares - filled)
+            book_side.set_level(yes_price, size - take)
+            token_price = yes_price if outcome == "YES" else 1.0 - yes_price
+            filled += take
+            notional += take * token_price
+
+        if filled > 0:
+            fee = notional * self.fee_rate
+            self.fees += fee
+            held = self.positions.get(token_id, 0.0)
+            if buying:
+                self.cash -= notional + fee
+                self.cost_basis[token_id] = self.cost_basis.get(token_id, 0.0) + notional
+                self.positions[token_id] = held + filled
+            else:
+                self.cash += notional - fee
+                if held > 0:
+                    self.cost_basis[token_id] = self.cost_basis.get(token_id, 0.0) * max(0.0, 1 - filled / held)
+                self.positions[token_id] = held - filled
+            self.fills.append({
+                "ts": self.clock.time(), "slug": market_slug, "token_id": token_id,
+                "side": side, "shares": filled, "price": notional / filled,
+            })
+        status = "FILLED" if filled >= amount_shares - 1e-9 else ("PARTIAL" if filled > 0 else "CANCELLED")
+        return {
+            "id": f"sim-{self.orders}", "status": status, "filledSize": filled,
+            "avgPrice": notional / filled if filled > 0 else None,
+        }
+
+    def create_orders(self, orders, max_concurrency=None):
+        results = []
+        for order in orders:
+            response = self.create_order(
+                order["market_slug"], order["token_id"], order["side"],
+                order["price_cents"], order["amount_shares"], order.get("expiration_ts", 0),
+            )
+            results.append({"order": order, "ok": True, "response": response, "error": None})
+        return results
+
+    # --- Accounting ---
+
+    def equity(self):
+        """Cash plus open positions marked at the YES book mid (NO at 1 - mid)."""
+        value = self.cash
+        for token_id, shares in self.positions.items():
+            slug, outcome = self.token_markets.get(token_id, (None, "YES"))
+            book = self.books.get(slug)
+            mid = book.mid() if book is not None else None
+            if mid is None:
+                continue
+            value += shares * (mid if outcome == "YES" else 1.0 - mid)
+        return value
+
+class Backtester:
+    """
+    Replays recorded events through a strategy on a simulated clock.
+
+    The strategy runs every `interval` simulated seconds against a
+    SimulatedClient and a ReplayDataFeed. Time jumps straight from event to
+    event, so a replay runs as fast as the strategy can compute.
+    """
+    def __init__(self, strategy_factory, interval=10.0, starting_cash=1000.0, fee_rate_bps=0, quiet=True, **params):
+        """
+        :param strategy_factory: Callable(client, data_feed, **params) returning a BaseStrategy
+        :param interval: Simulated seconds between strategy runs
+        :param quiet: Discard the strategy's log output
+        :param params: Strategy parameters passed to the factory
+        """
+        self.clock = SimClock()
+        self.client = SimulatedClient(self.clock, starting_cash, fee_rate_bps)
+        self.data_feed = ReplayDataFeed(self.clock)
+        self.strategy = strategy_factory(self.client, self.data_feed, **params)
+        self.strategy.clock = self.clock.time
+        self.interval = interval
+        self.quiet = quiet
+        self.params = params
+        self.runs = 0
+        self.events = 0
+
+    def apply(self, event):
+        kind = event["type"]
+        if kind == PRICE:
+            self.data_feed.record(event["pair"], float(event["price"]), event["ts"])
+        elif kind == ORDERBOOK:
+            self.client.load_orderbook(event["slug"], event["book"])
+        elif kind == DELTA:
+            self.client.apply_delta(event["slug"], event["side"], event["price"], event["size"])
+        elif kind == MARKETS:
+            self.client.load_markets(event["markets"])
+        elif kind == RESOLUTION:
+            self.client.resolve(event["slug"], event["outcome"])
+            portfolio = getattr(self.strategy, "portfolio", None)
+            tokens = self.client.markets_by_slug.get(event["slug"], {}).get("tokens") or {}
+            if portfolio is not None and tokens.get(event["outcome"].lower()) is not None:
+                portfolio.on_market_resolved(event["slug"], tokens[event["outcome"].lower()])
+            if hasattr(self.strategy, "on_market_closed"):
+                self.strategy.on_market_closed(event["slug"])
+
+    def run(self, events):
+        """Replay an iterable of events (ordered by ts) and return a result dict."""
+        started = time.perf_counter()
+        first_ts = next_run = None
+        with suppressed(self.quiet):
+            for event in events:
+                ts = event["ts"]
+                if first_ts is None:
+                    first_ts = ts
+                    next_run = ts + self.interval
+                # Run the strategy at every scheduled time before this event
+                while next_run <= ts:
+                    self.clock.now = next_run
+                    self.strategy.run()
+                    self.runs += 1
+                    next_run += self.interval
+                self.clock.now = ts
+                self.apply(event)
+                self.events += 1
+
+        wall = time.perf_counter() - started
+        simulated = (self.clock.now - first_ts) if first_ts is not None else 0.0
+        equity = self.client.equity()
+        return {
+            "params": self.params,
+            "events": self.events,
+            "runs": self.runs,
+            "orders": self.client.orders,
+            "fills": len(self.client.fills),
+            "fees": self.client.fees,
+            "final_equity": equity,
+            "pnl": equity - self.client.starting_cash,
+            "simulated_seconds": simulated,
+            "wall_seconds": wall,
+            "speedup": simulated / wall if wall > 0 else float("inf"),
+        }
+
+def crypto_strategy_factory(client, data_feed, **params):
+    """CryptoPriceStrategy with order placement enabled, sized against the simulated portfolio."""
+    from strategies.crypto_strategy import CryptoPriceStrategy
+    portfolio = PortfolioService()
+    portfolio.load(client)
+    return CryptoPriceStrategy(client, data_feed=data_feed, execute=True, portfolio=portfolio, **params)
+
+def run_backtest(path, strategy_factory=crypto_strategy_factory, interval=10.0, **params):
+    """Replay one recording with one parameter set."""
+    return Backtester(strategy_factory, interval=interval, **params).run(load_events(path))
+
+def _run_backtest_job(job):
+    path, strategy_factory, interval, params = job
+    return run_backtest(path, strategy_factory, interval, **params)
+
+def parameter_grid(grid):
+    """Expand {"name": [values...]} into a list of parameter dicts (cartesian product)."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def run_sweep(path, grid, strategy_factory=crypto_strategy_factory, interval=10.0, processes=None):
+    """
+    Backtest every parameter combination in `grid`, one replay per
+    combination, spread over a process pool. Each worker streams the
+    recording from disk itself. strategy_factory must be picklable (a
+    module-level function). Results come back in grid order.
+    """
+    jobs = [(path, strategy_factory, interval, params) for params in parameter_grid(grid)]
+    if processes == 1 or len(jobs) < 2:
+        return [_run_backtest_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_run_backtest_job, jobs))
+
+def _parse_values(text):
+    return [float(value) for value in text.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded market data through CryptoPriceStrategy")
+    parser.add_argument("recording", help="Recorder directory or JSON Lines recording (.jsonl or .jsonl.gz)")
+    parser.add_argument("--interval", type=float, default=10.0, help="Simulated seconds between strategy runs")
+    parser.add_argument("--min-confidence", default="0.8", help="Comma-separated values to sweep")
+    parser.add_argument("--kelly-fraction", default="0.5", help="Comma-separated values to sweep")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    setup_logging()
+
+    grid = {
+        "min_confidence": _parse_values(args.min_confidence),
+        "kelly_fraction": _parse_values(args.kelly_fraction),
+    }
+    for result in run_sweep(args.recording, grid, interval=args.interval, processes=args.processes):
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,89 @@ class Config:
     # Wallet
     PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 
+    # HTTP connection pool (async client)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+    HTTP_MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    HTTP_KEEPALIVE = float(os.getenv("HTTP_KEEPALIVE", "30"))
+
+    # Client-side rate limits (requests per second)
+    RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "10"))
+    RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))
+    RATE_LIMIT_ORDER_RPS = float(os.getenv("RATE_LIMIT_ORDER_RPS", "5"))
+    RATE_LIMIT_DATA_RPS = float(os.getenv("RATE_LIMIT_DATA_RPS", "8"))
+    RATE_LIMIT_PRIORITY_RESERVE = float(os.getenv("RATE_LIMIT_PRIORITY_RESERVE", "0.2"))
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+
+    # Session
+    # Used when the login cookie carries no expiry of its own
+    SESSION_TTL = float(os.getenv("SESSION_TTL", "86400"))
+    SESSION_REFRESH_MARGIN = float(os.getenv("SESSION_REFRESH_MARGIN", "300"))
+
+    # Price feed
+    BINANCE_WS_URL = os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443/stream")
+    PRICE_STALE_AFTER = float(os.getenv("PRICE_STALE_AFTER", "5"))
+
+    # Risk limits (fractions of portfolio equity)
+    RISK_MAX_MARKET_EXPOSURE = float(os.getenv("RISK_MAX_MARKET_EXPOSURE", "0.10"))
+    RISK_MAX_ASSET_EXPOSURE = float(os.getenv("RISK_MAX_ASSET_EXPOSURE", "0.25"))
+    RISK_MAX_CORRELATED_EXPOSURE = float(os.getenv("RISK_MAX_CORRELATED_EXPOSURE", "0.40"))
+    RISK_CROSS_ASSET_CORRELATION = float(os.getenv("RISK_CROSS_ASSET_CORRELATION", "0.7"))
+
+    # Realized volatility
+    VOL_BAR_SECONDS = float(os.getenv("VOL_BAR_SECONDS", "60"))
+    VOL_WINDOW_BARS = int(os.getenv("VOL_WINDOW_BARS", "240"))
+    VOL_HALF_LIVES = tuple(float(h) for h in os.getenv("VOL_HALF_LIVES", "900,3600,14400,86400").split(","))
+    VOL_MIN_BARS = int(os.getenv("VOL_MIN_BARS", "20"))
+
+    # Market data recorder (disabled when RECORD_DIR is empty)
+    RECORD_DIR = os.getenv("RECORD_DIR", "")
+    RECORD_FLUSH_INTERVAL = float(os.getenv("RECORD_FLUSH_INTERVAL", "1"))
+
+    # Latency strategy: JSON list of news rules; orders are only sent when
+    # LATENCY_EXECUTE is true
+    LATENCY_RULES_FILE = os.getenv("LATENCY_RULES_FILE", "")
+    LATENCY_EXECUTE = os.getenv("LATENCY_EXECUTE", "false").lower() == "true"
+
+    # News ingestion (each source is enabled by setting it)
+    NEWS_WS_URL = os.getenv("NEWS_WS_URL", "")
+    NEWS_POLL_URL = os.getenv("NEWS_POLL_URL", "")
+    NEWS_REPLAY_FILE = os.getenv("NEWS_REPLAY_FILE", "")
+    NEWS_REPLAY_SPEED = float(os.getenv("NEWS_REPLAY_SPEED", "0"))
+    NEWS_SOCKET = os.getenv("NEWS_SOCKET", "")
+    NEWS_QUEUE_SIZE = int(os.getenv("NEWS_QUEUE_SIZE", "1000"))
+    NEWS_DEDUP_TTL = float(os.getenv("NEWS_DEDUP_TTL", "300"))
+
+    # Metrics endpoint (/metrics and /metrics.json); 0 disables it
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+    # Logging: default level, per-module overrides ("crypto_strategy=DEBUG,api_client=WARNING"),
+    # "text" or "json", file (stdout when empty) and records buffered for the writer thread
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+    LOG_FILE = os.getenv("LOG_FILE", "")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    # Market catalog
+    CATALOG_PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", "100"))
+    CATALOG_REFRESH_INTERVAL = float(os.getenv("CATALOG_REFRESH_INTERVAL", "5"))
+    CATALOG_FULL_SYNC_INTERVAL = float(os.getenv("CATALOG_FULL_SYNC_INTERVAL", "600"))
+
+    # Scheduler
+    CRYPTO_SCAN_INTERVAL = float(os.getenv("CRYPTO_SCAN_INTERVAL", "10"))
+    SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.5"))
+    SCHEDULER_REPORT_INTERVAL = float(os.getenv("SCHEDULER_REPORT_INTERVAL", "60"))
+    PRICE_TICK_WAKE_INTERVAL = float(os.getenv("PRICE_TICK_WAKE_INTERVAL", "1"))
+    # Oldest cached orderbook or catalog listing price (seconds) the crypto
+    # scan still ranks markets by
+    BOOK_HINT_MAX_AGE = float(os.getenv("BOOK_HINT_MAX_AGE", "30"))
+
+    # Sharding (SHARDS > 1 runs the crypto scan in worker processes)
+    SHARDS = int(os.getenv("SHARDS", "1"))
+    SHARD_BY = os.getenv("SHARD_BY", "slug")
+
     @classmethod
     def validate(cls):
         if not cls.PRIVATE_KEY:
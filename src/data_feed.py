@@ -1,31 +1,175 @@
+import asyncio
+import json
+import threading
 import requests
 import time
+import websockets
+try:
+    from .config import Config
+    from .volatility import DEFAULT_VOLATILITY, FALLBACK_VOLATILITY
+    from .metrics import counter, timer
+    from .log import get_logger
+except ImportError:
+    from config import Config
+    from volatility import DEFAULT_VOLATILITY, FALLBACK_VOLATILITY
+    from metrics import counter, timer
+    from log import get_logger
+
+logger = get_logger("data_feed")
 
 class DataFeed:
     """
     Fetches real-time market data from external sources (Binance).
+
+    In streaming mode a background thread holds one WebSocket trade
+    subscription per symbol and keeps the last tick for each in memory, so
+    get_crypto_price is a dict lookup. REST is only used while the stream
+    is stale or not running.
     """
     BASE_URL = "https://api.binance.com/api/v3"
 
+    # Map common symbols to Binance pairs
+    SYMBOL_MAP = {
+        "BTC": "BTCUSDT",
+        "ETH": "ETHUSDT",
+        "SOL": "SOLUSDT"
+    }
+
+    def __init__(self, ws_url=None, stale_after=None, on_tick=None, volatility=None):
+        """
+        :param ws_url: Combined-stream WebSocket endpoint (override for tests)
+        :param stale_after: Seconds after which a cached tick is ignored and REST is used
+        :param on_tick: Optional callback(pair, price, timestamp) run on the stream thread
+        :param volatility: Optional VolatilityEngine fed with every streamed tick
+        """
+        self.ws_url = ws_url or Config.BINANCE_WS_URL
+        self.stale_after = stale_after if stale_after is not None else Config.PRICE_STALE_AFTER
+        self.on_tick = on_tick
+        self.volatility = volatility
+        self.session = requests.Session()
+
+        # pair -> (price, local receive time). Every update swaps in a new
+        # tuple, so readers never see a half-written tick and need no lock.
+        self.ticks = {}
+
+        self._stream_pairs = []
+        self._stream_thread = None
+        self._stream_loop = None
+        self._stop = threading.Event()
+
+    def _pair(self, symbol):
+        return self.SYMBOL_MAP.get(symbol.upper(), f"{symbol.upper()}USDT")
+
+    @timer("price_lookup_seconds")
     def get_crypto_price(self, symbol="BTC"):
         """
         Get current price for a crypto asset in USDT.
         """
-        # Map common symbols to Binance pairs
-        symbol_map = {
-            "BTC": "BTCUSDT",
-            "ETH": "ETHUSDT",
-            "SOL": "SOLUSDT"
-        }
-        
-        pair = symbol_map.get(symbol.upper(), f"{symbol.upper()}USDT")
-        
+        pair = self._pair(symbol)
+
+        tick = self.ticks.get(pair)
+        if tick is not None and time.time() - tick[1] <= self.stale_after:
+            return tick[0]
+
+        return self._get_rest_price(symbol, pair)
+
+    def get_tick(self, symbol="BTC"):
+        """Return the cached (price, timestamp) for a symbol, or None. Never does I/O."""
+        return self.ticks.get(self._pair(symbol))
+
+    def get_volatility(self, symbol, time_to_expiry_years):
+        """
+        Annualized volatility for pricing a market on this symbol with the
+        given time to expiry. Without a VolatilityEngine, the static prior.
+        """
+        pair = self._pair(symbol)
+        if self.volatility is None:
+            return DEFAULT_VOLATILITY.get(pair, FALLBACK_VOLATILITY)
+        return self.volatility.volatility(pair, time_to_expiry_years)
+
+    def _get_rest_price(self, symbol, pair):
+        counter("price_rest_requests_total").inc()
         try:
             url = f"{self.BASE_URL}/ticker/price?symbol={pair}"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=5)
             response.raise_for_status()
             data = response.json()
-            return float(data['price'])
+            price = float(data['price'])
+            self.ticks[pair] = (price, time.time())
+            return price
         except Exception as e:
-            print(f"[DataFeed] Error fetching price for {symbol}: {e}")
+            counter("price_rest_errors_total").inc()
+            logger.warning("Error fetching price for %s: %s", symbol, e)
             return None
+
+    # --- Streaming ---
+
+    def start_stream(self, symbols=("BTC", "ETH", "SOL")):
+        """Start the background WebSocket stream for the given symbols."""
+        if self._stream_thread is not None:
+            return
+        self._stream_pairs = [self._pair(s) for s in symbols]
+        self._stop.clear()
+        self._stream_thread = threading.Thread(target=self._run_stream_thread, name="DataFeedStream", daemon=True)
+        self._stream_thread.start()
+
+    def stop_stream(self, timeout=5):
+        """Stop the background stream and wait for the thread to exit."""
+        if self._stream_thread is None:
+            return
+        # The receive loop polls the stop flag at least once a second
+        self._stop.set()
+        self._stream_thread.join(timeout)
+        self._stream_thread = None
+
+    def is_streaming(self):
+        return self._stream_thread is not None and self._stream_thread.is_alive()
+
+    def _stream_url(self):
+        streams = "/".join(f"{pair.lower()}@trade" for pair in self._stream_pairs)
+        return f"{self.ws_url}?streams={streams}"
+
+    def _run_stream_thread(self):
+        self._stream_loop = asyncio.new_event_loop()
+        try:
+            self._stream_loop.run_until_complete(self._stream_forever())
+        finally:
+            self._stream_loop.close()
+            self._stream_loop = None
+
+    async def _stream_forever(self):
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self._stream_url(), ping_interval=20) as ws:
+                    logger.info("Streaming %s", ", ".join(self._stream_pairs))
+                    backoff = 0.5
+                    while not self._stop.is_set():
+                        try:
+                            message = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                        except asyncio.TimeoutError:
+                            continue
+                        self._handle_message(message)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning("Stream error: %s, reconnecting in %.1fs", e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _handle_message(self, message):
+        try:
+            data = json.loads(message)
+            # Combined streams wrap the payload as {"stream": ..., "data": {...}}
+            data = data.get("data", data)
+            pair = data["s"]
+            price = float(data["p"])
+        except (ValueError, KeyError, TypeError):
+            return
+
+        now = time.time()
+        self.ticks[pair] = (price, now)
+        if self.volatility is not None:
+            self.volatility.update(pair, price, now)
+        if self.on_tick is not None:
+            self.on_tick(pair, price, now)
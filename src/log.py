@@ -0,0 +1,168 @@
+import atexit
+import contextlib
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+try:
+    from .config import Config
+    from .metrics import counter
+except ImportError:
+    from config import Config
+    from metrics import counter
+
+ROOT = "limitless"
+
+# Arguments of these types can be formatted later on the writer thread;
+# anything else (dicts, lists, objects) might change before then
+_IMMUTABLE = (str, int, float, bool, type(None))
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+def get_logger(name):
+    """Logger for a module, e.g. get_logger("api_client") -> "limitless.api_client"."""
+    return logging.getLogger(f"{ROOT}.{name}")
+
+def _extras(record):
+    return {k: v for k, v in vars(record).items() if k not in _RECORD_FIELDS and not k.startswith("_")}
+
+class TextFormatter(logging.Formatter):
+    """`time LEVEL [module] message key=value ...`"""
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(module_name)s] %(message)s")
+
+    def format(self, record):
+        record.module_name = record.name[len(ROOT) + 1:] or ROOT
+        text = super().format(record)
+        del record.module_name
+        extras = _extras(record)
+        if extras:
+            text += " " + " ".join(f"{k}={v}" for k, v in extras.items())
+        return text
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, any `extra` fields and exc."""
+    def format(self, record):
+        data = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name[len(ROOT) + 1:] or ROOT,
+            "msg": record.getMessage(),
+        }
+        data.update(_extras(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue that never blocks the caller on
+    DEBUG..WARNING records: when the queue is full they are dropped and
+    counted. ERROR and above wait for room rather than being lost.
+
+    Unlike the stdlib handler, the message is not formatted here: records
+    whose args are all immutable are passed through untouched and
+    rendered on the writer thread.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = counter("log_records_dropped_total")
+
+    def prepare(self, record):
+        # A lone dict argument becomes record.args itself, so it is never immutable
+        if record.args and (isinstance(record.args, dict)
+                            or not all(type(arg) in _IMMUTABLE for arg in record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # The traceback references live frames; render it now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if record.levelno >= logging.ERROR:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped.inc()
+
+_listener = None
+
+def parse_levels(text):
+    """"crypto_strategy=DEBUG,api_client=WARNING" -> {"crypto_strategy": "DEBUG", ...}"""
+    levels = {}
+    for item in (text or "").split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging(level=None, levels=None, fmt=None, path=None, queue_size=None, stream=None):
+    """
+    Route every "limitless.*" logger through a bounded queue to a writer
+    thread. Safe to call again; the previous writer is stopped first.
+
+    :param level: Default level name (LOG_LEVEL)
+    :param levels: Per-module levels, dict or "module=LEVEL,..." (LOG_LEVELS)
+    :param fmt: "text" or "json" (LOG_FORMAT)
+    :param path: Log file; stdout when empty (LOG_FILE)
+    :param queue_size: Records buffered before DEBUG..WARNING are dropped (LOG_QUEUE_SIZE)
+    :param stream: Stream to write to instead of stdout (tests)
+    """
+    global _listener
+    shutdown_logging()
+
+    root = logging.getLogger(ROOT)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+    root.propagate = False
+    if levels is None:
+        levels = Config.LOG_LEVELS
+    if isinstance(levels, str):
+        levels = parse_levels(levels)
+    for name, module_level in levels.items():
+        get_logger(name).setLevel(module_level.upper())
+
+    path = path if path is not None else Config.LOG_FILE
+    output = logging.FileHandler(path) if path else logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if (fmt or Config.LOG_FORMAT).lower() == "json" else TextFormatter())
+
+    log_queue = queue.Queue(queue_size or Config.LOG_QUEUE_SIZE)
+    root.addHandler(DroppingQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+    return root
+
+def shutdown_logging():
+    """Write out everything queued and stop the writer thread."""
+    global _listener
+    root = logging.getLogger(ROOT)
+    for handler in list(root.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            root.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+@contextlib.contextmanager
+def suppressed(enabled=True):
+    """Drop every log record inside the block (e.g. quiet backtests); a no-op when not enabled."""
+    if not enabled:
+        yield
+        return
+    previous = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        logging.disable(previous)
+
+atexit.register(shutdown_logging)
@@ -1,4 +1,4 @@
-import time
+import asyncio
 import sys
 import os
 
@@ -6,36 +6,133 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import Config
-from api_client import LimitlessClient
+from async_client import AsyncLimitlessClient
+from data_feed import DataFeed
+from market_catalog import MarketCatalog
+from log import get_logger, setup_logging, shutdown_logging
+from metrics import MetricsServer
+from news_feed import NewsPipeline, sources_from_config
+from portfolio import PortfolioService
+from recorder import MarketDataRecorder
+from volatility import VolatilityEngine
+from scheduler import StrategyScheduler, ThrottledEmitter
+from sharding import ShardSupervisor
 from strategies.crypto_strategy import CryptoPriceStrategy
+from strategies.latency_strategy import LatencyArbitrageStrategy, load_rules
 
-def main():
-    print("Starting Limitless Trading Bot...")
-    
-    try:
-        # 1. Initialize Client
-        client = LimitlessClient()
-        print("API Client initialized.")
+logger = get_logger("main")
+
+async def run_bot():
+    # 1. Initialize Client
+    async with AsyncLimitlessClient() as client:
+        logger.info("API Client initialized.")
         
-        # 2. Initialize Strategy
+        # Optionally record every tick, orderbook and market seen to disk
+        recorder = None
+        if Config.RECORD_DIR:
+            recorder = MarketDataRecorder()
+            recorder.start()
+            client.recorder = recorder
+            logger.info("Recording market data to %s", Config.RECORD_DIR)
+
+        # 2. Start the streaming price feed shared by strategies; every tick
+        # also updates the realized volatility estimates and (throttled)
+        # wakes the strategies subscribed to "price_tick"
+        scheduler = StrategyScheduler(report_interval=Config.SCHEDULER_REPORT_INTERVAL)
+        price_ticks = ThrottledEmitter(scheduler, asyncio.get_running_loop(), "price_tick",
+                                       min_interval=Config.PRICE_TICK_WAKE_INTERVAL)
+
+        def on_tick(pair, price, timestamp):
+            price_ticks(pair, price, timestamp)
+            if recorder:
+                recorder.record_tick(pair, price, timestamp)
+
+        data_feed = DataFeed(volatility=VolatilityEngine(), on_tick=on_tick)
+        data_feed.start_stream(["BTC", "ETH", "SOL"])
+
+        # 3. Load the shared market catalog (full sync once, deltas after)
+        catalog = MarketCatalog(client)
+        if recorder:
+            catalog.subscribe(on_add=recorder.record_market, on_remove=recorder.record_market_removed)
+        await catalog.refresh_async()
+
+        # Balances, positions and open orders, loaded once and then kept
+        # current from order acks so sizing needs no extra requests
+        portfolio = PortfolioService(catalog)
+        try:
+            await portfolio.load_async(client)
+            logger.info("Portfolio loaded: $%.2f available, %d positions", portfolio.available_balance(), len(portfolio.positions))
+        except Exception as e:
+            logger.warning("Could not load portfolio (%s); sizing against a mock balance", e)
+            portfolio = None
+
+        # 4. Initialize Strategies
         # We can make this configurable via args later
-        strategy = CryptoPriceStrategy(client)
-        print(f"Strategy {strategy.__class__.__name__} initialized.")
+        scheduler.add_strategy(
+            CryptoPriceStrategy(client, data_feed=data_feed, catalog=catalog, portfolio=portfolio),
+            interval=Config.CRYPTO_SCAN_INTERVAL,
+            events=("price_tick",),
+            jitter=Config.SCHEDULER_JITTER,
+        )
+        scheduler.add_strategy(
+            LatencyArbitrageStrategy(
+                client, catalog=catalog, rules=load_rules(Config.LATENCY_RULES_FILE),
+                execute=Config.LATENCY_EXECUTE,
+            ),
+            interval=Config.CATALOG_REFRESH_INTERVAL,
+            events=("news",),
+        )
+        for entry in scheduler.entries:
+            logger.info("Strategy %s initialized.", entry.name)
         
-        # 3. Main Loop
-        print("Entering main loop. Press Ctrl+C to stop.")
-        while True:
-            strategy.run()
-            
-            # Sleep to avoid rate limits and spamming
-            time.sleep(10)
+        # News sources feed the latency strategy through the scheduler
+        news = None
+        sources = sources_from_config()
+        if sources:
+            news = NewsPipeline(
+                sources,
+                on_event=lambda event: scheduler.emit("news", event),
+                report_interval=Config.SCHEDULER_REPORT_INTERVAL,
+            )
+            news.start()
+            logger.info("News pipeline started with %d source(s).", len(sources))
+
+        metrics_server = None
+        if Config.METRICS_PORT:
+            metrics_server = await MetricsServer().start()
+            logger.info("Metrics at http://%s:%d/metrics", metrics_server.host, metrics_server.port)
+
+        # 5. Main Loop
+        logger.info("Entering main loop. Press Ctrl+C to stop.")
+        try:
+            await scheduler.run()
+        finally:
+            if metrics_server:
+                await metrics_server.stop()
+            if news:
+                await news.stop()
+            data_feed.stop_stream()
+            if recorder:
+                recorder.stop()
+
+def main():
+    # All modules log through one background writer from here on
+    setup_logging()
+    logger.info("Starting Limitless Trading Bot...")
+    
+    try:
+        if Config.SHARDS > 1:
+            # Crypto scan split over worker processes; see sharding.ShardSupervisor
+            asyncio.run(ShardSupervisor().run())
+        else:
+            asyncio.run(run_bot())
             
     except KeyboardInterrupt:
-        print("\nBot stopped by user.")
+        logger.info("Bot stopped by user.")
     except Exception as e:
-        print(f"Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Fatal error: %s", e)
+    finally:
+        shutdown_logging()
 
 if __name__ == "__main__":
     main()
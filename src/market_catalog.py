@@ -0,0 +1,280 @@
+import asyncio
+import bisect
+import time
+try:
+    from .analytics import parse_deadline
+    from .config import Config
+    from .market_parser import ASSET_PATTERNS
+    from .log import get_logger
+except ImportError:
+    from analytics import parse_deadline
+    from config import Config
+    from market_parser import ASSET_PATTERNS
+    from log import get_logger
+
+logger = get_logger("market_catalog")
+
+def extract_markets(payload):
+    """
+    Normalize a /markets/active response into a flat list of markets.
+    Handles a bare list or a {"data": [...]} page, and flattens groups
+    (items with a nested "markets" list) into their child markets.
+    """
+    if payload is None:
+        return []
+    items = payload.get("data", []) if isinstance(payload, dict) else payload
+    markets = []
+    for item in items:
+        if isinstance(item.get("markets"), list):
+            markets.extend(m for m in item["markets"] if "slug" in m)
+        elif "slug" in item:
+            markets.append(item)
+    return markets
+
+def deadline_epoch(market):
+    """Market deadline as a UTC epoch float, or None if missing/unparseable."""
+    return parse_deadline(market.get("deadline"))
+
+def detect_asset(title):
+    title_lower = title.lower()
+    for symbol, pattern in ASSET_PATTERNS:
+        if pattern.search(title_lower):
+            return symbol
+    return None
+
+class MarketCatalog:
+    """
+    Shared in-memory index of every active market.
+
+    The first sync pages through the whole active listing. After that,
+    refresh() only pulls the newest page (conditionally, via ETag /
+    If-Modified-Since) and stops as soon as it reaches a market it already
+    knows, so steady-state cost doesn't grow with the catalog. A full resync
+    runs every full_sync_interval to catch markets that closed early.
+
+    Markets are indexed by slug, by detected asset and by deadline.
+    """
+    def __init__(self, client, page_size=None, refresh_interval=None, full_sync_interval=None):
+        """
+        :param client: LimitlessClient or AsyncLimitlessClient
+        :param page_size: Markets per page when paging the active listing
+        :param refresh_interval: Minimum seconds between incremental refreshes
+        :param full_sync_interval: Seconds between full resyncs
+        """
+        self.client = client
+        self.page_size = page_size or Config.CATALOG_PAGE_SIZE
+        self.refresh_interval = refresh_interval if refresh_interval is not None else Config.CATALOG_REFRESH_INTERVAL
+        self.full_sync_interval = full_sync_interval if full_sync_interval is not None else Config.CATALOG_FULL_SYNC_INTERVAL
+
+        self.by_slug = {}
+        self.by_asset = {}
+        # Sorted (deadline_epoch, slug) pairs
+        self.deadlines = []
+
+        self.etag = None
+        self.last_modified = None
+        self.last_refresh = 0.0
+        self.last_full_sync = 0.0
+        self._listeners = []
+        self._lock = None
+
+    # --- Queries ---
+
+    def get(self, slug):
+        return self.by_slug.get(slug)
+
+    def markets(self, assets=None):
+        """All active markets, or only those for the given assets (e.g. ("BTC", "ETH"))."""
+        if assets is None:
+            return list(self.by_slug.values())
+        return [self.by_slug[slug] for asset in assets for slug in self.by_asset.get(asset, ())]
+
+    def expiring_between(self, start_ts, end_ts):
+        """Markets whose deadline falls in [start_ts, end_ts), soonest first."""
+        lo = bisect.bisect_left(self.deadlines, (start_ts, ""))
+        hi = bisect.bisect_left(self.deadlines, (end_ts, ""))
+        return [self.by_slug[slug] for _, slug in self.deadlines[lo:hi]]
+
+    def __len__(self):
+        return len(self.by_slug)
+
+    def __contains__(self, slug):
+        return slug in self.by_slug
+
+    # --- Change notifications ---
+
+    def subscribe(self, on_add=None, on_remove=None):
+        """
+        Register callbacks for catalog changes.
+        on_add(market) fires for new markets, on_remove(slug) for closed ones.
+        """
+        self._listeners.append((on_add, on_remove))
+
+    # --- Index maintenance ---
+
+    def _add(self, market):
+        slug = market["slug"]
+        if slug in self.by_slug:
+            self._remove(slug, notify=False)
+            is_new = False
+        else:
+            is_new = True
+
+        market["_asset"] = detect_asset(market.get("title", ""))
+        market["_deadline_ts"] = deadline_epoch(market)
+        # Delta refreshes never re-fetch a known market, so its listing
+        # prices are only as fresh as this
+        market["_listed_at"] = time.time()
+        self.by_slug[slug] = market
+        if market["_asset"]:
+            self.by_asset.setdefault(market["_asset"], set()).add(slug)
+        if market["_deadline_ts"] is not None:
+            bisect.insort(self.deadlines, (market["_deadline_ts"], slug))
+
+        if is_new:
+            for on_add, _ in self._listeners:
+                if on_add:
+                    on_add(market)
+        return is_new
+
+    def _remove(self, slug, notify=True):
+        market = self.by_slug.pop(slug, None)
+        if market is None:
+            return
+        asset = market.get("_asset")
+        if asset:
+            self.by_asset.get(asset, set()).discard(slug)
+        deadline = market.get("_deadline_ts")
+        if deadline is not None:
+            i = bisect.bisect_left(self.deadlines, (deadline, slug))
+            if i < len(self.deadlines) and self.deadlines[i] == (deadline, slug):
+                del self.deadlines[i]
+        if notify:
+            for _, on_remove in self._listeners:
+                if on_remove:
+                    on_remove(slug)
+
+    def prune_expired(self, now=None):
+        """Drop markets whose deadline has passed. Returns the number removed."""
+        now = now if now is not None else time.time()
+        expired = [slug for ts, slug in self.deadlines[:bisect.bisect_left(self.deadlines, (now, ""))]]
+        for slug in expired:
+            self._remove(slug)
+        return len(expired)
+
+    def _apply_full_sync(self, markets):
+        seen = set()
+        for market in markets:
+            seen.add(market["slug"])
+            self._add(market)
+        for slug in [s for s in self.by_slug if s not in seen]:
+            self._remove(slug)
+        now = time.time()
+        self.last_full_sync = now
+        self.last_refresh = now
+
+    def _apply_delta_page(self, markets):
+        """
+        Add markets from a newest-first page. Returns True if the page was
+        entirely new, meaning the next page needs fetching too.
+        """
+        for market in markets:
+            if market["slug"] in self.by_slug:
+                return False
+            self._add(market)
+        return len(markets) >= self.page_size
+
+    def _needs_full_sync(self, now):
+        return not self.last_full_sync or now - self.last_full_sync >= self.full_sync_interval
+
+    # --- Sync client ---
+
+    def full_sync(self):
+        """Page through every active market and rebuild the index."""
+        markets, page = [], 1
+        while True:
+            payload, etag, last_modified = self.client.get_active_markets_page(page=page, limit=self.page_size)
+            page_markets = extract_markets(payload)
+            markets.extend(page_markets)
+            if page == 1:
+                self.etag, self.last_modified = etag, last_modified
+            if len(page_markets) < self.page_size:
+                break
+            page += 1
+        self._apply_full_sync(markets)
+        logger.info("Synced %d active markets", len(self.by_slug))
+
+    def refresh(self):
+        """Pull only markets listed since the last refresh."""
+        now = time.time()
+        if self._needs_full_sync(now):
+            self.full_sync()
+            return
+        page = 1
+        while True:
+            payload, etag, last_modified = self.client.get_active_markets_page(
+                page=page, limit=self.page_size,
+                etag=self.etag if page == 1 else None,
+                last_modified=self.last_modified if page == 1 else None,
+            )
+            if payload is None:
+                break
+            if page == 1:
+                self.etag, self.last_modified = etag, last_modified
+            if not self._apply_delta_page(extract_markets(payload)):
+                break
+            page += 1
+        self.prune_expired(now)
+        self.last_refresh = now
+
+    def refresh_if_stale(self):
+        if time.time() - self.last_refresh >= self.refresh_interval:
+            self.refresh()
+
+    # --- Async client ---
+
+    async def full_sync_async(self):
+        """Page through every active market and rebuild the index."""
+        markets, page = [], 1
+        while True:
+            payload, etag, last_modified = await self.client.get_active_markets_page(page=page, limit=self.page_size)
+            page_markets = extract_markets(payload)
+            markets.extend(page_markets)
+            if page == 1:
+                self.etag, self.last_modified = etag, last_modified
+            if len(page_markets) < self.page_size:
+                break
+            page += 1
+        self._apply_full_sync(markets)
+        logger.info("Synced %d active markets", len(self.by_slug))
+
+    async def refresh_async(self):
+        """Pull only markets listed since the last refresh."""
+        now = time.time()
+        if self._needs_full_sync(now):
+            await self.full_sync_async()
+            return
+        page = 1
+        while True:
+            payload, etag, last_modified = await self.client.get_active_markets_page(
+                page=page, limit=self.page_size,
+                etag=self.etag if page == 1 else None,
+                last_modified=self.last_modified if page == 1 else None,
+            )
+            if payload is None:
+                break
+            if page == 1:
+                self.etag, self.last_modified = etag, last_modified
+            if not self._apply_delta_page(extract_markets(payload)):
+                break
+            page += 1
+        self.prune_expired(now)
+        self.last_refresh = now
+
+    async def refresh_if_stale_async(self):
+        # Several strategies share one catalog; only one of them refreshes
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if time.time() - self.last_refresh >= self.refresh_interval:
+                await self.refresh_async()
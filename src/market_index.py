@@ -0,0 +1,114 @@
+import re
+from collections import defaultdict
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CAPITALIZED = re.compile(r"[A-Z][\w'’.-]*")
+
+# Words that carry no signal for matching news to markets
+STOPWORDS = frozenset({
+    "a", "an", "and", "any", "are", "as", "at", "be", "before", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "than", "this", "to", "will", "with", "who", "what", "when",
+    "which", "win", "s",
+})
+
+def normalize(text):
+    """Lowercase word tokens without punctuation or stopwords."""
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+def normalize_key(text):
+    """Canonical lookup key for a keyword or phrase, e.g. "Joe Biden's" -> "joe biden"."""
+    return " ".join(normalize(text))
+
+def entities(title):
+    """
+    Multi-word names in a title: runs of capitalized words, normalized,
+    e.g. "Will Joe Biden drop out?" -> ["joe biden"].
+    """
+    found = []
+    run = []
+    for word in title.split():
+        if _CAPITALIZED.fullmatch(word.strip("?!,:;()\"")):
+            run.append(word)
+            continue
+        if run:
+            found.append(normalize_key(" ".join(run)))
+            run = []
+    if run:
+        found.append(normalize_key(" ".join(run)))
+    return [entity for entity in found if " " in entity]
+
+class MarketIndex:
+    """
+    Inverted index from normalized title tokens and entity names to market
+    slugs, plus each market's outcome token ids.
+
+    Built from a MarketCatalog and kept current through its add/remove
+    callbacks. A single-word or known-entity lookup is one dict read;
+    other phrases intersect the postings of their words, smallest first.
+    """
+    def __init__(self):
+        self.postings = defaultdict(set)  # key -> slugs
+        self.markets = {}                 # slug -> {"title", "tokens", "keys"}
+        self.version = 0
+
+    def attach(self, catalog):
+        """Index every market in a catalog and follow its updates."""
+        for market in catalog.markets():
+            self.add(market)
+        catalog.subscribe(on_add=self.add, on_remove=self.remove)
+
+    def add(self, market):
+        slug = market.get("slug")
+        title = market.get("title") or ""
+        if not slug:
+            return
+        if slug in self.markets:
+            self.remove(slug)
+        keys = set(normalize(title)) | set(entities(title))
+        tokens = market.get("tokens") or {}
+        self.markets[slug] = {
+            "title": title,
+            "tokens": {outcome.upper(): str(token) for outcome, token in tokens.items() if token is not None},
+            "keys": frozenset(keys),
+        }
+        for key in keys:
+            self.postings[key].add(slug)
+        self.version += 1
+
+    def remove(self, slug):
+        entry = self.markets.pop(slug, None)
+        if entry is None:
+            return
+        for key in entry["keys"]:
+            slugs = self.postings.get(key)
+            if slugs is not None:
+                slugs.discard(slug)
+                if not slugs:
+                    del self.postings[key]
+        self.version += 1
+
+    def lookup(self, query):
+        """Slugs of markets whose title contains every word of query (or the entity itself)."""
+        key = normalize_key(query)
+        if not key:
+            return set()
+        exact = self.postings.get(key)
+        if exact is not None:
+            return set(exact)
+        postings = sorted((self.postings.get(word, ()) for word in key.split()), key=len)
+        if not postings or not postings[0]:
+            return set()
+        result = set(postings[0])
+        for slugs in postings[1:]:
+            result &= slugs
+            if not result:
+                break
+        return result
+
+    def token_id(self, slug, outcome):
+        """Outcome token id ("YES"/"NO") of an indexed market, or None."""
+        entry = self.markets.get(slug)
+        return entry["tokens"].get(outcome.upper()) if entry is not None else None
+
+    def __len__(self):
+        return len(self.markets)
@@ -0,0 +1,100 @@
+import re
+
+# Assets we can price, matched on whole words so "eth" doesn't hit "whether"
+ASSET_PATTERNS = (
+    ("BTC", re.compile(r'\b(?:bitcoin|btc)\b')),
+    ("ETH", re.compile(r'\b(?:ethereum|eth|ether)\b')),
+    ("SOL", re.compile(r'\b(?:solana|sol)\b')),
+)
+
+# A price like "$100,000", "100k", "1.5m", "$2b" or "95000.50"
+_NUMBER = r'\$?\s*(\d[\d,]*(?:\.\d+)?)\s*([kmb])?\b'
+
+BETWEEN_PATTERN = re.compile(r'between\s+' + _NUMBER + r'\s*(?:and|-|to)\s*' + _NUMBER)
+ABOVE_PATTERN = re.compile(r'(?:above|over|greater than|higher than|>)\s*' + _NUMBER)
+BELOW_PATTERN = re.compile(r'(?:below|under|less than|lower than|<)\s*' + _NUMBER)
+
+SUFFIX_MULTIPLIERS = {None: 1, "": 1, "k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+def parse_number(digits, suffix):
+    """Turn a regex capture like ("1,250.5", "k") into 1250500.0."""
+    try:
+        return float(digits.replace(",", "")) * SUFFIX_MULTIPLIERS[suffix]
+    except (ValueError, KeyError):
+        return None
+
+def parse_title(title):
+    """
+    Extract asset, strike(s) and direction from a market title.
+    Returns None if the market isn't a crypto price market we can price.
+
+    Examples:
+        "Bitcoin above 100k by 2024"          -> ABOVE 100000
+        "Will ETH be below $2,500.50 on ..."  -> BELOW 2500.5
+        "SOL between $150 and $175 on ..."    -> BETWEEN 150 / 175
+    """
+    title_lower = title.lower()
+
+    asset = None
+    for symbol, pattern in ASSET_PATTERNS:
+        if pattern.search(title_lower):
+            asset = symbol
+            break
+    if not asset:
+        return None
+
+    match = BETWEEN_PATTERN.search(title_lower)
+    if match:
+        low = parse_number(match.group(1), match.group(2))
+        high = parse_number(match.group(3), match.group(4))
+        if low and high:
+            if low > high:
+                low, high = high, low
+            return {"asset": asset, "strike": low, "strike_high": high, "direction": "BETWEEN"}
+        return None
+
+    for direction, pattern in (("ABOVE", ABOVE_PATTERN), ("BELOW", BELOW_PATTERN)):
+        match = pattern.search(title_lower)
+        if match:
+            strike = parse_number(match.group(1), match.group(2))
+            if strike:
+                return {"asset": asset, "strike": strike, "direction": direction}
+            return None
+
+    return None
+
+class MarketParser:
+    """
+    Memoizes parse_title results per market slug, including markets that
+    don't parse, so a steady-state scan only does dict lookups.
+    A changed title for a known slug is re-parsed.
+    """
+    def __init__(self):
+        # slug -> (title, parsed or None)
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, title, slug):
+        entry = self.cache.get(slug)
+        if entry is not None and entry[0] == title:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        parsed = parse_title(title)
+        self.cache[slug] = (title, parsed)
+        return parsed
+
+    def evict(self, slug):
+        """Forget a market, e.g. once it has closed or resolved."""
+        self.cache.pop(slug, None)
+
+    def retain(self, active_slugs):
+        """Evict every cached market not in active_slugs."""
+        active_slugs = set(active_slugs)
+        for slug in [s for s in self.cache if s not in active_slugs]:
+            del self.cache[slug]
+
+    def __len__(self):
+        return len(self.cache)
@@ -0,0 +1,355 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+# Log-linear buckets: 2**SUB_BITS linear buckets below 2**SUB_BITS ns, then
+# 2**(SUB_BITS - 1) buckets per power of two, i.e. ~3% worst-case error
+SUB_BITS = 5
+_HALF = 1 << (SUB_BITS - 1)
+_LINEAR = 1 << SUB_BITS
+BUCKETS = 64 * _HALF  # covers every int64 nanosecond value
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+_now = time.perf_counter_ns
+
+def bucket_index(value):
+    """Bucket of a non-negative integer (nanoseconds)."""
+    if value < _LINEAR:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BITS
+    return shift * _HALF + (value >> shift)
+
+def bucket_value(index):
+    """Middle of the value range covered by a bucket."""
+    if index < _LINEAR:
+        return index
+    shift = index // _HALF - 1
+    low = (index - shift * _HALF) << shift
+    return low + ((1 << shift) - 1) / 2
+
+class Histogram:
+    """
+    HDR-style latency histogram over integer nanoseconds: fixed log-linear
+    buckets, so recording is an index computation, a list increment and
+    an add, and memory doesn't grow with the number of samples. Count and
+    max are derived from the buckets when read.
+
+    Updates take no lock. Under the GIL a concurrent increment can very
+    rarely be lost, which is fine for monitoring.
+    """
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.total = 0
+
+    def record(self, value):
+        if value < _LINEAR:
+            self.counts[value if value > 0 else 0] += 1
+        else:
+            shift = value.bit_length() - SUB_BITS
+            self.counts[shift * _HALF + (value >> shift)] += 1
+        self.total += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    @property
+    def max(self):
+        """Upper edge of the highest non-empty bucket."""
+        for index in range(BUCKETS - 1, -1, -1):
+            if self.counts[index]:
+                if index < _LINEAR:
+                    return index
+                shift = index // _HALF - 1
+                return ((index - shift * _HALF + 1) << shift) - 1
+        return 0
+
+    def quantile(self, q):
+        """Approximate value (ns) at quantile q in [0, 1]."""
+        count = self.count
+        if not count:
+            return 0.0
+        target = max(1, int(q * count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return bucket_value(index)
+        return 0.0
+
+    def mean(self):
+        count = self.count
+        return self.total / count if count else 0.0
+
+class Span:
+    """
+    One timed section; use via Timer.time() as a context manager. Spans
+    go back to their timer's free list on exit, so steady-state timing
+    allocates nothing.
+    """
+    __slots__ = ("histogram", "free", "start")
+
+    def __init__(self, histogram, free):
+        self.histogram = histogram
+        self.free = free
+
+    def __enter__(self):
+        self.start = _now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Histogram.record inlined: this runs on every span
+        value = _now() - self.start
+        histogram = self.histogram
+        if value < _LINEAR:
+            histogram.counts[value if value > 0 else 0] += 1
+        else:
+            shift = value.bit_length() - SUB_BITS
+            histogram.counts[shift * _HALF + (value >> shift)] += 1
+        histogram.total += value
+        self.free.append(self)
+
+class Timer:
+    """
+    Named, labelled latency histogram.
+
+        timer = metrics.timer("orderbook_fetch_seconds", client="sync")
+        with timer.time():
+            ...
+
+    A span reuses a free Span, so it costs two clock reads and three
+    short calls, well under a microsecond. Hot loops can go lower still:
+    take perf_counter_ns() and call record_ns() with the difference.
+    """
+    __slots__ = ("name", "labels", "histogram", "_free")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.histogram = Histogram()
+        # Spans not currently open; list pop/append are atomic under the GIL
+        self._free = []
+
+    def time(self):
+        try:
+            return self._free.pop()
+        except IndexError:
+            return Span(self.histogram, self._free)
+
+    def record_ns(self, nanoseconds):
+        # Histogram.record inlined: this is the cheapest way to time a call
+        histogram = self.histogram
+        if nanoseconds < _LINEAR:
+            histogram.counts[nanoseconds if nanoseconds > 0 else 0] += 1
+        else:
+            shift = nanoseconds.bit_length() - SUB_BITS
+            histogram.counts[shift * _HALF + (nanoseconds >> shift)] += 1
+        histogram.total += nanoseconds
+
+    def record(self, seconds):
+        self.histogram.record(int(seconds * 1e9))
+
+    def __call__(self, func):
+        """Decorator form: time every call of func."""
+        histogram = self.histogram
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def timed_async(*args, **kwargs):
+                start = _now()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.record(_now() - start)
+            return timed_async
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = _now()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Histogram.record inlined, as in Span.__exit__
+                value = _now() - start
+                if value < _LINEAR:
+                    histogram.counts[value if value > 0 else 0] += 1
+                else:
+                    shift = value.bit_length() - SUB_BITS
+                    histogram.counts[shift * _HALF + (value >> shift)] += 1
+                histogram.total += value
+        return timed
+
+    def snapshot(self):
+        h = self.histogram
+        count = h.count
+        snapshot = {
+            "count": count, "sum": h.total / 1e9,
+            "mean": h.total / count / 1e9 if count else 0.0, "max": h.max / 1e9,
+        }
+        for q in QUANTILES:
+            snapshot[f"p{q * 100:g}"] = h.quantile(q) / 1e9
+        return snapshot
+
+class Counter:
+    """Monotonic counter; inc() is a single attribute add."""
+    __slots__ = ("name", "labels", "value")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def snapshot(self):
+        return {"value": self.value}
+
+class MetricsRegistry:
+    """
+    Process-wide set of timers and counters, keyed by name and labels.
+    Lookups are a dict read; hold on to the returned Timer/Counter in hot
+    paths to skip even that. Exports Prometheus text and JSON.
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, labels):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = self._metrics[key] = cls(name, key[1])
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.__class__.__name__}")
+        return metric
+
+    def timer(self, name, **labels):
+        return self._get(Timer, name, labels)
+
+    def counter(self, name, **labels):
+        return self._get(Counter, name, labels)
+
+    # --- Export ---
+
+    def snapshot(self):
+        """{name: [{"labels": {...}, ...stats}]}; timer values in seconds."""
+        result = {}
+        for metric in list(self._metrics.values()):
+            entry = {"labels": dict(metric.labels)}
+            entry.update(metric.snapshot())
+            result.setdefault(metric.name, []).append(entry)
+        return result
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_prometheus(self):
+        """Prometheus text exposition: timers as summaries (seconds), counters as counters."""
+        by_name = {}
+        for metric in list(self._metrics.values()):
+            by_name.setdefault(metric.name, []).append(metric)
+        lines = []
+        for name in sorted(by_name):
+            metrics = by_name[name]
+            if isinstance(metrics[0], Counter):
+                lines.append(f"# TYPE {name} counter")
+                for metric in metrics:
+                    lines.append(f"{name}{_labels(metric.labels)} {metric.value}")
+                continue
+            lines.append(f"# TYPE {name} summary")
+            for metric in metrics:
+                h = metric.histogram
+                for q in QUANTILES:
+                    lines.append(f"{name}{_labels(metric.labels, quantile=q)} {h.quantile(q) / 1e9:.9g}")
+                lines.append(f"{name}_sum{_labels(metric.labels)} {h.total / 1e9:.9g}")
+                lines.append(f"{name}_count{_labels(metric.labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+def _labels(labels, **extra):
+    pairs = list(labels) + [(k, v) for k, v in extra.items()]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+METRICS = MetricsRegistry()
+
+def timer(name, **labels):
+    """Timer from the default registry."""
+    return METRICS.timer(name, **labels)
+
+def counter(name, **labels):
+    """Counter from the default registry."""
+    return METRICS.counter(name, **labels)
+
+_STATIC_SEGMENTS = frozenset({
+    "markets", "active", "orderbook", "user-orders", "orders", "cancel-batch", "all", "portfolio",
+    "positions", "balance",
+})
+
+@functools.lru_cache(maxsize=4096)
+def route(path):
+    """API path with slugs and ids collapsed, e.g. /markets/btc-100k/orderbook -> /markets/{id}/orderbook."""
+    path = path.split("?", 1)[0]
+    return "/".join(s if not s or s in _STATIC_SEGMENTS else "{id}" for s in path.split("/"))
+
+class MetricsServer:
+    """
+    Serves a registry on the event loop over plain HTTP:
+    GET /metrics (Prometheus text) and GET /metrics.json.
+    Meant for localhost scraping, not exposure to the internet.
+    """
+    def __init__(self, registry=None, host=None, port=None):
+        self.registry = registry or METRICS
+        self.host = host or Config.METRICS_HOST
+        self.port = port if port is not None else Config.METRICS_PORT
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Skip the headers; there is no body for GET
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass
+            parts = request.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) > 1 else ""
+            if path == "/metrics":
+                status, content_type, body = "200 OK", "text/plain; version=0.0.4", self.registry.to_prometheus()
+            elif path == "/metrics.json":
+                status, content_type, body = "200 OK", "application/json", self.registry.to_json()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "not found\n"
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,588 @@
+"""
+Local mock of the Limitless API for load and fault testing.
+
+Serves the routes LimitlessClient, AsyncLimitlessClient and LimitlessAuth
+use, over real HTTP, with an order matching engine and a WebSocket feed
+of book changes and order updates. Latency, 5xx errors and 429s are
+injected on request so retry, backoff and re-login paths can be exercised
+at load.
+
+    python src/mock_exchange.py --port 8080 --markets 500 --latency-ms 5 --error-rate 0.01 --rate-limit 200
+    API_URL=http://127.0.0.1:8080 python src/main.py
+
+or in-process:
+
+    with MockExchange(markets=500, latency=0.005) as exchange:
+        Config.API_URL = exchange.url
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import itertools
+import random
+import threading
+import time
+import uuid
+from aiohttp import WSMsgType, web
+try:
+    from .orderbook import OrderBook
+    from .rate_limiter import TokenBucket
+    from .log import get_logger, setup_logging
+except ImportError:
+    from orderbook import OrderBook
+    from rate_limiter import TokenBucket
+    from log import get_logger, setup_logging
+
+logger = get_logger("mock_exchange")
+
+COOKIE = "limitless_session"
+BUY, SELL = 0, 1
+# Order amounts are in 6-decimal units (USDC and shares alike)
+SCALE = 1_000_000
+
+SPOT = {"BTCUSDT": 95_000.0, "ETHUSDT": 3_500.0, "SOLUSDT": 180.0}
+NAMES = {"BTCUSDT": "Bitcoin", "ETHUSDT": "Ethereum", "SOLUSDT": "Solana"}
+
+def generate_markets(count, seed=7, now=None):
+    """
+    Crypto price markets with strikes spread around spot and deadlines
+    1h-30d out. Like the real listing, each carries "prices" ([YES, NO] in
+    percent) and "liquidity" taken from its generated book.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    pairs = list(SPOT)
+    markets = []
+    for i in range(count):
+        pair = pairs[i % len(pairs)]
+        strike = round(SPOT[pair] * rng.uniform(0.6, 1.4), 2)
+        deadline = now + datetime.timedelta(hours=rng.uniform(1, 24 * 30))
+        direction = "above" if rng.random() < 0.7 else "below"
+        slug = f"{NAMES[pair].lower()}-{direction}-{i}"
+        book = OrderBook.from_snapshot(generate_orderbook(slug), slug)
+        markets.append({
+            "slug": slug,
+            "title": f"{NAMES[pair]} {direction} ${strike:,.2f} on {deadline:%b %d}?",
+            "deadline": deadline.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "tokens": {"yes": str(10**20 + 2 * i), "no": str(10**20 + 2 * i + 1)},
+            "prices": [round(book.mid() * 100, 1), round((1 - book.mid()) * 100, 1)],
+            "liquidity": round(book.liquidity(), 2),
+        })
+    return markets
+
+def generate_orderbook(slug, levels=10):
+    """A book around a slug-seeded mid price; some are far from fair value on purpose."""
+    rng = random.Random(slug)
+    mid = rng.uniform(0.05, 0.95)
+    spread = rng.uniform(0.01, 0.04)
+    bids = [{"price": round(max(0.01, mid - spread / 2 - i * 0.01), 2), "size": rng.randint(10, 500)}
+            for i in range(levels)]
+    asks = [{"price": round(min(0.99, mid + spread / 2 + i * 0.01), 2), "size": rng.randint(10, 500)}
+            for i in range(levels)]
+    return {"bids": bids, "asks": asks}
+
+def book_snapshot(book):
+    return {
+        "bids": [{"price": price, "size": size} for price, size in book.bids.levels()],
+        "asks": [{"price": price, "size": size} for price, size in book.asks.levels()],
+    }
+
+class MockExchange:
+    """
+    aiohttp server holding one YES orderbook per market.
+
+    Orders on the YES token match against the book directly; NO orders are
+    mapped onto it as the complement (buying NO at p is selling YES at
+    1 - p). Marketable orders fill level by level, our own resting orders
+    at a level first, and any remainder rests at the limit price.
+
+    Fault settings are plain attributes and can be changed while running.
+    """
+    def __init__(self, markets=50, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 throttle_rate=0.0, rate_limit=None, session_ttl=86400, balance=1000.0,
+                 tick_interval=None, seed=7):
+        """
+        :param markets: Number of generated markets, or a list of market dicts
+        :param latency: Seconds added to every response
+        :param jitter: Up to this many extra seconds, uniformly at random
+        :param error_rate: Fraction of requests answered with a 500
+        :param throttle_rate: Fraction of requests answered with a 429 regardless of budget
+        :param rate_limit: Requests per second before 429s (None for unlimited)
+        :param session_ttl: Seconds a login cookie stays valid
+        :param balance: Starting USDC balance
+        :param tick_interval: Seconds between random book changes pushed to
+                              WebSocket subscribers (None for a static book)
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.session_ttl = session_ttl
+        self.balance = balance
+        self.tick_interval = tick_interval
+        self.rng = random.Random(seed)
+
+        self.markets = generate_markets(markets, seed) if isinstance(markets, int) else list(markets)
+        self.by_slug = {m["slug"]: m for m in self.markets}
+        self.tokens = {}
+        for market in self.markets:
+            for outcome, token_id in (market.get("tokens") or {}).items():
+                self.tokens[str(token_id)] = (market["slug"], outcome.upper())
+        self.books = {m["slug"]: OrderBook.from_snapshot(generate_orderbook(m["slug"]), m["slug"])
+                      for m in self.markets}
+        self.etag = f'"mock-{seed}-{len(self.markets)}"'
+
+        self.sessions = {}         # cookie -> expiry epoch
+        self.orders = {}           # order id -> order
+        self.resting = collections.defaultdict(collections.deque)  # (slug, side, price) -> order ids
+        self.positions = {}        # token id -> {"slug", "outcome", "size", "cost"}
+        self.requests = 0
+        self.statuses = collections.Counter()
+        self._bucket = None
+        self._ids = itertools.count(1)
+        self._subscribers = {}     # websocket -> set of slugs, or None for all
+
+        self.app = web.Application(middlewares=[self._faults])
+        self.app.router.add_get("/auth/signing-message", self.signing_message)
+        self.app.router.add_post("/auth/login", self.login)
+        self.app.router.add_get("/markets/active", self.active_markets)
+        self.app.router.add_get("/markets/{slug}", self.market_details)
+        self.app.router.add_get("/markets/{slug}/orderbook", self.orderbook)
+        self.app.router.add_get("/markets/{slug}/user-orders", self.user_orders)
+        self.app.router.add_post("/orders", self.create_order)
+        self.app.router.add_post("/orders/cancel-batch", self.cancel_batch)
+        self.app.router.add_delete("/orders/all/{slug}", self.cancel_all)
+        self.app.router.add_delete("/orders/{order_id}", self.cancel_order)
+        self.app.router.add_get("/portfolio/balance", self.get_balance)
+        self.app.router.add_get("/portfolio/positions", self.get_positions)
+        self.app.router.add_get("/ws", self.websocket)
+
+        self._runner = None
+        self._ticker = None
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.port}/ws"
+
+    # --- Lifecycle ---
+
+    async def start_async(self):
+        """Serve on the running event loop."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        if self.tick_interval:
+            self._ticker = asyncio.create_task(self._tick_loop())
+        logger.info("Mock exchange on %s with %d markets", self.url, len(self.markets))
+        return self
+
+    async def stop_async(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        for ws in list(self._subscribers):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start(self):
+        """Serve from a background thread with its own event loop (for sync clients)."""
+        started = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start_async())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop_async())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="MockExchange", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    async def __aenter__(self):
+        return await self.start_async()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop_async()
+
+    # --- Faults ---
+
+    @web.middleware
+    async def _faults(self, request, handler):
+        self.requests += 1
+        if request.path == "/ws":
+            return await handler(request)
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+        response = self._throttle()
+        if response is None and self.error_rate and self.rng.random() < self.error_rate:
+            response = web.json_response({"message": "Internal server error"}, status=500)
+        if response is None:
+            response = await handler(request)
+        self.statuses[response.status] += 1
+        return response
+
+    def _throttle(self):
+        """A 429 response when over budget (or randomly throttled), else None."""
+        if self.rate_limit:
+            if self._bucket is None or self._bucket.rate != self.rate_limit:
+                self._bucket = TokenBucket(self.rate_limit, self.rate_limit)
+            self._bucket.refill(time.monotonic())
+            if self._bucket.tokens >= 1:
+                self._bucket.tokens -= 1
+                return None
+            wait = self._bucket.wait_time(1)
+            return web.json_response({"message": "Too many requests"}, status=429, headers={
+                "Retry-After": f"{wait:.3f}", "X-RateLimit-Remaining": "0",
+            })
+        if self.throttle_rate and self.rng.random() < self.throttle_rate:
+            return web.json_response({"message": "Too many requests"}, status=429, headers={"Retry-After": "0"})
+        return None
+
+    def expire_sessions(self):
+        """Invalidate every login, so the next authenticated request gets a 401."""
+        self.sessions.clear()
+
+    def _authorized(self, request):
+        expiry = self.sessions.get(request.cookies.get(COOKIE))
+        return expiry is not None and expiry > time.time()
+
+    @staticmethod
+    def _unauthorized():
+        return web.json_response({"message": "Unauthorized"}, status=401)
+
+    # --- Auth ---
+
+    async def signing_message(self, request):
+        return web.Response(text=f"Welcome to Limitless.exchange! Nonce: {uuid.uuid4().hex}")
+
+    async def login(self, request):
+        account = request.headers.get("x-account")
+        if not account or not request.headers.get("x-signature"):
+            return web.json_response({"message": "Missing signature headers"}, status=400)
+        cookie = uuid.uuid4().hex
+        self.sessions[cookie] = time.time() + self.session_ttl
+        response = web.json_response({"account": account, "id": 1, "rank": {"feeRateBps": 0}})
+        response.set_cookie(COOKIE, cookie, max_age=self.session_ttl, path="/")
+        return response
+
+    # --- Market data ---
+
+    async def active_markets(self, request):
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers={"ETag": self.etag})
+        page = int(request.query.get("page", 1))
+        limit = int(request.query.get("limit", 100))
+        data = self.markets[(page - 1) * limit:page * limit]
+        return web.json_response({"data": data, "totalMarketsCount": len(self.markets)},
+                                 headers={"ETag": self.etag})
+
+    async def market_details(self, request):
+        market = self.by_slug.get(request.match_info["slug"])
+        if market is None:
+            return web.json_response({"message": "Market not found"}, status=404)
+        return web.json_response(market)
+
+    async def orderbook(self, request):
+        book = self.books.get(request.match_info["slug"])
+        if book is None:
+            return web.json_response({"message": "Market not found"}, status=404)
+        return web.json_response(book_snapshot(book))
+
+    # --- Orders ---
+
+    async def create_order(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        body = await request.json()
+        order, error = self._parse_order(body)
+        if error:
+            return web.json_response({"message": error}, status=400)
+        changes, updates = [], []
+        self._match(order, changes, updates)
+        self._publish(order["marketSlug"], changes, updates)
+        return web.json_response(self._public(order), status=201)
+
+    def _parse_order(self, body):
+        order = body.get("order") or {}
+        token_id = str(order.get("tokenId"))
+        if token_id not in self.tokens:
+            return None, f"Unknown token {token_id}"
+        if not order.get("signature"):
+            return None, "Missing signature"
+        side = int(order.get("side", BUY))
+        price = round(float(order.get("price", 0)), 2)
+        if not 0 < price < 1:
+            return None, "Price must be between 0 and 1"
+        shares = int(order["takerAmount"] if side == BUY else order["makerAmount"]) / SCALE
+        if shares <= 0:
+            return None, "Amount too small"
+        slug, outcome = self.tokens[token_id]
+        # Everything trades on the YES book; NO is its complement
+        book_side, book_price = (side, price) if outcome == "YES" else (1 - side, round(1 - price, 2))
+        return {
+            "id": f"mock-{next(self._ids)}",
+            "marketSlug": slug,
+            "tokenId": token_id,
+            "outcome": outcome,
+            "side": "BUY" if side == BUY else "SELL",
+            "price": price,
+            "size": shares,
+            "remainingSize": shares,
+            "filledSize": 0.0,
+            "status": "LIVE",
+            "createdAt": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "_book_side": book_side,
+            "_book_price": book_price,
+        }, None
+
+    def _match(self, order, changes, updates):
+        """Fill `order` against the book, then rest what is left."""
+        book = self.books[order["marketSlug"]]
+        buying = order["_book_side"] == BUY
+        opposite, key = (book.asks, "asks") if buying else (book.bids, "bids")
+        limit = order["_book_price"]
+        for price, size in opposite.levels():
+            if order["remainingSize"] <= 1e-9 or (price > limit if buying else price < limit):
+                break
+            take = min(size, order["remainingSize"])
+            # Our own resting orders at this level are ahead of the seeded liquidity
+            queue = self.resting[(order["marketSlug"], 1 - order["_book_side"], price)]
+            left = take
+            while queue and left > 1e-9:
+                maker = self.orders[queue[0]]
+                filled = min(left, maker["remainingSize"])
+                self._fill(maker, filled, price, updates)
+                left -= filled
+                if maker["remainingSize"] <= 1e-9:
+                    del self.orders[queue.popleft()]
+            self._fill(order, take, price, updates)
+            opposite.set_level(price, size - take)
+            changes.append({"side": key, "price": price, "size": size - take})
+
+        if order["remainingSize"] > 1e-9:
+            own, key = (book.bids, "bids") if buying else (book.asks, "asks")
+            size = own.size_at(limit) + order["remainingSize"]
+            own.set_level(limit, size)
+            changes.append({"side": key, "price": limit, "size": size})
+            self.resting[(order["marketSlug"], order["_book_side"], limit)].append(order["id"])
+            self.orders[order["id"]] = order
+
+    def _fill(self, order, shares, book_price, updates):
+        price = book_price if order["outcome"] == "YES" else round(1 - book_price, 2)
+        order["remainingSize"] -= shares
+        order["filledSize"] += shares
+        order["status"] = "MATCHED" if order["remainingSize"] <= 1e-9 else "PARTIALLY_MATCHED"
+        signed = shares if order["side"] == "BUY" else -shares
+        self.balance -= signed * price
+        position = self.positions.setdefault(order["tokenId"], {
+            "slug": order["marketSlug"], "outcome": order["outcome"], "size": 0.0, "cost": 0.0,
+        })
+        position["size"] += signed
+        position["cost"] += signed * price
+        updates.append(self._public(order))
+
+    def _cancel(self, order_id, changes, updates):
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        book = self.books[order["marketSlug"]]
+        side, key = (book.bids, "bids") if order["_book_side"] == BUY else (book.asks, "asks")
+        price = order["_book_price"]
+        size = max(0.0, side.size_at(price) - order["remainingSize"])
+        side.set_level(price, size)
+        changes.append({"side": key, "price": price, "size": size})
+        queue = self.resting[(order["marketSlug"], order["_book_side"], price)]
+        if order_id in queue:
+            queue.remove(order_id)
+        order["status"] = "CANCELLED"
+        updates.append(self._public(order))
+        return True
+
+    def _open_orders(self, slug):
+        return [o for o in self.orders.values() if o["marketSlug"] == slug and o["remainingSize"] > 1e-9]
+
+    @staticmethod
+    def _public(order):
+        return {k: v for k, v in order.items() if not k.startswith("_")}
+
+    async def user_orders(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        return web.json_response([self._public(o) for o in self._open_orders(request.match_info["slug"])])
+
+    async def cancel_order(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        order_id = request.match_info["order_id"]
+        order = self.orders.get(order_id)
+        changes, updates = [], []
+        if not self._cancel(order_id, changes, updates):
+            return web.json_response({"message": "Order not found"}, status=404)
+        self._publish(order["marketSlug"], changes, updates)
+        return web.json_response({"message": "Order canceled successfully", "id": order_id})
+
+    async def cancel_batch(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        body = await request.json()
+        cancelled, failed = [], []
+        for order_id in body.get("orderIds", []):
+            order = self.orders.get(order_id)
+            changes, updates = [], []
+            if self._cancel(order_id, changes, updates):
+                cancelled.append(order_id)
+                self._publish(order["marketSlug"], changes, updates)
+            else:
+                failed.append(order_id)
+        return web.json_response({"canceled": cancelled, "failed": failed})
+
+    async def cancel_all(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        slug = request.match_info["slug"]
+        changes, updates = [], []
+        cancelled = [o["id"] for o in self._open_orders(slug) if self._cancel(o["id"], changes, updates)]
+        self._publish(slug, changes, updates)
+        return web.json_response({"canceled": cancelled})
+
+    # --- Portfolio ---
+
+    async def get_balance(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        return web.json_response({"balance": self.balance})
+
+    async def get_positions(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        return web.json_response([{
+            "market": {"slug": p["slug"], "title": self.by_slug[p["slug"]].get("title", "")},
+            "tokenId": token_id,
+            "outcome": p["outcome"],
+            "size": p["size"],
+            "avgPrice": p["cost"] / p["size"] if p["size"] else 0.0,
+        } for token_id, p in self.positions.items() if p["size"]])
+
+    # --- WebSocket ---
+
+    async def websocket(self, request):
+        """
+        Push book changes and our order updates. Send
+        {"type": "subscribe", "markets": [slug, ...]} (omit "markets" for
+        all); each subscribed market starts with a full "orderbook" message
+        followed by "delta" messages in OrderBook.apply_deltas format.
+        """
+        ws = web.WebSocketResponse(heartbeat=20)
+        await ws.prepare(request)
+        self._subscribers[ws] = set()
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                data = message.json()
+                if data.get("type") != "subscribe":
+                    continue
+                slugs = data.get("markets")
+                self._subscribers[ws] = None if slugs is None else self._subscribers[ws] | set(slugs)
+                for slug in slugs if slugs is not None else self.books:
+                    if slug in self.books:
+                        await ws.send_json({"type": "orderbook", "slug": slug, **book_snapshot(self.books[slug])})
+        finally:
+            self._subscribers.pop(ws, None)
+        return ws
+
+    def _publish(self, slug, changes, updates):
+        if not self._subscribers or not (changes or updates):
+            return
+        messages = []
+        if changes:
+            messages.append({"type": "delta", "slug": slug, "changes": changes})
+        messages.extend({"type": "order", "order": update} for update in updates)
+        for ws, slugs in list(self._subscribers.items()):
+            if ws.closed or (slugs is not None and slug not in slugs):
+                continue
+            for message in messages:
+                asyncio.ensure_future(ws.send_json(message))
+
+    async def _tick_loop(self):
+        """Random size changes near the touch, so subscribers see a live book."""
+        slugs = list(self.books)
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            slug = self.rng.choice(slugs)
+            book = self.books[slug]
+            key = self.rng.choice(("bids", "asks"))
+            side = book.bids if key == "bids" else book.asks
+            levels = side.levels()
+            if not levels:
+                continue
+            price, _ = self.rng.choice(levels[:3])
+            size = float(self.rng.randint(10, 500))
+            side.set_level(price, size)
+            self._publish(slug, [{"side": key, "price": price, "size": size}], [])
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Limitless API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--markets", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with a 429")
+    parser.add_argument("--rate-limit", type=float, help="Requests per second before 429s")
+    parser.add_argument("--session-ttl", type=float, default=86400)
+    parser.add_argument("--tick-ms", type=float, help="Interval of random book changes on the WebSocket")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    setup_logging()
+
+    exchange = MockExchange(
+        markets=args.markets, host=args.host, port=args.port,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, rate_limit=args.rate_limit,
+        session_ttl=args.session_ttl, tick_interval=args.tick_ms / 1000 if args.tick_ms else None,
+        seed=args.seed,
+    )
+
+    async def serve():
+        async with exchange:
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import asyncio
+import collections
+import hashlib
+import json
+import time
+import aiohttp
+import websockets
+try:
+    from .config import Config
+    from .market_index import normalize_key
+    from .metrics import METRICS
+    from .log import get_logger
+except ImportError:
+    from config import Config
+    from market_index import normalize_key
+    from metrics import METRICS
+    from log import get_logger
+
+logger = get_logger("news_feed")
+
+def parse_news(message):
+    """
+    Normalize a raw news message (JSON text, bytes or dict) into an event
+    dict with at least "keyword", or None if it isn't one. A list of
+    events is not accepted here; sources split batches themselves.
+    """
+    if isinstance(message, (bytes, bytearray)):
+        message = message.decode("utf-8", "replace")
+    if isinstance(message, str):
+        try:
+            message = json.loads(message)
+        except ValueError:
+            return None
+    if not isinstance(message, dict):
+        return None
+    keyword = message.get("keyword")
+    if not keyword:
+        return None
+    return dict(message)
+
+def content_hash(event):
+    """
+    Identity of a story across sources and retransmits: keyword, action and
+    headline after normalization. Timestamps and source metadata are ignored.
+    """
+    key = "|".join((
+        normalize_key(str(event.get("keyword", ""))),
+        str(event.get("action") or "").strip().lower(),
+        normalize_key(str(event.get("headline") or event.get("title") or "")),
+    ))
+    return hashlib.blake2b(key.encode(), digest_size=8).digest()
+
+class DropOldestQueue(asyncio.Queue):
+    """
+    Bounded asyncio queue that never blocks producers: when full, the
+    oldest item is discarded to make room. Stale news is worth less than
+    fresh news, so under backpressure the backlog is what gets shed.
+    """
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def put_nowait(self, item):
+        if self.full():
+            self.get_nowait()
+            self.task_done()
+            self.dropped += 1
+        super().put_nowait(item)
+
+# --- Sources ---
+
+class NewsSource:
+    """
+    A news source is an async iterator of raw messages. `messages()` may
+    raise on connection errors; the pipeline reconnects with backoff.
+    Returning normally means the source is exhausted (e.g. a replay file).
+    """
+    name = "news"
+    reconnect = True
+
+    async def messages(self):
+        raise NotImplementedError
+        yield
+
+class WebSocketNewsSource(NewsSource):
+    """Push feed over a WebSocket; one JSON event per frame."""
+    def __init__(self, url, subscribe=None, name=None):
+        """
+        :param subscribe: Optional message (dict or str) sent after connecting
+        """
+        self.url = url
+        self.subscribe = subscribe
+        self.name = name or url
+
+    async def messages(self):
+        async with websockets.connect(self.url, ping_interval=20) as ws:
+            if self.subscribe is not None:
+                await ws.send(self.subscribe if isinstance(self.subscribe, str) else json.dumps(self.subscribe))
+            async for message in ws:
+                yield message
+
+class HttpPollNewsSource(NewsSource):
+    """
+    HTTP long-poll feed. Each GET blocks server-side until news arrives or
+    `timeout` passes and returns a list of events, or {"events": [...],
+    "cursor": ...}; the cursor is sent back as `since` on the next poll.
+    """
+    def __init__(self, url, timeout=30.0, name=None):
+        self.url = url
+        self.timeout = timeout
+        self.name = name or url
+        self.cursor = None
+
+    async def messages(self):
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout + 10)
+        async with aiohttp.ClientSession(timeout=client_timeout) as session:
+            while True:
+                params = {"timeout": str(int(self.timeout))}
+                if self.cursor is not None:
+                    params["since"] = str(self.cursor)
+                async with session.get(self.url, params=params) as response:
+                    if response.status == 204:
+                        continue
+                    response.raise_for_status()
+                    payload = await response.json()
+                if isinstance(payload, dict):
+                    self.cursor = payload.get("cursor", self.cursor)
+                    payload = payload.get("events", [])
+                for event in payload or ():
+                    yield event
+
+class FileNewsSource(NewsSource):
+    """
+    Replays a JSONL file of events, for tests and backtests. With `speed`
+    the gaps between event timestamps are reproduced (divided by speed);
+    without it events are emitted as fast as the pipeline takes them.
+    """
+    reconnect = False
+
+    def __init__(self, path, speed=None, name=None):
+        self.path = path
+        self.speed = speed
+        self.name = name or path
+
+    async def messages(self):
+        previous = None
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if self.speed:
+                    ts = json.loads(line).get("timestamp")
+                    if ts is not None and previous is not None and ts > previous:
+                        await asyncio.sleep((ts - previous) / self.speed)
+                    previous = ts if ts is not None else previous
+                yield line
+
+class SocketNewsSource(NewsSource):
+    """Line-delimited JSON over a TCP socket, e.g. a local replay or relay process."""
+    def __init__(self, host, port, name=None):
+        self.host = host
+        self.port = port
+        self.name = name or f"{host}:{port}"
+
+    async def messages(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                if line.strip():
+                    yield line
+        finally:
+            writer.close()
+
+def sources_from_config():
+    """News sources enabled in Config (NEWS_WS_URL, NEWS_POLL_URL, NEWS_REPLAY_FILE, NEWS_SOCKET)."""
+    sources = []
+    if Config.NEWS_WS_URL:
+        sources.append(WebSocketNewsSource(Config.NEWS_WS_URL))
+    if Config.NEWS_POLL_URL:
+        sources.append(HttpPollNewsSource(Config.NEWS_POLL_URL))
+    if Config.NEWS_REPLAY_FILE:
+        sources.append(FileNewsSource(Config.NEWS_REPLAY_FILE, speed=Config.NEWS_REPLAY_SPEED or None))
+    if Config.NEWS_SOCKET:
+        host, _, port = Config.NEWS_SOCKET.rpartition(":")
+        sources.append(SocketNewsSource(host or "127.0.0.1", int(port)))
+    return sources
+
+# --- Pipeline ---
+
+class NewsPipeline:
+    """
+    Runs news sources, deduplicates their events and delivers them to a
+    callback on the event loop.
+
+    Each source runs in its own task and stamps every event on receipt
+    ("received_at", wall clock, plus a perf_counter_ns mark). Events whose
+    content hash was seen within dedup_ttl are dropped before queueing.
+    The rest go through one bounded DropOldestQueue to a single
+    dispatcher, which calls on_event(event) and records the latency from
+    receipt to callback. When the event carries a source "timestamp", the
+    upstream lag (receipt minus source time) is tracked too. Both are
+    metrics Timers, so they are exported with everything else.
+
+    Usage:
+        pipeline = NewsPipeline(sources_from_config(), on_event=lambda e: scheduler.emit("news", e))
+        pipeline.start()
+        ...
+        await pipeline.stop()
+    """
+    def __init__(self, sources, on_event, queue_size=None, dedup_ttl=None, report_interval=None, registry=None):
+        """
+        :param sources: NewsSource instances
+        :param on_event: Callback(event) run on the loop for every new event
+        :param queue_size: Max events waiting for dispatch before the oldest are dropped
+        :param dedup_ttl: Seconds a content hash is remembered
+        :param report_interval: How often stats are printed (None to disable)
+        :param registry: MetricsRegistry the latency timers live in (default: METRICS)
+        """
+        self.sources = list(sources)
+        self.on_event = on_event
+        self.queue_size = queue_size or Config.NEWS_QUEUE_SIZE
+        self.dedup_ttl = dedup_ttl if dedup_ttl is not None else Config.NEWS_DEDUP_TTL
+        self.report_interval = report_interval
+        self.queue = None
+        self._seen = collections.OrderedDict()  # content hash -> first seen (monotonic)
+        self._tasks = []
+
+        # Stats
+        self.received = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.delivered = 0
+        self.errors = 0
+        registry = registry or METRICS
+        self.dispatch_latency = registry.timer("news_dispatch_seconds")
+        self.source_lag = registry.timer("news_source_lag_seconds")
+
+    # --- Ingest ---
+
+    def ingest(self, message, source="news"):
+        """
+        Stamp, validate and dedup one raw message, and queue it. Returns the
+        event, or None if it was invalid or a duplicate. Loop thread only.
+        """
+        received = time.perf_counter_ns()
+        received_at = time.time()
+        self.received += 1
+        event = parse_news(message)
+        if event is None:
+            self.invalid += 1
+            return None
+        digest = content_hash(event)
+        now = time.monotonic()
+        self._expire(now)
+        if digest in self._seen:
+            self.duplicates += 1
+            return None
+        self._seen[digest] = now
+
+        event["source"] = event.get("source", source)
+        event["received_at"] = received_at
+        event["_received"] = received
+        ts = event.get("timestamp")
+        if isinstance(ts, (int, float)) and ts > 0:
+            self.source_lag.record(max(0.0, received_at - ts))
+        self._queue().put_nowait(event)
+        return event
+
+    def _expire(self, now):
+        seen = self._seen
+        while seen:
+            digest, first = next(iter(seen.items()))
+            if now - first < self.dedup_ttl:
+                break
+            seen.popitem(last=False)
+
+    def _queue(self):
+        # Created lazily so it binds to the running loop
+        if self.queue is None:
+            self.queue = DropOldestQueue(self.queue_size)
+        return self.queue
+
+    async def _run_source(self, source):
+        backoff = 0.5
+        while True:
+            try:
+                async for message in source.messages():
+                    backoff = 0.5
+                    self.ingest(message, source.name)
+                if not source.reconnect:
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                if not source.reconnect:
+                    # A replay would start over from the first event
+                    logger.warning("%s error: %s, not reconnecting", source.name, e)
+                    return
+                logger.warning("%s error: %s, reconnecting in %.1fs", source.name, e, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    # --- Dispatch ---
+
+    async def _dispatch(self):
+        queue = self._queue()
+        while True:
+            event = await queue.get()
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logger.exception("Callback failed: %s", e)
+            finally:
+                queue.task_done()
+            self.delivered += 1
+            self.dispatch_latency.record_ns(time.perf_counter_ns() - event["_received"])
+
+    async def drain(self):
+        """Wait until every queued event has been delivered."""
+        await self._queue().join()
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Start source, dispatcher and report tasks on the running loop."""
+        self._queue()
+        self._tasks = [asyncio.create_task(self._dispatch())]
+        self._tasks += [asyncio.create_task(self._run_source(source)) for source in self.sources]
+        if self.report_interval:
+            self._tasks.append(asyncio.create_task(self._report()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            latency = self.dispatch_latency.snapshot()
+            logger.info(
+                "received=%d delivered=%d duplicates=%d dropped=%d dispatch p50=%.0fus p99=%.0fus max=%.0fus",
+                self.received, self.delivered, self.duplicates, self.queue.dropped,
+                latency['p50'] * 1e6, latency['p99'] * 1e6, latency['max'] * 1e6,
+            )
+
+    def stats(self):
+        """Snapshot of counters and latencies (seconds)."""
+        return {
+            "received": self.received,
+            "invalid": self.invalid,
+            "duplicates": self.duplicates,
+            "dropped": self.queue.dropped if self.queue is not None else 0,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "dispatch_latency": self.dispatch_latency.snapshot(),
+            "source_lag": self.source_lag.snapshot(),
+        }
@@ -0,0 +1,163 @@
+from concurrent.futures import ProcessPoolExecutor
+from eth_hash.auto import keccak
+from eth_keys import keys
+from eth_utils import to_canonical_address
+try:
+    from .config import Config
+    from .metrics import timer
+except ImportError:
+    from config import Config
+    from metrics import timer
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+DOMAIN_NAME = "Limitless CTF Exchange"
+DOMAIN_VERSION = "1"
+
+# Field order must match the Order struct the exchange contracts hash
+ORDER_FIELDS = (
+    ("salt", "uint256"),
+    ("maker", "address"),
+    ("signer", "address"),
+    ("taker", "address"),
+    ("tokenId", "uint256"),
+    ("makerAmount", "uint256"),
+    ("takerAmount", "uint256"),
+    ("expiration", "uint256"),
+    ("nonce", "uint256"),
+    ("feeRateBps", "uint256"),
+    ("side", "uint8"),
+    ("signatureType", "uint8"),
+)
+
+ORDER_TYPE_HASH = keccak(
+    ("Order(" + ",".join(f"{type_} {name}" for name, type_ in ORDER_FIELDS) + ")").encode()
+)
+DOMAIN_TYPE_HASH = keccak(
+    b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+)
+
+def _word(value):
+    return int(value).to_bytes(32, "big")
+
+def _address_word(address):
+    return b"\x00" * 12 + to_canonical_address(address)
+
+def domain_separator(chain_id, verifying_contract):
+    """EIP-712 domain separator for one exchange contract."""
+    return keccak(
+        DOMAIN_TYPE_HASH
+        + keccak(DOMAIN_NAME.encode())
+        + keccak(DOMAIN_VERSION.encode())
+        + _word(chain_id)
+        + _address_word(verifying_contract)
+    )
+
+class OrderSigner:
+    """
+    EIP-712 order signing with the constant parts precomputed.
+
+    The domain separators for the CLOB and NegRisk contracts and the Order
+    type hash are built once; signing an order only ABI-encodes its twelve
+    fields, takes two keccaks and one ECDSA signature. Produces the same
+    signatures as encode_typed_data + sign_message.
+
+    The ECDSA step is most of the remaining cost. When coincurve is
+    installed it runs on libsecp256k1 with the key object kept warm;
+    otherwise it falls back to eth_keys' pure Python backend.
+    """
+    def __init__(self, private_key, chain_id=None, clob_address=None, negrisk_address=None):
+        self.private_key = keys.PrivateKey(bytes.fromhex(private_key[2:] if private_key.startswith("0x") else private_key))
+        self._fast_key = coincurve.PrivateKey(self.private_key.to_bytes()) if coincurve else None
+        chain_id = chain_id if chain_id is not None else Config.CHAIN_ID
+        self.domain_separators = {
+            "CLOB": domain_separator(chain_id, clob_address or Config.CLOB_CFT_ADDR),
+            "NEGRISK": domain_separator(chain_id, negrisk_address or Config.NEGRISK_CFT_ADDR),
+        }
+        # Addresses repeat on every order (maker/signer/taker); encode them once
+        self._address_cache = {}
+        self._pool = None
+        self._pool_size = 0
+
+    def _address(self, address):
+        word = self._address_cache.get(address)
+        if word is None:
+            word = self._address_cache[address] = _address_word(address)
+        return word
+
+    def struct_hash(self, order_payload):
+        return keccak(
+            ORDER_TYPE_HASH
+            + _word(order_payload["salt"])
+            + self._address(order_payload["maker"])
+            + self._address(order_payload["signer"])
+            + self._address(order_payload["taker"])
+            + _word(order_payload["tokenId"])
+            + _word(order_payload["makerAmount"])
+            + _word(order_payload["takerAmount"])
+            + _word(order_payload["expiration"])
+            + _word(order_payload["nonce"])
+            + _word(order_payload["feeRateBps"])
+            + _word(order_payload["side"])
+            + _word(order_payload["signatureType"])
+        )
+
+    def digest(self, order_payload, market_type="CLOB"):
+        # Anything other than CLOB signs against the NegRisk contract, as before
+        separator = self.domain_separators["CLOB" if market_type == "CLOB" else "NEGRISK"]
+        return keccak(b"\x19\x01" + separator + self.struct_hash(order_payload))
+
+    @timer("order_sign_seconds")
+    def sign(self, order_payload, market_type="CLOB"):
+        """Sign an order; returns a 0x-prefixed 65-byte r||s||v hex signature."""
+        digest = self.digest(order_payload, market_type)
+        if self._fast_key is not None:
+            # r || s || recovery id (0/1)
+            signature = self._fast_key.sign_recoverable(digest, hasher=None)
+            return "0x" + (signature[:64] + bytes([signature[64] + 27])).hex()
+        v, r, s = self.private_key.sign_msg_hash(digest).vrs
+        return "0x" + (r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v + 27])).hex()
+
+    @timer("order_sign_batch_seconds")
+    def sign_batch(self, order_payloads, market_type="CLOB", processes=None):
+        """
+        Sign many orders. With processes > 1 the ECDSA work is spread over a
+        process pool, which pays off for large batches on multi-core hosts.
+        The pool is started on first use and kept until close().
+        """
+        order_payloads = list(order_payloads)
+        if not processes or processes <= 1 or len(order_payloads) < 2:
+            return [self.sign(payload, market_type) for payload in order_payloads]
+
+        if self._pool is None or self._pool_size != processes:
+            self.close()
+            self._pool = ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(self.private_key.to_hex(), self.domain_separators),
+            )
+            self._pool_size = processes
+        chunk = max(1, len(order_payloads) // processes)
+        return list(self._pool.map(_sign_in_worker, order_payloads, [market_type] * len(order_payloads), chunksize=chunk))
+
+    def close(self):
+        """Shut down the signing process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_size = 0
+
+# --- Process pool workers ---
+
+_worker_signer = None
+
+def _init_worker(private_key_hex, domain_separators):
+    global _worker_signer
+    _worker_signer = OrderSigner(private_key_hex)
+    _worker_signer.domain_separators = domain_separators
+
+def _sign_in_worker(order_payload, market_type):
+    return _worker_signer.sign(order_payload, market_type)
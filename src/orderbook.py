@@ -0,0 +1,215 @@
+import bisect
+from array import array
+from itertools import accumulate
+
+BID = "bids"
+ASK = "asks"
+
+# Accepted spellings of each side in snapshots and deltas
+SIDE_ALIASES = {
+    "bids": BID, "bid": BID, "buy": BID, "0": BID,
+    "asks": ASK, "ask": ASK, "sell": ASK, "1": ASK,
+}
+
+class BookSide:
+    """
+    One side of an L2 book as parallel arrays of doubles, best level first.
+    Levels are sorted on a key (price for asks, -price for bids) so lookups
+    are a bisect. Cumulative size/notional prefix sums are rebuilt lazily
+    after changes, which makes sweep and VWAP queries O(log n).
+    """
+    def __init__(self, is_bid):
+        self.is_bid = is_bid
+        self.keys = array('d')
+        self.sizes = array('d')
+        self._cum_size = None
+        self._cum_notional = None
+
+    def _key(self, price):
+        return -price if self.is_bid else price
+
+    def _price(self, key):
+        return -key if self.is_bid else key
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.keys = array('d')
+        self.sizes = array('d')
+        self._cum_size = None
+
+    def load(self, levels):
+        """Replace all levels with an iterable of (price, size)."""
+        merged = {}
+        for price, size in levels:
+            if size > 0:
+                merged[price] = size
+        ordered = sorted(merged.items(), key=lambda level: self._key(level[0]))
+        self.keys = array('d', (self._key(price) for price, _ in ordered))
+        self.sizes = array('d', (size for _, size in ordered))
+        self._cum_size = None
+
+    def set_level(self, price, size):
+        """Set the absolute size at a price level; size <= 0 removes it."""
+        key = self._key(price)
+        i = bisect.bisect_left(self.keys, key)
+        exists = i < len(self.keys) and self.keys[i] == key
+        if size > 0:
+            if exists:
+                self.sizes[i] = size
+            else:
+                self.keys.insert(i, key)
+                self.sizes.insert(i, size)
+        elif exists:
+            del self.keys[i]
+            del self.sizes[i]
+        self._cum_size = None
+
+    def _prefix_sums(self):
+        if self._cum_size is None:
+            self._cum_size = array('d', accumulate(self.sizes))
+            self._cum_notional = array('d', accumulate(
+                self._price(k) * s for k, s in zip(self.keys, self.sizes)
+            ))
+        return self._cum_size, self._cum_notional
+
+    def best(self):
+        """(price, size) of the best level, or None if empty."""
+        if not self.keys:
+            return None
+        return self._price(self.keys[0]), self.sizes[0]
+
+    def size_at(self, price):
+        key = self._key(price)
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.sizes[i]
+        return 0.0
+
+    def depth_through(self, price):
+        """Total size on levels at or better than price."""
+        i = bisect.bisect_right(self.keys, self._key(price))
+        if i == 0:
+            return 0.0
+        cum_size, _ = self._prefix_sums()
+        return cum_size[i - 1]
+
+    def sweep(self, shares):
+        """
+        Walk the side from the best level until `shares` are filled.
+        Returns (filled_shares, notional, worst_price); filled_shares is
+        less than requested when the book runs out.
+        """
+        if shares <= 0 or not self.keys:
+            return 0.0, 0.0, None
+        cum_size, cum_notional = self._prefix_sums()
+        # First level whose cumulative size covers the order
+        i = bisect.bisect_left(cum_size, shares)
+        if i >= len(cum_size):
+            return cum_size[-1], cum_notional[-1], self._price(self.keys[-1])
+        prev_size = cum_size[i - 1] if i else 0.0
+        prev_notional = cum_notional[i - 1] if i else 0.0
+        price = self._price(self.keys[i])
+        return shares, prev_notional + (shares - prev_size) * price, price
+
+    def notional(self):
+        """Dollar value of every resting level."""
+        if not self.keys:
+            return 0.0
+        return self._prefix_sums()[1][-1]
+
+    def levels(self):
+        """List of (price, size), best first."""
+        return [(self._price(k), s) for k, s in zip(self.keys, self.sizes)]
+
+class OrderBook:
+    """
+    Local L2 orderbook for one market, kept current from REST snapshots and
+    incremental level updates.
+
+    Prices are probabilities in dollars (0.0-1.0). Buying sweeps the asks,
+    selling sweeps the bids.
+    """
+    def __init__(self, slug=None):
+        self.slug = slug
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.updates = 0
+
+    @classmethod
+    def from_snapshot(cls, snapshot, slug=None):
+        book = cls(slug)
+        book.apply_snapshot(snapshot)
+        return book
+
+    def _side(self, side):
+        resolved = SIDE_ALIASES.get(str(side).lower())
+        if resolved is None:
+            raise ValueError(f"Unknown orderbook side: {side}")
+        return self.bids if resolved == BID else self.asks
+
+    @staticmethod
+    def _parse_levels(levels):
+        for level in levels or ():
+            yield float(level["price"]), float(level["size"])
+
+    def apply_snapshot(self, snapshot):
+        """Replace the book with a get_orderbook response."""
+        self.bids.load(self._parse_levels(snapshot.get("bids")))
+        self.asks.load(self._parse_levels(snapshot.get("asks")))
+        self.updates += 1
+
+    def apply_delta(self, side, price, size):
+        """Set the absolute size at one level (0 removes the level)."""
+        self._side(side).set_level(float(price), float(size))
+        self.updates += 1
+
+    def apply_deltas(self, deltas):
+        """Apply a list of {"side", "price", "size"} level updates."""
+        for delta in deltas:
+            self.apply_delta(delta["side"], delta["price"], delta["size"])
+
+    # --- Queries ---
+
+    def best_bid(self):
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self):
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def mid(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def liquidity(self):
+        """Dollar value resting on both sides."""
+        return self.bids.notional() + self.asks.notional()
+
+    def depth_at(self, side, price):
+        """Resting size at exactly this price."""
+        return self._side(side).size_at(float(price))
+
+    def sweep_cost(self, side, shares):
+        """
+        Cost to take `shares` from a side: (filled_shares, notional, worst_price).
+        side is the side being hit: "asks" to buy, "bids" to sell.
+        """
+        return self._side(side).sweep(shares)
+
+    def vwap(self, side, shares):
+        """Average fill price for taking `shares`, or None if the side is empty."""
+        filled, notional, _ = self._side(side).sweep(shares)
+        if filled <= 0:
+            return None
+        return notional / filled
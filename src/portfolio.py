@@ -0,0 +1,242 @@
+import threading
+from collections import defaultdict
+try:
+    from .market_catalog import detect_asset
+except ImportError:
+    from market_catalog import detect_asset
+
+BUY, SELL = 0, 1
+
+def parse_balance(payload):
+    """USDC balance from a /portfolio/balance response (a number or {"balance": ...})."""
+    if isinstance(payload, dict):
+        payload = payload.get("balance", payload.get("usdc", 0))
+    return float(payload or 0)
+
+def parse_positions(payload):
+    """
+    Normalize a /portfolio/positions response into a list of
+    {"slug", "title", "token_id", "outcome", "shares", "avg_price"}.
+    Accepts a bare list, {"positions": [...]} or per-venue lists
+    ({"clob": [...], "amm": [...]}); the market may be nested or flat.
+    """
+    if payload is None:
+        return []
+    if isinstance(payload, dict):
+        if "positions" in payload:
+            items = payload["positions"]
+        else:
+            items = [p for value in payload.values() if isinstance(value, list) for p in value]
+    else:
+        items = payload
+    positions = []
+    for item in items:
+        market = item.get("market") or {}
+        slug = market.get("slug") or item.get("slug")
+        token_id = item.get("tokenId") or item.get("token_id")
+        shares = float(item.get("size", item.get("shares", 0)) or 0)
+        if not slug or token_id is None or shares == 0:
+            continue
+        positions.append({
+            "slug": slug,
+            "title": market.get("title") or item.get("title", ""),
+            "token_id": str(token_id),
+            "outcome": str(item.get("outcome", "YES")).upper(),
+            "shares": shares,
+            "avg_price": float(item.get("avgPrice", item.get("avg_price", 0)) or 0),
+        })
+    return positions
+
+class PortfolioService:
+    """
+    Local view of our USDC balance, positions and open orders.
+
+    Loaded from the API once, then kept current from order acks, fills and
+    cancels reported by the strategies, so sizing decisions never need a
+    REST call. Exposure is tracked at cost, per market and per asset, and
+    counts open BUY orders as committed; all lookups are dict reads.
+    """
+    def __init__(self, catalog=None):
+        """
+        :param catalog: Optional MarketCatalog used to map slugs to assets
+        """
+        self.catalog = catalog
+        self.cash = 0.0
+        self.reserved = 0.0       # USDC locked in open BUY orders
+        self.positions = {}       # token_id -> {"slug", "outcome", "asset", "shares", "cost"}
+        self.open_orders = {}     # order_id -> {"slug", "token_id", "side", "price", "remaining", "asset"}
+        self.market_exposure = defaultdict(float)
+        self.asset_exposure = defaultdict(float)
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    # --- Loading ---
+
+    def load(self, client, slugs=()):
+        """Load balance, positions and open orders through a LimitlessClient."""
+        balance = client.get_balance()
+        positions = parse_positions(client.get_positions())
+        orders = {slug: client.get_open_orders(slug) for slug in self._order_slugs(positions, slugs)}
+        self._apply_snapshot(parse_balance(balance), positions, orders)
+
+    async def load_async(self, client, slugs=()):
+        """Same as load(), through an AsyncLimitlessClient."""
+        balance = await client.get_balance()
+        positions = parse_positions(await client.get_positions())
+        orders = {}
+        for slug in self._order_slugs(positions, slugs):
+            orders[slug] = await client.get_open_orders(slug)
+        self._apply_snapshot(parse_balance(balance), positions, orders)
+
+    @staticmethod
+    def _order_slugs(positions, slugs):
+        return sorted({p["slug"] for p in positions} | set(slugs))
+
+    def _apply_snapshot(self, cash, positions, orders_by_slug):
+        with self._lock:
+            self.cash = cash
+            self.reserved = 0.0
+            self.positions = {}
+            self.open_orders = {}
+            self.market_exposure.clear()
+            self.asset_exposure.clear()
+            for p in positions:
+                asset = self.asset_of(p["slug"], p["title"])
+                cost = p["shares"] * p["avg_price"]
+                self.positions[p["token_id"]] = {
+                    "slug": p["slug"], "outcome": p["outcome"], "asset": asset,
+                    "shares": p["shares"], "cost": cost,
+                }
+                self._add_exposure(p["slug"], asset, cost)
+            titles = {p["slug"]: p["title"] for p in positions}
+            for slug, orders in orders_by_slug.items():
+                asset = self.asset_of(slug, titles.get(slug))
+                for order in orders or ():
+                    self._track_order(
+                        order.get("id"), slug, str(order.get("tokenId", "")),
+                        0 if str(order.get("side")).upper() in ("0", "BUY") else 1,
+                        float(order.get("price", 0)),
+                        float(order.get("remainingSize", order.get("size", 0))),
+                        asset,
+                    )
+            self.loaded = True
+
+    def asset_of(self, slug, title=None):
+        if self.catalog is not None:
+            market = self.catalog.get(slug)
+            if market is not None:
+                return market.get("_asset")
+        return detect_asset(title) if title else None
+
+    # --- Incremental updates ---
+
+    def _add_exposure(self, slug, asset, amount):
+        self.market_exposure[slug] += amount
+        if asset:
+            self.asset_exposure[asset] += amount
+
+    def _track_order(self, order_id, slug, token_id, side, price, remaining, asset):
+        if order_id is None or remaining <= 0:
+            return
+        self.open_orders[order_id] = {
+            "slug": slug, "token_id": token_id, "side": side,
+            "price": price, "remaining": remaining, "asset": asset,
+        }
+        if side == BUY:
+            self.reserved += price * remaining
+            self._add_exposure(slug, asset, price * remaining)
+
+    def on_order_placed(self, slug, token_id, side, price, shares, response, asset=None):
+        """
+        Record an order ack. Any immediate fill reported in the response
+        ("filledSize", "avgPrice") is booked; the rest rests as an open order
+        unless the venue reports it as done.
+        """
+        response = response or {}
+        asset = asset or self.asset_of(slug)
+        token_id = str(token_id)
+        filled = float(response.get("filledSize", 0) or 0)
+        with self._lock:
+            if filled > 0:
+                self._book_fill(slug, token_id, side, filled, float(response.get("avgPrice", price)), asset)
+            if str(response.get("status", "")).upper() not in ("FILLED", "CANCELLED", "PARTIAL"):
+                self._track_order(response.get("id"), slug, token_id, side, price, shares - filled, asset)
+
+    def on_fill(self, order_id, shares, price):
+        """A resting order (partly) filled."""
+        with self._lock:
+            order = self.open_orders.get(order_id)
+            if order is None:
+                return
+            shares = min(shares, order["remaining"])
+            self._release(order, shares)
+            self._book_fill(order["slug"], order["token_id"], order["side"], shares, price, order["asset"])
+            if order["remaining"] <= 1e-9:
+                del self.open_orders[order_id]
+
+    def on_order_closed(self, order_id):
+        """A resting order was cancelled or expired."""
+        with self._lock:
+            order = self.open_orders.pop(order_id, None)
+            if order is not None:
+                self._release(order, order["remaining"])
+
+    def on_market_resolved(self, slug, winning_token_id):
+        """Settle a resolved market: winning shares pay 1 USDC, the rest expire worthless."""
+        winning_token_id = str(winning_token_id)
+        with self._lock:
+            for order_id in [i for i, order in self.open_orders.items() if order["slug"] == slug]:
+                order = self.open_orders.pop(order_id)
+                self._release(order, order["remaining"])
+            for token_id in [t for t, p in self.positions.items() if p["slug"] == slug]:
+                position = self.positions.pop(token_id)
+                if token_id == winning_token_id:
+                    self.cash += position["shares"]
+                self._add_exposure(slug, position["asset"], -position["cost"])
+
+    def _release(self, order, shares):
+        order["remaining"] -= shares
+        if order["side"] == BUY:
+            self.reserved -= order["price"] * shares
+            self._add_exposure(order["slug"], order["asset"], -order["price"] * shares)
+
+    def _book_fill(self, slug, token_id, side, shares, price, asset):
+        position = self.positions.get(token_id)
+        if position is None:
+            position = self.positions[token_id] = {
+                "slug": slug, "outcome": None, "asset": asset, "shares": 0.0, "cost": 0.0,
+            }
+        if side == BUY:
+            self.cash -= shares * price
+            position["shares"] += shares
+            position["cost"] += shares * price
+            self._add_exposure(slug, asset, shares * price)
+        else:
+            self.cash += shares * price
+            held = position["shares"]
+            # Selling releases the average cost of the shares sold
+            released = position["cost"] * min(1.0, shares / held) if held > 0 else 0.0
+            position["shares"] -= shares
+            position["cost"] -= released
+            self._add_exposure(slug, asset, -released)
+            if position["shares"] <= 1e-9:
+                del self.positions[token_id]
+
+    # --- Queries ---
+
+    def available_balance(self):
+        """USDC not already committed to open BUY orders."""
+        return self.cash - self.reserved
+
+    def equity(self):
+        """Cash plus positions at cost."""
+        return self.cash + sum(p["cost"] for p in self.positions.values())
+
+    def exposure(self, slug):
+        return self.market_exposure.get(slug, 0.0)
+
+    def exposure_for_asset(self, asset):
+        return self.asset_exposure.get(asset, 0.0)
+
+    def exposure_for_assets(self, assets):
+        return sum(self.asset_exposure.get(asset, 0.0) for asset in assets)
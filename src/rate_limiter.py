@@ -0,0 +1,182 @@
+import asyncio
+import random
+import threading
+import time
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+# Request categories, highest priority first
+ORDER = "order"
+CANCEL = "cancel"
+MARKET_DATA = "market_data"
+
+HIGH_PRIORITY = (ORDER, CANCEL)
+
+def classify(method, path):
+    """Map an API request to its rate limit category."""
+    if path.startswith("/orders"):
+        if method == "DELETE" or "cancel" in path:
+            return CANCEL
+        if method == "POST":
+            return ORDER
+    return MARKET_DATA
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now, rate_scale=1.0):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate * rate_scale)
+        self.updated = now
+
+    def wait_time(self, needed, rate_scale=1.0):
+        """Seconds until `needed` tokens are available (0 if already)."""
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / (self.rate * rate_scale)
+
+class RateLimiter:
+    """
+    Client-side rate limiting shared by every API call of a client.
+
+    Each category (order, cancel, market data) has its own token bucket and
+    all of them also draw from one global bucket for the venue's overall
+    budget. Market data may only take a global token while more than
+    `priority_reserve` of the burst is left, so order and cancel traffic
+    always has headroom and never queues behind a scan.
+
+    Responses feed back in: a 429 or an exhausted X-RateLimit-Remaining
+    pauses new requests until Retry-After / X-RateLimit-Reset (or an
+    exponential backoff with jitter) and halves the send rate, which then
+    recovers gradually on successful responses.
+    """
+    def __init__(self, global_rps=None, global_burst=None, category_rps=None, priority_reserve=None):
+        """
+        :param global_rps: Overall requests per second across all categories
+        :param global_burst: Overall burst size
+        :param category_rps: Dict of category -> requests per second
+        :param priority_reserve: Fraction of the global burst kept for orders/cancels
+        """
+        global_rps = global_rps or Config.RATE_LIMIT_RPS
+        global_burst = global_burst or Config.RATE_LIMIT_BURST
+        category_rps = category_rps or {
+            ORDER: Config.RATE_LIMIT_ORDER_RPS,
+            CANCEL: Config.RATE_LIMIT_ORDER_RPS,
+            MARKET_DATA: Config.RATE_LIMIT_DATA_RPS,
+        }
+        self.global_bucket = TokenBucket(global_rps, global_burst)
+        self.buckets = {
+            category: TokenBucket(rps, max(1.0, min(global_burst, rps * 2)))
+            for category, rps in category_rps.items()
+        }
+        reserve = priority_reserve if priority_reserve is not None else Config.RATE_LIMIT_PRIORITY_RESERVE
+        # Market data needs 1 token above the reserve; a small burst keeps
+        # less in reserve rather than never admitting market data at all
+        self.reserve_tokens = max(0.0, min(global_burst * reserve, global_burst - 1.0))
+
+        # Adaptive state
+        self.rate_scale = 1.0
+        self.paused_until = 0.0
+        self.consecutive_429 = 0
+
+        # Stats
+        self.throttled = 0
+        self.rate_limited = 0
+
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, category):
+        """Take a token if possible. Returns 0.0 on success, else seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+
+            bucket = self.buckets.get(category) or self.buckets[MARKET_DATA]
+            bucket.refill(now, self.rate_scale)
+            self.global_bucket.refill(now, self.rate_scale)
+
+            # min(): 1 + (burst - 1) can round to just above the burst
+            needed_global = 1.0 if category in HIGH_PRIORITY else min(1.0 + self.reserve_tokens, self.global_bucket.burst)
+            wait = max(bucket.wait_time(1.0, self.rate_scale), self.global_bucket.wait_time(needed_global, self.rate_scale))
+            if wait > 0:
+                return wait
+
+            bucket.tokens -= 1.0
+            self.global_bucket.tokens -= 1.0
+            return 0.0
+
+    def acquire(self, category):
+        """Block until a request in `category` may be sent."""
+        wait = self._try_acquire(category)
+        if wait > 0:
+            self.throttled += 1
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._try_acquire(category)
+
+    async def acquire_async(self, category):
+        """Wait (without blocking the loop) until a request in `category` may be sent."""
+        wait = self._try_acquire(category)
+        if wait > 0:
+            self.throttled += 1
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._try_acquire(category)
+
+    def on_response(self, status, headers):
+        """
+        Update limits from a response. Returns the seconds to back off
+        before retrying if the request was rate limited, else None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+
+            if remaining is not None:
+                try:
+                    # Never believe we have more budget than the venue says
+                    self.global_bucket.tokens = min(self.global_bucket.tokens, float(remaining))
+                except ValueError:
+                    pass
+
+            if status == 429:
+                self.rate_limited += 1
+                self.consecutive_429 += 1
+                self.rate_scale = max(0.1, self.rate_scale * 0.5)
+                delay = self._retry_after(headers.get("Retry-After"), reset)
+                if delay is None:
+                    delay = min(30.0, 0.5 * 2 ** (self.consecutive_429 - 1))
+                delay *= random.uniform(1.0, 1.25)
+                self.paused_until = max(self.paused_until, now + delay)
+                return delay
+
+            self.consecutive_429 = 0
+            self.rate_scale = min(1.0, self.rate_scale + 0.05)
+            if remaining is not None and reset is not None and remaining.strip() == "0":
+                delay = self._retry_after(None, reset)
+                if delay:
+                    self.paused_until = max(self.paused_until, now + delay)
+            return None
+
+    @staticmethod
+    def _retry_after(retry_after, reset):
+        """Seconds to wait from Retry-After or X-RateLimit-Reset (seconds or epoch)."""
+        for value in (retry_after, reset):
+            if value is None:
+                continue
+            try:
+                seconds = float(value)
+            except ValueError:
+                continue
+            # Large values are an epoch timestamp rather than a delay
+            if seconds > 1e9:
+                seconds -= time.time()
+            return max(0.0, seconds)
+        return None
@@ -0,0 +1,333 @@
+import datetime
+import glob
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import numpy as np
+try:
+    from .config import Config
+    from .log import get_logger
+except ImportError:
+    from config import Config
+    from log import get_logger
+
+logger = get_logger("recorder")
+
+# One fixed-width little-endian record per event:
+#   ts float64 | kind uint8 | side uint8 | pad 2 | symbol uint32 | price float64 | size float64
+RECORD = struct.Struct("<dBBxxIdd")
+RECORD_DTYPE = np.dtype([
+    ("ts", "<f8"), ("kind", "u1"), ("side", "u1"), ("pad", "V2"),
+    ("symbol", "<u4"), ("price", "<f8"), ("size", "<f8"),
+])
+assert RECORD.size == RECORD_DTYPE.itemsize == 32
+
+# Record kinds
+TICK = 1            # symbol=pair, price
+SNAPSHOT = 2        # symbol=slug, size=number of SNAPSHOT_LEVEL records that follow
+SNAPSHOT_LEVEL = 3  # side, price, size
+DELTA = 4           # symbol=slug, side, price, absolute size (0 removes the level)
+MARKET = 5          # symbol=slug, price=byte offset of the market JSON in the day's .meta.jsonl
+MARKET_REMOVED = 6  # symbol=slug
+
+BID, ASK = 0, 1
+
+SYMBOLS_FILE = "symbols.txt"
+
+def day_of(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+class MarketDataRecorder:
+    """
+    Append-only recorder for orderbooks, Binance ticks and market metadata.
+
+    The record_* methods only put a tuple on a queue, so the live loop pays
+    for one enqueue. A writer thread packs the tuples into fixed-width
+    32-byte records and writes them in batches to <directory>/<UTC day>.bin,
+    starting a new file at midnight. Market JSON, the only variable-length
+    data, goes to a <day>.meta.jsonl sidecar. Slugs and pairs are interned
+    to integer ids in symbols.txt (line number = id).
+
+    Timestamps are kept non-decreasing within a file, so readers can
+    binary-search them; events enqueued out of order by different threads
+    are nudged forward by the (sub-millisecond) difference.
+    """
+    def __init__(self, directory=None, flush_interval=None):
+        """
+        :param directory: Where day files are written
+        :param flush_interval: Max seconds between writes to disk
+        """
+        self.directory = directory or Config.RECORD_DIR
+        self.flush_interval = flush_interval if flush_interval is not None else Config.RECORD_FLUSH_INTERVAL
+        os.makedirs(self.directory, exist_ok=True)
+        self.symbols = load_symbols(self.directory)
+        self.records_written = 0
+        self.dropped = 0
+
+        self._queue = queue.SimpleQueue()
+        self._day = None
+        self._file = None
+        self._meta = None
+        self._symbols_file = None
+        self._last_ts = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Live loop side: enqueue only ---
+
+    def record_tick(self, pair, price, timestamp=None):
+        """Binance tick; signature matches DataFeed's on_tick callback."""
+        self._queue.put((TICK, timestamp or time.time(), pair, price))
+
+    def record_snapshot(self, slug, snapshot, timestamp=None):
+        """A get_orderbook response."""
+        self._queue.put((SNAPSHOT, timestamp or time.time(), slug, snapshot))
+
+    def record_delta(self, slug, side, price, size, timestamp=None):
+        """One level update; side is "bids"/"asks" (or 0/1)."""
+        self._queue.put((DELTA, timestamp or time.time(), slug, (side, price, size)))
+
+    def record_market(self, market, timestamp=None):
+        """Market metadata; signature matches MarketCatalog's on_add callback."""
+        self._queue.put((MARKET, timestamp or time.time(), market.get("slug"), market))
+
+    def record_market_removed(self, slug, timestamp=None):
+        """Market closed; signature matches MarketCatalog's on_remove callback."""
+        self._queue.put((MARKET_REMOVED, timestamp or time.time(), slug, None))
+
+    # --- Writer thread ---
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._write_loop, name="MarketDataRecorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write everything queued so far and close the files."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._drain()
+        self._close_files()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _write_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def _drain(self):
+        buffer = bytearray()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._encode(item, buffer)
+            except (ValueError, TypeError, KeyError, struct.error) as e:
+                self.dropped += 1
+                logger.warning("Dropped malformed %s record: %s", item[0], e)
+        if buffer:
+            self._file.write(buffer)
+            self._file.flush()
+            self._meta.flush()
+
+    def _symbol(self, name):
+        symbol_id = self.symbols.get(name)
+        if symbol_id is None:
+            symbol_id = self.symbols[name] = len(self.symbols)
+            if self._symbols_file is None:
+                self._symbols_file = open(os.path.join(self.directory, SYMBOLS_FILE), "a")
+            self._symbols_file.write(f"{name}\n")
+            self._symbols_file.flush()
+        return symbol_id
+
+    def _open_day(self, day, buffer):
+        if self._file is not None:
+            # Whatever was packed so far belongs to the previous day
+            self._file.write(buffer)
+            del buffer[:]
+            self._close_files()
+        self._day = day
+        self._file = open(os.path.join(self.directory, f"{day}.bin"), "ab")
+        self._meta = open(os.path.join(self.directory, f"{day}.meta.jsonl"), "ab")
+
+    def _close_files(self):
+        for f in (self._file, self._meta, self._symbols_file):
+            if f is not None:
+                f.close()
+        self._file = self._meta = self._symbols_file = None
+        self._day = None
+
+    def _encode(self, item, buffer):
+        kind, ts, name, payload = item
+        ts = max(ts, self._last_ts)
+        day = day_of(ts)
+        if day != self._day:
+            self._open_day(day, buffer)
+        self._last_ts = ts
+        symbol = self._symbol(name)
+
+        if kind == TICK:
+            buffer += RECORD.pack(ts, TICK, 0, symbol, float(payload), 0.0)
+        elif kind == SNAPSHOT:
+            levels = [(BID, level) for level in payload.get("bids") or ()]
+            levels += [(ASK, level) for level in payload.get("asks") or ()]
+            # Pack the whole snapshot before appending so a bad level can't leave half of it
+            packed = RECORD.pack(ts, SNAPSHOT, 0, symbol, 0.0, float(len(levels))) + b"".join(
+                RECORD.pack(ts, SNAPSHOT_LEVEL, side, symbol, float(level["price"]), float(level["size"]))
+                for side, level in levels
+            )
+            buffer += packed
+        elif kind == DELTA:
+            side, price, size = payload
+            side = BID if str(side).lower() in ("bids", "bid", "buy", "0") else ASK
+            buffer += RECORD.pack(ts, DELTA, side, symbol, float(price), float(size))
+        elif kind == MARKET:
+            offset = self._meta.tell()
+            self._meta.write(json.dumps(payload, separators=(",", ":")).encode() + b"\n")
+            buffer += RECORD.pack(ts, MARKET, 0, symbol, float(offset), 0.0)
+        elif kind == MARKET_REMOVED:
+            buffer += RECORD.pack(ts, MARKET_REMOVED, 0, symbol, 0.0, 0.0)
+        self.records_written += 1
+
+def load_symbols(directory):
+    """name -> id from a recording's symbols.txt."""
+    path = os.path.join(directory, SYMBOLS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {line.rstrip("\n"): i for i, line in enumerate(f)}
+
+class RecordingReader:
+    """
+    Memory-mapped reader for one day file written by MarketDataRecorder.
+
+    `records` is a NumPy structured view straight onto the file, so opening
+    costs nothing and the OS pages in only what is touched. Timestamps are
+    sorted, which makes seek() a binary search. A trailing partial record
+    (file still being written) is ignored.
+    """
+    def __init__(self, path, symbols=None):
+        self.path = path
+        directory = os.path.dirname(path)
+        names = symbols if symbols is not None else load_symbols(directory)
+        self.names = {i: name for name, i in names.items()}
+        self.meta_path = path[:-len(".bin")] + ".meta.jsonl"
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def seek(self, timestamp):
+        """Index of the first record at or after timestamp."""
+        return int(np.searchsorted(self.records["ts"], timestamp, side="left"))
+
+    def between(self, start=None, end=None):
+        """Records with start <= ts < end, as a zero-copy slice."""
+        lo = self.seek(start) if start is not None else 0
+        hi = self.seek(end) if end is not None else len(self.records)
+        return self.records[lo:hi]
+
+    def market(self, offset):
+        """Market JSON stored at a MARKET record's offset."""
+        with open(self.meta_path, "rb") as f:
+            f.seek(int(offset))
+            return json.loads(f.readline())
+
+    def replay_markets(self, markets, end=None):
+        """Apply the MARKET / MARKET_REMOVED records before `end` to a slug -> market dict."""
+        records = self.between(None, end)
+        kinds = records["kind"]
+        for index in np.flatnonzero((kinds == MARKET) | (kinds == MARKET_REMOVED)):
+            record = records[index]
+            name = self.names.get(int(record["symbol"]), str(record["symbol"]))
+            if record["kind"] == MARKET:
+                markets[name] = self.market(record["price"])
+            else:
+                markets.pop(name, None)
+        return markets
+
+    def events(self, start=None, end=None, markets=None):
+        """
+        Decode records into backtester events (see backtester.py): price
+        ticks, orderbook snapshots and deltas, and the active market listing
+        whenever it changes. A snapshot cut off by `start` is skipped.
+
+        :param markets: slug -> market dict carried over from earlier days;
+                        updated in place
+        """
+        markets = markets if markets is not None else {}
+        if start is not None:
+            # Markets listed before the window are still active inside it
+            self.replay_markets(markets, end=start)
+            if markets:
+                yield {"ts": float(start), "type": "markets", "markets": list(markets.values())}
+        records = self.between(start, end)
+        i, n = 0, len(records)
+        meta = open(self.meta_path, "rb") if os.path.exists(self.meta_path) else None
+        try:
+            while i < n:
+                ts, kind, side, _, symbol, price, size = records[i].item()
+                name = self.names.get(symbol, str(symbol))
+                i += 1
+                if kind == TICK:
+                    yield {"ts": ts, "type": "price", "pair": name, "price": price}
+                elif kind == SNAPSHOT:
+                    levels = records[i:i + int(size)]
+                    i += int(size)
+                    book = {"bids": [], "asks": []}
+                    for level in levels:
+                        book["bids" if level["side"] == BID else "asks"].append(
+                            {"price": float(level["price"]), "size": float(level["size"])}
+                        )
+                    yield {"ts": ts, "type": "orderbook", "slug": name, "book": book}
+                elif kind == DELTA:
+                    yield {"ts": ts, "type": "delta", "slug": name,
+                           "side": "bids" if side == BID else "asks", "price": price, "size": size}
+                elif kind == MARKET and meta is not None:
+                    meta.seek(int(price))
+                    markets[name] = json.loads(meta.readline())
+                    yield {"ts": ts, "type": "markets", "markets": list(markets.values())}
+                elif kind == MARKET_REMOVED and markets.pop(name, None) is not None:
+                    yield {"ts": ts, "type": "markets", "markets": list(markets.values())}
+        finally:
+            if meta is not None:
+                meta.close()
+
+def recording_days(directory):
+    """Day files in a recording directory, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, "*.bin")))
+
+def load_recording(directory, start=None, end=None):
+    """Stream backtester events across every day file of a recording."""
+    symbols = load_symbols(directory)
+    markets = {}
+    for path in recording_days(directory):
+        reader = RecordingReader(path, symbols)
+        if not len(reader):
+            continue
+        if start is not None and reader.records["ts"][-1] < start:
+            # Whole day before the window: only its market listing matters
+            reader.replay_markets(markets)
+            continue
+        if end is not None and reader.records["ts"][0] >= end:
+            break
+        yield from reader.events(start, end, markets)
+        start = None  # later days are inside the window from their first record
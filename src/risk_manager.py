@@ -1,14 +1,36 @@
+import numpy as np
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
 class RiskManager:
     """
     Manages risk and position sizing based on confidence and portfolio state.
     """
-    def __init__(self, max_portfolio_risk=0.05, kelly_fraction=0.5):
+    # Assets whose markets move together and share one exposure limit
+    CORRELATED_GROUPS = (("BTC", "ETH", "SOL"),)
+
+    def __init__(self, max_portfolio_risk=0.05, kelly_fraction=0.5, portfolio=None,
+                 max_market_exposure=None, max_asset_exposure=None, max_correlated_exposure=None):
         """
         :param max_portfolio_risk: Max % of portfolio to risk on a single trade (e.g. 5%)
         :param kelly_fraction: Fraction of Kelly Criterion to use (e.g. 0.5 for half-Kelly)
+        :param portfolio: PortfolioService supplying balances and exposure for size_position
+        :param max_market_exposure: Max fraction of equity committed to one market
+        :param max_asset_exposure: Max fraction of equity committed to one asset
+        :param max_correlated_exposure: Max fraction of equity across a correlated group
         """
         self.max_portfolio_risk = max_portfolio_risk
         self.kelly_fraction = kelly_fraction
+        self.portfolio = portfolio
+        self.max_market_exposure = max_market_exposure if max_market_exposure is not None else Config.RISK_MAX_MARKET_EXPOSURE
+        self.max_asset_exposure = max_asset_exposure if max_asset_exposure is not None else Config.RISK_MAX_ASSET_EXPOSURE
+        self.max_correlated_exposure = (
+            max_correlated_exposure if max_correlated_exposure is not None else Config.RISK_MAX_CORRELATED_EXPOSURE
+        )
+        # Correlation assumed between different assets of one correlated group
+        self.cross_asset_correlation = Config.RISK_CROSS_ASSET_CORRELATION
 
     def calculate_position_size(self, portfolio_balance, confidence, odds):
         """
@@ -49,6 +71,155 @@ class RiskManager:
         amount = portfolio_balance * f
         return amount
 
+    def correlated_group(self, asset):
+        for group in self.CORRELATED_GROUPS:
+            if asset in group:
+                return group
+        return None
+
+    def size_position(self, confidence, odds, slug=None, asset=None):
+        """
+        Kelly size against the portfolio's real equity, clipped to the
+        USDC still available and to the headroom left under the per-market,
+        per-asset and correlated-group exposure limits.
+        """
+        portfolio = self.portfolio
+        equity = portfolio.equity()
+        amount = self.calculate_position_size(equity, confidence, odds)
+        limits = [portfolio.available_balance()]
+        if slug is not None:
+            limits.append(self.max_market_exposure * equity - portfolio.exposure(slug))
+        if asset is not None:
+            limits.append(self.max_asset_exposure * equity - portfolio.exposure_for_asset(asset))
+            group = self.correlated_group(asset)
+            if group is not None:
+                limits.append(self.max_correlated_exposure * equity - portfolio.exposure_for_assets(group))
+        return max(0.0, min(amount, *limits))
+
+    def _group_key(self, asset):
+        return ",".join(self.correlated_group(asset) or (str(asset),))
+
+    def correlation_matrix(self, probabilities, assets, directions):
+        """
+        Correlation between the payoffs of binary bets.
+
+        Bets on one underlying and expiry are nested events: two bets that
+        both win when the price rises (direction +1) jointly win with
+        P = min(p_i, p_j), and opposite bets with P = max(0, p_i + p_j - 1).
+        The indicator correlation follows from that joint probability. Bets
+        on different assets of a correlated group get that correlation
+        scaled by cross_asset_correlation; anything else, and range bets
+        (direction 0), are treated as independent.
+        """
+        p = np.clip(np.asarray(probabilities, dtype=float), 1e-6, 1 - 1e-6)
+        d = np.asarray(directions, dtype=float)
+        # Compare integer codes rather than strings
+        asset_names, assets = np.unique(np.asarray(assets).astype(str), return_inverse=True)
+        group_of = {name: self._group_key(name) for name in asset_names}
+        _, groups = np.unique([group_of[name] for name in asset_names], return_inverse=True)
+        groups = groups[assets]
+
+        pi, pj = p[:, None], p[None, :]
+        same_direction = (d[:, None] * d[None, :]) > 0
+        joint = np.where(same_direction, np.minimum(pi, pj), np.maximum(0.0, pi + pj - 1.0))
+        corr = (joint - pi * pj) / np.sqrt(pi * (1 - pi) * pj * (1 - pj))
+
+        same_asset = assets[:, None] == assets[None, :]
+        same_group = groups[:, None] == groups[None, :]
+        scale = np.where(same_asset, 1.0, np.where(same_group, self.cross_asset_correlation, 0.0))
+        scale[(d[:, None] * d[None, :]) == 0] = 0.0
+        corr *= scale
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    def joint_kelly(self, probabilities, prices, assets, directions):
+        """
+        Full-Kelly fractions for simultaneous binary bets, f = Cov^-1 mu.
+
+        A bet bought at price c that pays 1 with probability p returns
+        mu = (p - c) / c per dollar. Using the payoff variance (1 - c) / c
+        reduces a lone bet to the exact binary Kelly f = (p - c) / (1 - c);
+        correlation then shrinks bets that duplicate each other. Bets can't
+        be shorted, so any that come out negative are dropped and the rest
+        re-solved.
+        """
+        p = np.asarray(probabilities, dtype=float)
+        c = np.asarray(prices, dtype=float)
+        mu = (p - c) / c
+        sigma = np.sqrt((1 - c) / c)
+        cov = self.correlation_matrix(p, assets, directions) * np.outer(sigma, sigma)
+        # Nested bets on one strike can be (near) perfectly correlated
+        cov[np.diag_indices_from(cov)] *= 1.0 + 1e-6
+
+        f = np.zeros(len(p))
+        active = np.ones(len(p), dtype=bool)
+        while active.any():
+            idx = np.flatnonzero(active)
+            solution = np.linalg.solve(cov[np.ix_(idx, idx)], mu[idx])
+            if (solution >= 0).all():
+                f[idx] = solution
+                break
+            active[idx[solution < 0]] = False
+        return f
+
+    @staticmethod
+    def _cap_totals(amounts, keys, caps):
+        """Scale amounts down so the total per key stays within caps[key]."""
+        unique, inverse = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+        totals = np.bincount(inverse, weights=amounts, minlength=len(unique))
+        limit = np.array([max(0.0, caps(key)) for key in unique])
+        factor = np.where(totals > limit, limit / np.where(totals > 0, totals, 1.0), 1.0)
+        return amounts * factor[inverse]
+
+    def size_portfolio(self, probabilities, prices, assets, directions=None, slugs=None, equity=None):
+        """
+        Jointly size every candidate of a scan.
+
+        Solves for correlated fractional-Kelly allocations (joint_kelly x
+        kelly_fraction), caps each bet at max_portfolio_risk, then scales
+        groups down to fit the per-market, per-asset and correlated-group
+        limits (net of existing exposure when a portfolio is attached) and
+        the USDC available.
+
+        :param probabilities: Win probability of each bet (for the token bought)
+        :param prices: Price paid per share of that token (0-1)
+        :param assets: Underlying of each bet, e.g. "BTC"
+        :param directions: +1 if a bet wins when the underlying rises, -1 if it
+                           falls, 0 for ranges (default +1)
+        :param slugs: Market of each bet, for the per-market limit
+        :param equity: Bankroll; defaults to the portfolio's equity
+        :return: Array of dollar amounts
+        """
+        p = np.asarray(probabilities, dtype=float)
+        c = np.asarray(prices, dtype=float)
+        n = len(p)
+        if n == 0:
+            return np.zeros(0)
+        assets = np.asarray(assets, dtype=object)
+        directions = np.ones(n) if directions is None else np.asarray(directions, dtype=float)
+        portfolio = self.portfolio
+        if equity is None:
+            equity = portfolio.equity() if portfolio is not None else 0.0
+
+        f = np.zeros(n)
+        edge = np.flatnonzero((c > 0) & (c < 1) & (p > c))
+        if len(edge):
+            f[edge] = self.joint_kelly(p[edge], c[edge], assets[edge], directions[edge])
+        amounts = np.minimum(f * self.kelly_fraction, self.max_portfolio_risk) * equity
+
+        exposure = portfolio.exposure if portfolio is not None else (lambda slug: 0.0)
+        asset_exposure = portfolio.exposure_for_asset if portfolio is not None else (lambda asset: 0.0)
+        group_exposure = portfolio.exposure_for_assets if portfolio is not None else (lambda group: 0.0)
+        if slugs is not None:
+            amounts = self._cap_totals(amounts, slugs, lambda slug: self.max_market_exposure * equity - exposure(slug))
+        amounts = self._cap_totals(amounts, assets, lambda asset: self.max_asset_exposure * equity - asset_exposure(asset))
+        amounts = self._cap_totals(
+            amounts, [self._group_key(asset) for asset in assets],
+            lambda key: self.max_correlated_exposure * equity - group_exposure(key.split(",")),
+        )
+        available = portfolio.available_balance() if portfolio is not None else equity
+        return self._cap_totals(amounts, [""] * n, lambda _: available)
+
     def check_timing_risk(self, time_to_expiry_years):
         """
         Adjust risk based on time to expiry.
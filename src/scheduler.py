@@ -0,0 +1,232 @@
+import asyncio
+import random
+import time
+try:
+    from .metrics import METRICS
+    from .log import get_logger
+except ImportError:
+    from metrics import METRICS
+    from log import get_logger
+
+logger = get_logger("scheduler")
+
+class ScheduledStrategy:
+    """
+    Scheduling state for one strategy registered with StrategyScheduler.
+    """
+    def __init__(self, strategy, interval=None, events=(), jitter=0.0, deadline=None):
+        """
+        :param interval: Seconds between periodic runs (None = event-driven only)
+        :param events: Event names that wake this strategy immediately
+        :param jitter: Max random offset (seconds) added to each periodic wake
+        :param deadline: Max expected run time in seconds before it counts as an overrun
+        """
+        if interval is None and not events:
+            raise ValueError("A strategy needs an interval, events, or both.")
+        self.strategy = strategy
+        self.name = strategy.__class__.__name__
+        self.interval = interval
+        self.events = set(events)
+        self.jitter = jitter
+        self.deadline = deadline if deadline is not None else interval
+        self.wakeup = asyncio.Event()
+        self.next_due = None
+
+        # Stats
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_duration = 0.0
+        self.last_trigger = None
+        self.run_timer = METRICS.timer("strategy_run_seconds", strategy=self.name)
+        self.overrun_counter = METRICS.counter("strategy_overruns_total", strategy=self.name)
+
+    def schedule_next(self, now):
+        """
+        Advance next_due on the fixed cadence grid. Slots missed because the
+        previous run overran are skipped rather than replayed back to back.
+        """
+        if self.interval is None:
+            self.next_due = None
+            return
+        if self.next_due is None:
+            self.next_due = now
+        self.next_due += self.interval
+        if self.next_due < now:
+            missed = int((now - self.next_due) // self.interval) + 1
+            self.skipped += missed
+            self.next_due += missed * self.interval
+
+    def time_until_due(self, now):
+        if self.next_due is None:
+            return None
+        offset = random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.next_due + offset - now)
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how late a sleep of `interval` seconds wakes up.
+    Anything blocking the loop (sync I/O, heavy compute) shows up here.
+    """
+    def __init__(self, interval=0.1, alpha=0.1):
+        self.interval = interval
+        self.alpha = alpha
+        self.last = 0.0
+        self.max = 0.0
+        self.avg = 0.0
+        self.samples = 0
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            self.last = lag
+            self.max = max(self.max, lag)
+            self.avg = lag if self.samples == 0 else self.avg + self.alpha * (lag - self.avg)
+            self.samples += 1
+
+    def reset_max(self):
+        self.max = 0.0
+
+class ThrottledEmitter:
+    """
+    Forwards calls from another thread to StrategyScheduler.emit_threadsafe
+    at most once per min_interval, with the call's arguments as payload.
+    Calls in between are dropped: the woken strategy reads the latest state
+    itself. Meant for DataFeed on_tick, which fires far faster than a scan.
+    """
+    def __init__(self, scheduler, loop, event, min_interval=1.0):
+        self.scheduler = scheduler
+        self.loop = loop
+        self.event = event
+        self.min_interval = min_interval
+        self.emitted = 0
+        self._last = float("-inf")
+
+    def __call__(self, *payload):
+        now = time.monotonic()
+        if now - self._last < self.min_interval:
+            return
+        self._last = now
+        self.emitted += 1
+        self.scheduler.emit_threadsafe(self.loop, self.event, payload)
+
+class StrategyScheduler:
+    """
+    Runs several strategies concurrently on one event loop.
+    Each strategy runs on its own cadence, is woken early by the events it
+    subscribes to, or both. Replaces the fixed sleep between scans.
+
+    Usage:
+        scheduler = StrategyScheduler()
+        scheduler.add_strategy(crypto, interval=5, events=("price_tick",))
+        scheduler.add_strategy(latency, events=("news",))
+        await scheduler.run()
+
+        # From a feed callback:
+        scheduler.emit("price_tick", {"symbol": "BTC", "price": 95000.0})
+    """
+    def __init__(self, lag_interval=0.1, report_interval=60.0):
+        """
+        :param lag_interval: How often the loop lag probe wakes (seconds)
+        :param report_interval: How often stats are printed (None to disable)
+        """
+        self.entries = []
+        self.lag_monitor = LoopLagMonitor(interval=lag_interval)
+        self.report_interval = report_interval
+        self._tasks = []
+
+    def add_strategy(self, strategy, interval=None, events=(), jitter=0.0, deadline=None):
+        entry = ScheduledStrategy(strategy, interval, events, jitter, deadline)
+        self.entries.append(entry)
+        return entry
+
+    def emit(self, event, payload=None):
+        """
+        Wake every strategy subscribed to `event`. Safe to call from the loop
+        thread only; use emit_threadsafe from other threads.
+        Wakes coalesce: a strategy that is already running runs once more.
+        """
+        for entry in self.entries:
+            if event in entry.events:
+                entry.strategy.on_event(event, payload)
+                entry.last_trigger = event
+                entry.wakeup.set()
+
+    def emit_threadsafe(self, loop, event, payload=None):
+        loop.call_soon_threadsafe(self.emit, event, payload)
+
+    async def _run_entry(self, entry):
+        # Periodic strategies run once immediately, then on the grid
+        entry.next_due = time.monotonic() if entry.interval is not None else None
+        while True:
+            timeout = entry.time_until_due(time.monotonic())
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(entry.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            triggered = entry.wakeup.is_set()
+            entry.wakeup.clear()
+
+            start = time.monotonic()
+            try:
+                await entry.strategy.run_async()
+            except Exception as e:
+                logger.exception("%s failed: %s", entry.name, e)
+            end = time.monotonic()
+
+            entry.runs += 1
+            entry.last_duration = end - start
+            entry.run_timer.record(entry.last_duration)
+            if entry.deadline is not None and entry.last_duration > entry.deadline:
+                entry.overruns += 1
+                entry.overrun_counter.inc()
+                logger.warning("%s overran deadline: %.3fs > %.3fs", entry.name, entry.last_duration, entry.deadline)
+
+            # Event-triggered runs between slots leave the periodic grid alone
+            if entry.interval is not None and (not triggered or end >= entry.next_due):
+                entry.schedule_next(end)
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            lag = self.lag_monitor
+            logger.info("Loop lag: last=%.2fms avg=%.2fms max=%.2fms", lag.last * 1000, lag.avg * 1000, lag.max * 1000)
+            for entry in self.entries:
+                logger.info("  %s: runs=%d last=%.1fms overruns=%d skipped=%d",
+                            entry.name, entry.runs, entry.last_duration * 1000, entry.overruns, entry.skipped)
+            lag.reset_max()
+
+    def stats(self):
+        """Snapshot of loop lag and per-strategy counters."""
+        return {
+            "loop_lag": {
+                "last": self.lag_monitor.last,
+                "avg": self.lag_monitor.avg,
+                "max": self.lag_monitor.max,
+            },
+            "strategies": {
+                entry.name: {
+                    "runs": entry.runs,
+                    "last_duration": entry.last_duration,
+                    "overruns": entry.overruns,
+                    "skipped": entry.skipped,
+                    "last_trigger": entry.last_trigger,
+                }
+                for entry in self.entries
+            },
+        }
+
+    async def run(self):
+        """Run all strategies until cancelled."""
+        self._tasks = [asyncio.create_task(self.lag_monitor.run())]
+        if self.report_interval:
+            self._tasks.append(asyncio.create_task(self._report()))
+        self._tasks += [asyncio.create_task(self._run_entry(entry)) for entry in self.entries]
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            for task in self._tasks:
+                task.cancel()
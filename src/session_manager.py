@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+try:
+    from .config import Config
+    from .log import get_logger
+except ImportError:
+    from config import Config
+    from log import get_logger
+
+logger = get_logger("session_manager")
+
+class SessionManager:
+    """
+    Owns the limitless_session cookie for a client.
+
+    Tracks when the cookie expires and logs in again shortly before it
+    lapses, from a background thread (sync client) or task (async client),
+    so re-authentication stays off the trading path. Clients retry a
+    request exactly once after a 401, via refresh(stale_cookie=...).
+    """
+    def __init__(self, auth, on_refresh, refresh_margin=None):
+        """
+        :param auth: LimitlessAuth used to log in
+        :param on_refresh: Callback(cookie) that installs a new cookie on the HTTP session
+        :param refresh_margin: Seconds before expiry to refresh
+        """
+        self.auth = auth
+        self.on_refresh = on_refresh
+        self.refresh_margin = refresh_margin if refresh_margin is not None else Config.SESSION_REFRESH_MARGIN
+        self.cookie = None
+        self.issued_at = 0.0
+        self.expires_at = 0.0
+        self.refreshes = 0
+
+        self._lock = threading.Lock()
+        self._async_lock = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._task = None
+
+    def margin(self):
+        """
+        refresh_margin, capped at half the session's lifetime: with a TTL at
+        or below the margin a fresh cookie would never count as valid and
+        the refresh loops would log in back to back.
+        """
+        return min(self.refresh_margin, (self.expires_at - self.issued_at) / 2)
+
+    def is_valid(self, now=None):
+        now = now if now is not None else time.time()
+        return self.cookie is not None and now < self.expires_at - self.margin()
+
+    def seconds_until_refresh(self, now=None):
+        now = now if now is not None else time.time()
+        return max(0.0, self.expires_at - self.margin() - now)
+
+    def refresh(self, stale_cookie=None, if_invalid=False):
+        """
+        Log in and install the new cookie.
+        With stale_cookie, skip the login if another caller already replaced
+        that cookie while we waited for the lock; with if_invalid, skip it if
+        the session is valid by then (ensure() and the refresh loops).
+        """
+        with self._lock:
+            if stale_cookie is not None and self.cookie != stale_cookie and self.is_valid():
+                return self.cookie
+            if if_invalid and self.is_valid():
+                return self.cookie
+            cookie = self.auth.login()
+            self.cookie = cookie
+            self.issued_at = time.time()
+            self.expires_at = self.auth.session_expires_at
+            self.refreshes += 1
+            self.on_refresh(cookie)
+            return cookie
+
+    def ensure(self):
+        """Make sure a valid session exists, logging in if needed."""
+        if not self.is_valid():
+            self.refresh(if_invalid=True)
+        return self.cookie
+
+    # --- Background refresh (sync) ---
+
+    def start_background(self):
+        """Refresh ahead of expiry on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="SessionRefresh", daemon=True)
+        self._thread.start()
+
+    def stop_background(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self):
+        backoff = 1.0
+        while not self._stop.wait(self.seconds_until_refresh()):
+            try:
+                self.refresh(if_invalid=True)
+                backoff = 1.0
+            except Exception as e:
+                logger.warning("Refresh failed: %s, retrying in %.0fs", e, backoff)
+                if self._stop.wait(backoff):
+                    break
+                backoff = min(backoff * 2, 60.0)
+
+    # --- Async ---
+
+    async def refresh_async(self, stale_cookie=None, if_invalid=False):
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if stale_cookie is not None and self.cookie != stale_cookie and self.is_valid():
+                return self.cookie
+            if if_invalid and self.is_valid():
+                return self.cookie
+            # Login is blocking HTTP; run it in a worker thread
+            return await asyncio.to_thread(self.refresh, stale_cookie, if_invalid)
+
+    async def ensure_async(self):
+        if not self.is_valid():
+            await self.refresh_async(if_invalid=True)
+        return self.cookie
+
+    def start_background_async(self):
+        """Refresh ahead of expiry from a task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop_async())
+
+    async def stop_background_async(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop_async(self):
+        backoff = 1.0
+        while True:
+            await asyncio.sleep(self.seconds_until_refresh())
+            try:
+                await self.refresh_async(if_invalid=True)
+                backoff = 1.0
+            except Exception as e:
+                logger.warning("Refresh failed: %s, retrying in %.0fs", e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
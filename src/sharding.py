@@ -0,0 +1,484 @@
+import asyncio
+import hashlib
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+try:
+    from .config import Config
+    from .async_client import AsyncLimitlessClient
+    from .data_feed import DataFeed
+    from .market_catalog import MarketCatalog, detect_asset
+    from .rate_limiter import CANCEL, MARKET_DATA, ORDER, RateLimiter
+    from .scheduler import StrategyScheduler
+    from .volatility import DEFAULT_VOLATILITY, FALLBACK_VOLATILITY, SECONDS_PER_YEAR, VolatilityEngine, nearest_horizon
+    from .metrics import counter
+    from .log import get_logger, setup_logging, shutdown_logging
+except ImportError:
+    from config import Config
+    from async_client import AsyncLimitlessClient
+    from data_feed import DataFeed
+    from market_catalog import MarketCatalog, detect_asset
+    from rate_limiter import CANCEL, MARKET_DATA, ORDER, RateLimiter
+    from scheduler import StrategyScheduler
+    from volatility import DEFAULT_VOLATILITY, FALLBACK_VOLATILITY, SECONDS_PER_YEAR, VolatilityEngine, nearest_horizon
+    from metrics import counter
+    from log import get_logger, setup_logging, shutdown_logging
+
+logger = get_logger("sharding")
+
+SHARD_BY = ("slug", "asset")
+ASSETS = ("BTC", "ETH", "SOL")
+
+def shard_of(market, count, by="slug"):
+    """
+    Shard index of a market. Slugs are hashed with blake2b rather than
+    hash(), which is salted per process, so every worker agrees. By asset,
+    each known asset gets its own shard (modulo count).
+    """
+    if by == "asset":
+        asset = market.get("_asset") or detect_asset(market.get("title", ""))
+        if asset in ASSETS:
+            return ASSETS.index(asset) % count
+    digest = hashlib.blake2b(market["slug"].encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % count
+
+class Shard:
+    """
+    One worker's slice of the catalog. Ownership is memoized per slug, so
+    a steady-state scan only does dict lookups.
+    """
+    def __init__(self, index, count, by="slug"):
+        if by not in SHARD_BY:
+            raise ValueError(f"Unknown SHARD_BY {by!r}, expected one of {SHARD_BY}")
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index {index} out of range for {count} shards")
+        self.index = index
+        self.count = count
+        self.by = by
+        self.owned = {}
+
+    def owns(self, market):
+        owned = self.owned.get(market["slug"])
+        if owned is None:
+            owned = self.owned[market["slug"]] = shard_of(market, self.count, self.by) == self.index
+        return owned
+
+    def select(self, markets):
+        return [market for market in markets if 'slug' in market and self.owns(market)]
+
+    def evict(self, slug):
+        self.owned.pop(slug, None)
+
+    def retain(self, active_slugs):
+        active_slugs = set(active_slugs)
+        for slug in [s for s in self.owned if s not in active_slugs]:
+            del self.owned[slug]
+
+    def __repr__(self):
+        return f"Shard({self.index}/{self.count} by {self.by})"
+
+# Column layout of a SharedPrices row
+SEQ, PRICE, TS, WINDOW, RANGE_VOL, EWMA = range(6)
+
+class SharedPrices:
+    """
+    Latest price, tick time and volatility state per pair in one shared
+    memory block, written by the supervisor and read by every worker.
+
+    Rows are guarded by a sequence number that is odd while a write is in
+    progress: readers copy the row and retry if the number was odd or
+    changed, so neither side ever takes a lock.
+    """
+    def __init__(self, pairs=None, horizons=None, name=None):
+        """
+        :param pairs: Binance pairs with a row each (default: DataFeed.SYMBOL_MAP)
+        :param horizons: EWMA half-lives, one volatility column each (VOL_HALF_LIVES)
+        :param name: Attach to an existing block instead of creating one
+        """
+        self.pairs = tuple(pairs or DataFeed.SYMBOL_MAP.values())
+        self.horizons = tuple(sorted(horizons or Config.VOL_HALF_LIVES))
+        self.rows = {pair: i for i, pair in enumerate(self.pairs)}
+        shape = (len(self.pairs), EWMA + len(self.horizons))
+        self.owner = name is None
+        size = int(np.prod(shape)) * 8
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.data = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf)
+        if self.owner:
+            self.data[:] = 0.0
+
+    def spec(self):
+        """Picklable arguments for attach() in another process."""
+        return self.shm.name, self.pairs, self.horizons
+
+    @classmethod
+    def attach(cls, spec):
+        name, pairs, horizons = spec
+        return cls(pairs, horizons, name=name)
+
+    def publish(self, pair, price, timestamp, volatility=None):
+        """
+        One writer at a time: threads that publish must hold a shared lock
+        (see PricePublisher), or a lost sequence bump leaves readers spinning.
+
+        :param volatility: (window_seconds, range_vol, ewma_vols) as returned
+                           by VolatilityEstimator.state(); kept if omitted
+        """
+        row = self.data[self.rows[pair]]
+        seq = row[SEQ]
+        row[SEQ] = seq + 1
+        row[PRICE] = price
+        row[TS] = timestamp
+        if volatility is not None:
+            window, range_vol, ewma = volatility
+            row[WINDOW] = window
+            row[RANGE_VOL] = range_vol
+            row[EWMA:] = ewma
+        row[SEQ] = seq + 2
+
+    def read(self, pair):
+        """Consistent copy of a pair's row, or None if it was never published."""
+        i = self.rows.get(pair)
+        if i is None:
+            return None
+        row = self.data[i]
+        while True:
+            seq = row[SEQ]
+            if seq % 2 == 0:
+                copy = row.copy()
+                if row[SEQ] == seq:
+                    break
+        return copy if seq else None
+
+    def close(self):
+        self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+class SharedPriceFeed:
+    """
+    Read-only DataFeed for a worker, backed by SharedPrices. Never does
+    I/O: a price older than stale_after reads as missing and the market is
+    skipped for that scan.
+    """
+    SYMBOL_MAP = DataFeed.SYMBOL_MAP
+    _pair = DataFeed._pair
+
+    def __init__(self, prices, stale_after=None):
+        self.prices = prices
+        self.stale_after = stale_after if stale_after is not None else Config.PRICE_STALE_AFTER
+
+    def get_crypto_price(self, symbol="BTC"):
+        row = self.prices.read(self._pair(symbol))
+        if row is None or time.time() - row[TS] > self.stale_after:
+            return None
+        return float(row[PRICE])
+
+    def get_tick(self, symbol="BTC"):
+        row = self.prices.read(self._pair(symbol))
+        return None if row is None else (float(row[PRICE]), float(row[TS]))
+
+    def get_volatility(self, symbol, time_to_expiry_years):
+        """Same choice as VolatilityEstimator.volatility, from the published state."""
+        pair = self._pair(symbol)
+        row = self.prices.read(pair)
+        if row is None or row[RANGE_VOL] <= 0:
+            return DEFAULT_VOLATILITY.get(pair, FALLBACK_VOLATILITY)
+        if time_to_expiry_years * SECONDS_PER_YEAR <= row[WINDOW]:
+            return float(row[RANGE_VOL])
+        return float(row[EWMA + nearest_horizon(self.prices.horizons, time_to_expiry_years)])
+
+class PricePublisher:
+    """
+    Copies a DataFeed's ticks and volatility state into SharedPrices.
+
+    The stream thread publishes through on_tick and the supervisor's loop
+    through publish_all; a lock keeps them from writing a row at once, and
+    publish_all leaves pairs the stream is keeping current alone.
+    """
+    def __init__(self, prices, data_feed, stale_after=None):
+        """
+        :param stale_after: Seconds without a stream tick before publish_all
+                            takes over a pair (default PRICE_STALE_AFTER)
+        """
+        self.prices = prices
+        self.data_feed = data_feed
+        self.stale_after = stale_after if stale_after is not None else Config.PRICE_STALE_AFTER
+        self.streamed = {}  # pair -> monotonic time of its last on_tick
+        self._lock = threading.Lock()
+
+    def volatility_state(self, pair):
+        engine = self.data_feed.volatility
+        estimator = engine.estimators.get(pair) if engine is not None else None
+        if estimator is not None:
+            return estimator.state()
+        prior = DEFAULT_VOLATILITY.get(pair, FALLBACK_VOLATILITY)
+        return 0.0, prior, [prior] * len(self.prices.horizons)
+
+    def on_tick(self, pair, price, timestamp):
+        """DataFeed on_tick callback (stream thread)."""
+        if pair in self.prices.rows:
+            with self._lock:
+                self.streamed[pair] = time.monotonic()
+                self.prices.publish(pair, price, timestamp, self.volatility_state(pair))
+
+    def publish_all(self):
+        """Publish every pair the stream isn't keeping current, from REST if need be."""
+        for symbol, pair in self.data_feed.SYMBOL_MAP.items():
+            if pair not in self.prices.rows or self._streaming(pair):
+                continue
+            # May block on REST, so outside the lock
+            if self.data_feed.get_crypto_price(symbol) is None:
+                continue
+            with self._lock:
+                if self._streaming(pair):
+                    continue  # a stream tick landed meanwhile and is newer
+                price, timestamp = self.data_feed.ticks[pair]
+                self.prices.publish(pair, price, timestamp, self.volatility_state(pair))
+
+    def _streaming(self, pair):
+        last = self.streamed.get(pair)
+        return last is not None and time.monotonic() - last <= self.stale_after
+
+class GatewayClient:
+    """
+    The client a worker's strategy sees. Reads go to the worker's own
+    AsyncLimitlessClient; create_order signs in the worker, so signing
+    scales with the shards, and queues the payload for the order gateway.
+    """
+    def __init__(self, client, orders):
+        self.client = client
+        self.orders = orders
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def create_order(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        payload = self.client.build_order_payload(market_slug, token_id, side, price_cents, amount_shares, expiration_ts)
+        self.orders.put(payload)
+        return {"status": "QUEUED", "marketSlug": market_slug}
+
+class OrderGateway:
+    """
+    Submits the workers' signed orders through one client, so there is a
+    single session and a single order rate limit for the whole bot.
+    """
+    def __init__(self, client, orders, poll_interval=0.5):
+        self.client = client
+        self.orders = orders
+        self.poll_interval = poll_interval
+        self.submitted = counter("gateway_orders_total")
+        self.failed = counter("gateway_order_errors_total")
+        self._pending = set()
+
+    async def submit(self, payload):
+        try:
+            response = await self.client.submit_order(payload)
+            self.submitted.inc()
+            logger.info("Order %s in %s: %s", response.get("id"), payload.get("marketSlug"), response.get("status"))
+            return response
+        except Exception as e:
+            self.failed.inc()
+            logger.error("Order in %s failed: %s", payload.get("marketSlug"), e)
+            return None
+
+    async def run(self, stop):
+        """Submit queued orders concurrently until `stop` (an Event) is set."""
+        while not stop.is_set():
+            try:
+                payload = await asyncio.to_thread(self.orders.get, True, self.poll_interval)
+            except queue.Empty:
+                continue
+            task = asyncio.create_task(self.submit(payload))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+def shard_limiter(count):
+    """
+    Market data limits for one of `count` workers: an equal share of the
+    venue budget. The burst never drops below two tokens, one market data
+    request plus a whole reserved one for an order, so neither starves
+    with many shards; the sustained rate is still an equal share.
+    """
+    return RateLimiter(
+        global_rps=Config.RATE_LIMIT_RPS / count,
+        global_burst=max(2.0, Config.RATE_LIMIT_BURST / count),
+        category_rps={
+            MARKET_DATA: Config.RATE_LIMIT_DATA_RPS / count,
+            ORDER: Config.RATE_LIMIT_ORDER_RPS / count,
+            CANCEL: Config.RATE_LIMIT_ORDER_RPS / count,
+        },
+    )
+
+async def _until_stopped(coro, stop, poll_interval=0.5):
+    task = asyncio.ensure_future(coro)
+    try:
+        while not stop.is_set() and not task.done():
+            await asyncio.sleep(poll_interval)
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+async def _run_worker(index, count, by, prices_spec, orders, stop, execute):
+    # Strategies use top-level imports; only workers need them
+    from strategies.crypto_strategy import CryptoPriceStrategy
+
+    prices = SharedPrices.attach(prices_spec)
+    try:
+        async with AsyncLimitlessClient() as client:
+            client.limiter = shard_limiter(count)
+            catalog = MarketCatalog(client)
+            await catalog.refresh_async()
+            strategy = CryptoPriceStrategy(
+                GatewayClient(client, orders), data_feed=SharedPriceFeed(prices), catalog=catalog,
+                execute=execute, shard=Shard(index, count, by),
+            )
+            scheduler = StrategyScheduler(report_interval=Config.SCHEDULER_REPORT_INTERVAL)
+            scheduler.add_strategy(strategy, interval=Config.CRYPTO_SCAN_INTERVAL, jitter=Config.SCHEDULER_JITTER)
+            logger.info("Worker %s scanning %d of %d markets", strategy.shard, len(strategy.owned_markets(catalog.markets())), len(catalog))
+            await _until_stopped(scheduler.run(), stop)
+    finally:
+        prices.close()
+
+def worker_main(index, count, by, prices_spec, orders, stop, execute=False):
+    """Entry point of a worker process."""
+    setup_logging()
+    try:
+        asyncio.run(_run_worker(index, count, by, prices_spec, orders, stop, execute))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_logging()
+
+async def _run_gateway(orders, stop):
+    async with AsyncLimitlessClient() as client:
+        await OrderGateway(client, orders).run(stop)
+
+def gateway_main(orders, stop):
+    """Entry point of the order gateway process."""
+    setup_logging()
+    try:
+        asyncio.run(_run_gateway(orders, stop))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_logging()
+
+class ShardSupervisor:
+    """
+    Splits the crypto scan over `count` worker processes, each running a
+    CryptoPriceStrategy on its own partition of the catalog, plus one order
+    gateway process.
+
+    The supervisor holds the only Binance stream and publishes prices and
+    volatility to the workers through SharedPrices. Workers keep their own
+    catalog (conditional refreshes are cheap) and session, with an equal
+    share of the rate limit. Children that exit are restarted.
+
+    Usage:
+        await ShardSupervisor(count=4).run()
+    """
+    def __init__(self, count=None, by=None, execute=False, publish_interval=1.0):
+        """
+        :param count: Worker processes (SHARDS)
+        :param by: "slug" or "asset" (SHARD_BY)
+        :param execute: Let workers place orders (through the gateway)
+        :param publish_interval: Seconds between full price republishes and child health checks
+        """
+        self.count = count or Config.SHARDS
+        self.by = by or Config.SHARD_BY
+        if self.by not in SHARD_BY:
+            raise ValueError(f"Unknown SHARD_BY {self.by!r}, expected one of {SHARD_BY}")
+        self.execute = execute
+        self.publish_interval = publish_interval
+        # Spawned children start clean: no inherited threads, locks or sockets
+        self.context = multiprocessing.get_context("spawn")
+        self.prices = None
+        self.data_feed = None
+        self.publisher = None
+        self.orders = None
+        self.stop_event = None
+        self.gateway = None
+        self.workers = []
+        self.restarts = counter("shard_restarts_total")
+
+    def _spawn_worker(self, index):
+        process = self.context.Process(
+            target=worker_main, name=f"shard-{index}", daemon=True,
+            args=(index, self.count, self.by, self.prices.spec(), self.orders, self.stop_event, self.execute),
+        )
+        process.start()
+        return process
+
+    def _spawn_gateway(self):
+        process = self.context.Process(
+            target=gateway_main, name="order-gateway", daemon=True, args=(self.orders, self.stop_event),
+        )
+        process.start()
+        return process
+
+    def start(self):
+        self.prices = SharedPrices()
+        self.data_feed = DataFeed(volatility=VolatilityEngine())
+        self.publisher = PricePublisher(self.prices, self.data_feed)
+        self.data_feed.on_tick = self.publisher.on_tick
+        # Seed every pair over REST so workers can price from their first scan
+        self.publisher.publish_all()
+        self.data_feed.start_stream(list(DataFeed.SYMBOL_MAP))
+
+        self.orders = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.gateway = self._spawn_gateway()
+        self.workers = [self._spawn_worker(i) for i in range(self.count)]
+        logger.info("Started %d shard workers (by %s) and the order gateway", self.count, self.by)
+
+    def check_children(self):
+        """Restart any worker or gateway process that has exited."""
+        for i, process in enumerate(self.workers):
+            if not process.is_alive():
+                logger.warning("Shard %d exited with code %s, restarting", i, process.exitcode)
+                self.restarts.inc()
+                self.workers[i] = self._spawn_worker(i)
+        if not self.gateway.is_alive():
+            logger.warning("Order gateway exited with code %s, restarting", self.gateway.exitcode)
+            self.restarts.inc()
+            self.gateway = self._spawn_gateway()
+
+    def stop(self, timeout=10):
+        if self.stop_event is not None:
+            self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in [*self.workers, self.gateway]:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.workers = []
+        self.gateway = None
+        if self.data_feed is not None:
+            self.data_feed.stop_stream()
+        if self.prices is not None:
+            self.prices.close()
+            self.prices = None
+
+    async def run(self):
+        """Supervise until cancelled."""
+        self.start()
+        try:
+            while True:
+                await asyncio.sleep(self.publish_interval)
+                # REST fallback for stale pairs is blocking I/O
+                await asyncio.to_thread(self.publisher.publish_all)
+                self.check_children()
+        finally:
+            await asyncio.to_thread(self.stop)
@@ -1,164 +1,469 @@
-import re
+import asyncio
+import inspect
+import numpy as np
 from strategy import BaseStrategy
 from data_feed import DataFeed
-from analytics import ProbabilityEngine
+from analytics import ProbabilityEngine, market_deadline
+from config import Config
 from risk_manager import RiskManager
+from market_parser import MarketParser
+from orderbook import OrderBook
+from metrics import METRICS
+from log import get_logger
+
+logger = get_logger("crypto_strategy")
 
 class CryptoPriceStrategy(BaseStrategy):
     """
-    Strategy for "Price > X" markets.
+    Strategy for "Price > X", "Price < X" and price-range crypto markets.
     """
-    def __init__(self, client, min_confidence=0.7):
+    ASSETS = ("BTC", "ETH", "SOL")
+    STAGES = ("markets", "evaluate", "orderbooks", "signals")
+
+    def __init__(self, client, min_confidence=0.8, data_feed=None, catalog=None, kelly_fraction=0.5, execute=False,
+                 portfolio=None, shard=None, min_edge=0.10, top_k=20, book_hint_max_age=None):
+        """
+        :param min_confidence: Model probability (of YES or of NO) needed before the
+                               orderbook of a market with no price hint is fetched
+        :param min_edge: Expected edge against a market's price hint needed before
+                         its orderbook is fetched
+        :param top_k: Orderbooks fetched per scan, best expected edge x liquidity
+                      first (None for no limit)
+        :param book_hint_max_age: Seconds a fetched book still serves as a market's
+                                  price hint (default BOOK_HINT_MAX_AGE)
+        :param data_feed: Shared DataFeed (a private one is created if omitted)
+        :param catalog: Shared MarketCatalog; without one each run lists 50 markets
+        :param kelly_fraction: Fraction of Kelly used for sizing
+        :param execute: Place orders for signals (otherwise they are only logged)
+        :param portfolio: Loaded PortfolioService; sizes trades against real balances and
+                          exposure limits. Without one a mock $1000 balance is used.
+        :param shard: Only scan the markets this sharding.Shard owns (one worker's slice)
+        """
         super().__init__(client)
-        self.data_feed = DataFeed()
-        self.risk_manager = RiskManager()
+        self.data_feed = data_feed or DataFeed()
+        self.catalog = catalog
+        self.portfolio = portfolio
+        self.risk_manager = RiskManager(kelly_fraction=kelly_fraction, portfolio=portfolio)
         self.min_confidence = min_confidence
-        self.volatility_map = {
-            "BTC": 0.6, # 60% annualized volatility
-            "ETH": 0.7,
-            "SOL": 0.8
+        self.min_edge = min_edge
+        self.top_k = top_k
+        self.book_hint_max_age = book_hint_max_age if book_hint_max_age is not None else Config.BOOK_HINT_MAX_AGE
+        self.execute = execute
+        self.parser = MarketParser()
+        self.shard = shard
+        self.books = {}
+        self.book_times = {}  # slug -> clock() when its book was last fetched
+        self.stage_timers = {
+            stage: METRICS.timer("strategy_stage_seconds", strategy=self.__class__.__name__, stage=stage)
+            for stage in self.STAGES
         }
+        if catalog is not None:
+            catalog.subscribe(on_remove=self.on_market_closed)
+
+    def on_market_closed(self, slug):
+        self.parser.evict(slug)
+        self.books.pop(slug, None)
+        self.book_times.pop(slug, None)
+        if self.shard is not None:
+            self.shard.evict(slug)
+
+    def owned_markets(self, markets):
+        """The markets this instance's shard scans (all of them when unsharded)."""
+        if self.shard is None:
+            return markets
+        if self.catalog is None:
+            self.shard.retain(item['slug'] for item in markets if 'slug' in item)
+        return self.shard.select(markets)
 
     def parse_market(self, title, slug):
         """
         Extract asset, strike price, and direction from market title/slug.
         Example: "Bitcoin above 100k by 2024"
+        Results are memoized per slug, see MarketParser.
         """
-        title_lower = title.lower()
-        
-        # Detect Asset
-        asset = None
-        if "bitcoin" in title_lower or "btc" in title_lower:
-            asset = "BTC"
-        elif "ethereum" in title_lower or "eth" in title_lower:
-            asset = "ETH"
-        elif "solana" in title_lower or "sol" in title_lower:
-            asset = "SOL"
+        return self.parser.parse(title, slug)
+
+    def price_hint(self, item, now=None):
+        """
+        Cheapest read on a market before its orderbook is fetched:
+        (best bid, best ask, liquidity in $), any of them None if unknown.
+
+        The book kept from an earlier scan wins while it is younger than
+        book_hint_max_age; otherwise the listing's "prices" ([YES, NO], in
+        percent or as fractions) and "liquidity". Catalog listings older
+        than book_hint_max_age give no price, so the market ranks on
+        confidence instead of a price the venue has long moved off.
+        """
+        now = now if now is not None else self.clock()
+        book = self.books.get(item['slug'])
+        if (book is not None and book.best_bid() is not None and book.best_ask() is not None
+                and now - self.book_times[item['slug']] <= self.book_hint_max_age):
+            return book.best_bid(), book.best_ask(), book.liquidity()
+        liquidity = item.get('liquidity')
+        try:
+            liquidity = float(liquidity) if liquidity is not None else None
+            if now - item.get('_listed_at', now) > self.book_hint_max_age:
+                return None, None, liquidity
+            yes = float(item['prices'][0])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None, None, liquidity
+        if yes > 1.0:
+            yes /= 100.0
+        return yes, yes, liquidity
+
+    def evaluate_markets(self, markets):
+        """
+        Stage one of a scan: price every parseable market against the model
+        in one batch, compare it with the market's price hint and return the
+        top_k worth fetching an orderbook for, best expected edge x liquidity
+        first.
+
+        With a hint, the expected edge is how far the model is through the
+        hinted bid/ask, and it must reach min_edge. Without one, the market
+        only qualifies on min_confidence and is ranked as if priced at 0.5.
+        Markets with no known liquidity are weighted by the median of those
+        with one.
+        """
+        rows = []
+        if self.catalog is None:
+            # Markets that dropped out of the active listing have closed
+            self.parser.retain(item['slug'] for item in markets if 'slug' in item)
+        for item in markets:
+            # Assuming item has 'title' and 'deadline'
+            # If not, we might need to fetch details.
+            # Let's assume the list endpoint returns basic metadata.
             
-        if not asset:
-            return None
+            # Note: The actual API response structure needs to be verified.
+            # If 'title' is missing, we skip.
+            if 'title' not in item or 'slug' not in item:
+                continue
 
-        # Detect Strike Price (Simplified regex)
-        # Looking for "$100,000", "100k", "50000"
-        # This is tricky and requires robust regex.
-        # Let's try to find numbers near "above" or ">"
-        
-        strike = None
-        # Regex for "above $X" or "above X"
-        match = re.search(r'above\s+\$?([\d,]+)(k?)', title_lower)
-        if match:
-            num_str = match.group(1).replace(",", "")
-            multiplier = 1000 if match.group(2) == 'k' else 1
-            try:
-                strike = float(num_str) * multiplier
-            except:
-                pass
+            parsed = self.parse_market(item['title'], item['slug'])
+            if not parsed:
+                continue
+                
+            logger.debug("  Found candidate: %s -> %s", item['title'], parsed)
+            
+            # Get Real-time Price
+            current_price = self.data_feed.get_crypto_price(parsed['asset'])
+            if not current_price:
+                continue
                 
-        if not strike:
+            rows.append({
+                "item": item,
+                "parsed": parsed,
+                "current_price": current_price,
+                "deadline": market_deadline(item),
+            })
+
+        if not rows:
+            return []
+
+        # One clock read for the whole scan; deadlines were parsed once per market
+        now = self.clock()
+        expiries = ProbabilityEngine.get_times_to_expiry([row['deadline'] for row in rows], now=now).tolist()
+        for row, time_to_expiry in zip(rows, expiries):
+            # Realized volatility over a horizon matched to the expiry
+            row['time_to_expiry'] = time_to_expiry
+            row['volatility'] = self.data_feed.get_volatility(row['parsed']['asset'], time_to_expiry)
+
+        # Calculate True Probability for every market in one vectorized pass.
+        # Range markets also need P(> upper strike).
+        spots = [row['current_price'] for row in rows]
+        vols = [row['volatility'] for row in rows]
+        prob_above = ProbabilityEngine.calculate_probabilities(
+            spots, [row['parsed']['strike'] for row in rows], expiries, vols
+        )
+        prob_above_high = ProbabilityEngine.calculate_probabilities(
+            spots, [row['parsed'].get('strike_high', row['parsed']['strike']) for row in rows], expiries, vols
+        )
+        direction = np.array([row['parsed']['direction'] for row in rows])
+        true_prob = np.where(direction == "BELOW", 1.0 - prob_above,
+                             np.where(direction == "BETWEEN", prob_above - prob_above_high, prob_above))
+
+        # Rank against the price hints (NaN where there is none)
+        hints = np.array([self.price_hint(row['item'], now) for row in rows], dtype=float)
+        bid, ask, liquidity = hints[:, 0], hints[:, 1], hints[:, 2]
+        hinted = ~np.isnan(bid)
+        confidence = np.maximum(true_prob, 1.0 - true_prob)
+        edge = np.where(hinted, np.fmax(true_prob - ask, bid - true_prob), confidence - 0.5)
+        qualifies = np.where(hinted, edge >= self.min_edge, confidence >= self.min_confidence)
+        known = ~np.isnan(liquidity)
+        liquidity = np.where(known, liquidity, np.median(liquidity[known]) if known.any() else 1.0)
+        score = edge * liquidity
+
+        selected = np.flatnonzero(qualifies)
+        selected = selected[np.argsort(-score[selected], kind="stable")][:self.top_k]
+        logger.debug("Ranked %d markets, %d qualify, fetching %d books",
+                     len(rows), int(qualifies.sum()), len(selected))
+
+        candidates = []
+        for i in selected.tolist():
+            row = rows[i]
+            logger.debug("    %s: Current %s: $%s", row['item']['title'], row['parsed']['asset'], row['current_price'])
+            logger.debug("    True Probability (Model): %.4f, expected edge %.4f", true_prob[i], edge[i])
+            candidates.append({
+                "item": row['item'],
+                "parsed": row['parsed'],
+                "true_prob": float(true_prob[i]),
+                "time_to_expiry": row['time_to_expiry'],
+                "expected_edge": float(edge[i]),
+                "score": float(score[i]),
+            })
+        return candidates
+
+    def build_signal(self, candidate, orderbook):
+        """
+        Compare the model probability with the orderbook. Returns a signal
+        dict for a mispriced market, or None.
+        """
+        if not orderbook:
             return None
+
+        item = candidate['item']
+        true_prob = candidate['true_prob']
+
+        book = self.books.get(item['slug'])
+        if book is None:
+            book = self.books[item['slug']] = OrderBook(item['slug'])
+        book.apply_snapshot(orderbook)
+        self.book_times[item['slug']] = self.clock()
+
+        # Check for mispricing
+        # If True Prob is 90%, and Market Price (YES) is 70c -> BUY YES
+        # If True Prob is 10%, and Market Price (NO) is 70c -> BUY NO (which is SELL YES or BUY NO token)
+        
+        best_ask_yes = book.best_ask()
+        market_prob = best_ask_yes if best_ask_yes is not None else 1.0
+        
+        logger.debug("    Market Price (YES): %.4f", market_prob)
+        
+        # Signal Generation
+        confidence = 0.0
+        side = -1 # 0 BUY YES, 1 BUY NO (SELL YES)
+        
+        if true_prob > market_prob + 0.10: # 10% edge
+            confidence = true_prob - market_prob
+            side = 0 # BUY YES
+            logger.debug("    >>> SIGNAL: BUY YES (Edge: %.2f)", confidence)
             
+        elif true_prob < market_prob - 0.10:
+            confidence = market_prob - true_prob
+            side = 1 # SELL YES / BUY NO
+            logger.debug("    >>> SIGNAL: BUY NO (Edge: %.2f)", confidence)
+            
+        if confidence <= 0.15: # High confidence threshold
+            return None
+
+        # What the bought token costs and how likely it pays out
+        if side == 0:
+            win_prob, price = true_prob, market_prob
+        else:
+            best_bid_yes = book.best_bid()
+            win_prob, price = 1.0 - true_prob, 1.0 - (best_bid_yes if best_bid_yes is not None else 0.0)
+
+        # +1 if the bet wins when the underlying rises, -1 if it falls, 0 for ranges
+        direction = {"ABOVE": 1, "BELOW": -1}.get(candidate['parsed']['direction'], 0)
         return {
-            "asset": asset,
-            "strike": strike,
-            "direction": "ABOVE" # Assuming "above" markets for now
+            **candidate,
+            "book": book,
+            "side": side,
+            "market_prob": market_prob,
+            "confidence": confidence,
+            "win_prob": win_prob,
+            "price": price,
+            "direction": direction if side == 0 else -direction,
         }
 
+    def size_signals(self, signals):
+        """
+        Size every signal of a scan jointly (see RiskManager.size_portfolio),
+        so correlated strikes on one underlying share a single Kelly budget.
+        """
+        if not signals:
+            return []
+        amounts = self.risk_manager.size_portfolio(
+            [signal['win_prob'] for signal in signals],
+            [signal['price'] for signal in signals],
+            [signal['parsed']['asset'] for signal in signals],
+            directions=[signal['direction'] for signal in signals],
+            slugs=[signal['item']['slug'] for signal in signals],
+            # No portfolio wired in: mock balance (e.g. $1000)
+            equity=None if self.portfolio is not None else 1000.0,
+        )
+        # Apply timing risk adjustment
+        return [
+            amount * self.risk_manager.check_timing_risk(signal['time_to_expiry'])
+            for signal, amount in zip(signals, amounts.tolist())
+        ]
+
+    def check_fill(self, signal, amount):
+        """
+        Check the edge survives at the fill price. Returns the (shares,
+        worst YES price) to order, or None if the signal isn't traded.
+        """
+        item = signal['item']
+        book = signal['book']
+        side = signal['side']
+        true_prob = signal['true_prob']
+        confidence = signal['confidence']
+
+        # Real fill price: walk the book for the shares we'd take.
+        # BUY YES lifts the asks, BUY NO (SELL YES) hits the bids.
+        filled, worst_price = 0.0, None
+        if amount > 1.0 and signal['price'] > 0:
+            # signal['price'] is what the bought token costs (1 - YES bid for NO)
+            shares = amount / signal['price']
+            filled, notional, worst_price = book.sweep_cost("asks" if side == 0 else "bids", shares)
+            if filled <= 0:
+                logger.info("    [RISK] Signal ignored (No depth to fill against)")
+                return None
+            fill_price = notional / filled
+            fill_edge = true_prob - fill_price if side == 0 else fill_price - true_prob
+            logger.debug("    Fill VWAP: %.4f for %.2f/%.2f shares (Edge at fill: %.2f)", fill_price, filled, shares, fill_edge)
+            if fill_edge < 0.10:
+                logger.info("    [RISK] Signal ignored (Edge gone at fill price)")
+                return None
+            # Shrink to what the book can actually fill. notional is in YES
+            # prices; each NO share costs 1 - the YES bid it matches.
+            amount = min(amount, notional if side == 0 else filled - notional)
+        
+        if amount > 1.0: # Minimum trade size $1
+            logger.info("    >>> SIGNAL: %s in %s (Edge: %.2f)", 'BUY YES' if side == 0 else 'BUY NO', item['slug'], confidence)
+            logger.info("    [RISK] Position Size: $%.2f (Kelly: %s)", amount, self.risk_manager.kelly_fraction)
+            if worst_price is not None:
+                return filled, worst_price
+        else:
+            logger.info("    [RISK] Signal ignored (Size too small: $%.2f)", amount)
+        return None
+
+    def execute_signal(self, signal, amount):
+        """Check the edge survives at the fill price and (optionally) trade."""
+        fill = self.check_fill(signal, amount)
+        if self.execute and fill is not None:
+            self.place_order(signal['item'], signal['side'], *fill, signal['parsed']['asset'])
+
+    async def execute_signal_async(self, signal, amount):
+        """execute_signal for run_async: awaits the order on an async client."""
+        fill = self.check_fill(signal, amount)
+        if self.execute and fill is not None:
+            await self.place_order_async(signal['item'], signal['side'], *fill, signal['parsed']['asset'])
+
+    def build_signals(self, candidates, orderbooks):
+        """(signal, amount) for every mispriced candidate, sized together."""
+        signals = []
+        for candidate in candidates:
+            signal = self.build_signal(candidate, orderbooks.get(candidate['item']['slug']))
+            if signal is not None:
+                signals.append(signal)
+        return list(zip(signals, self.size_signals(signals)))
+
+    def process_candidates(self, candidates, orderbooks):
+        """Build signals for a scan's candidates, size them together, then execute."""
+        for signal, amount in self.build_signals(candidates, orderbooks):
+            try:
+                self.execute_signal(signal, amount)
+            except Exception as e:
+                # One failed order doesn't drop the rest of the scan
+                logger.error("Order in %s failed: %s", signal['item']['slug'], e)
+
+    async def process_candidates_async(self, candidates, orderbooks):
+        for signal, amount in self.build_signals(candidates, orderbooks):
+            try:
+                await self.execute_signal_async(signal, amount)
+            except Exception as e:
+                logger.error("Order in %s failed: %s", signal['item']['slug'], e)
+
+    def process_candidate(self, candidate, orderbook):
+        """
+        Compare the model probability with the orderbook and size a trade.
+        """
+        self.process_candidates([candidate], {candidate['item']['slug']: orderbook})
+
+    def order_args(self, item, side, shares, worst_yes_price):
+        """
+        create_order arguments to buy YES (side 0) or NO (side 1) up to the
+        worst YES level the fill walked through, or None without token ids.
+        A NO share costs 1 - the YES bid it is matched against.
+        """
+        tokens = item.get('tokens') or {}
+        token_id = tokens.get('yes') if side == 0 else tokens.get('no')
+        if token_id is None:
+            logger.warning("    [RISK] No token ids for %s, not trading", item['slug'])
+            return None
+        limit = worst_yes_price if side == 0 else 1.0 - worst_yes_price
+        price_cents = min(99, max(1, int(round(limit * 100))))
+        return item['slug'], token_id, 0, price_cents, shares
+
+    def place_order(self, item, side, shares, worst_yes_price, asset=None):
+        args = self.order_args(item, side, shares, worst_yes_price)
+        if args is None:
+            return None
+        response = self.client.create_order(*args)
+        self.on_order_placed(args, response, asset)
+        return response
+
+    async def place_order_async(self, item, side, shares, worst_yes_price, asset=None):
+        args = self.order_args(item, side, shares, worst_yes_price)
+        if args is None:
+            return None
+        response = self.client.create_order(*args)
+        # AsyncLimitlessClient returns a coroutine; a shard's GatewayClient queues synchronously
+        if inspect.isawaitable(response):
+            response = await response
+        self.on_order_placed(args, response, asset)
+        return response
+
+    def on_order_placed(self, args, response, asset):
+        if self.portfolio is not None:
+            slug, token_id, side, price_cents, shares = args
+            self.portfolio.on_order_placed(slug, token_id, side, price_cents / 100.0, shares, response, asset)
+
     def run(self):
-        print(f"[{self.__class__.__name__}] Scanning for Crypto opportunities...")
+        logger.debug("[%s] Scanning for Crypto opportunities...", self.__class__.__name__)
+        timers = self.stage_timers
         try:
-            markets = self.client.get_active_markets(limit=50)
-            
-            for item in markets:
-                # Assuming item has 'title' and 'deadline'
-                # If not, we might need to fetch details.
-                # Let's assume the list endpoint returns basic metadata.
-                
-                # Note: The actual API response structure needs to be verified.
-                # If 'title' is missing, we skip.
-                if 'title' not in item or 'slug' not in item:
-                    continue
-
-                parsed = self.parse_market(item['title'], item['slug'])
-                if not parsed:
-                    continue
-                    
-                print(f"  Found candidate: {item['title']} -> {parsed}")
-                
-                # Get Real-time Price
-                current_price = self.data_feed.get_crypto_price(parsed['asset'])
-                if not current_price:
-                    continue
-                    
-                # Calculate True Probability
-                time_to_expiry = ProbabilityEngine.get_time_to_expiry(item.get('deadline', ''))
-                volatility = self.volatility_map.get(parsed['asset'], 0.6)
-                
-                true_prob = ProbabilityEngine.calculate_probability(
-                    current_price, 
-                    parsed['strike'], 
-                    time_to_expiry, 
-                    volatility
-                )
-                
-                print(f"    Current {parsed['asset']}: ${current_price}")
-                print(f"    True Probability (Model): {true_prob:.4f}")
-                
-                # Get Market Price
-                # Optimization: Only fetch orderbook if model shows promise
-                # e.g. if True Prob is > 80% or < 20%
-                
-                if true_prob < 0.2 or true_prob > 0.8:
-                    orderbook = self.client.get_orderbook(item['slug'])
-                    if not orderbook:
-                        continue
-                        
-                    # Check for mispricing
-                    # If True Prob is 90%, and Market Price (YES) is 70c -> BUY YES
-                    # If True Prob is 10%, and Market Price (NO) is 70c -> BUY NO (which is SELL YES or BUY NO token)
-                    
-                    best_ask_yes = float(orderbook['asks'][0]['price']) if orderbook['asks'] else 1.0
-                    market_prob = best_ask_yes
-                    
-                    print(f"    Market Price (YES): {market_prob:.4f}")
-                    
-                    # Signal Generation
-                    confidence = 0.0
-                    side = -1 # 0 BUY YES, 1 BUY NO (SELL YES)
-                    
-                    if true_prob > market_prob + 0.10: # 10% edge
-                        confidence = true_prob - market_prob
-                        side = 0 # BUY YES
-                        print(f"    >>> SIGNAL: BUY YES (Edge: {confidence:.2f})")
-                        
-                    elif true_prob < market_prob - 0.10:
-                        confidence = market_prob - true_prob
-                        side = 1 # SELL YES / BUY NO
-                        print(f"    >>> SIGNAL: BUY NO (Edge: {confidence:.2f})")
-                        
-                    if confidence > 0.15: # High confidence threshold
-                        # Calculate Position Size
-                        # Mock portfolio balance for now (e.g. $1000)
-                        portfolio_balance = 1000.0 
-                        
-                        # Odds = 1 / Market Price
-                        odds = 1.0 / market_prob if market_prob > 0 else 1.0
-                        
-                        amount = self.risk_manager.calculate_position_size(portfolio_balance, true_prob, odds)
-                        
-                        # Apply timing risk adjustment
-                        timing_multiplier = self.risk_manager.check_timing_risk(time_to_expiry)
-                        amount *= timing_multiplier
-                        
-                        if amount > 1.0: # Minimum trade size $1
-                            print(f"    >>> SIGNAL: { 'BUY YES' if side == 0 else 'BUY NO' } (Edge: {confidence:.2f})")
-                            print(f"    [RISK] Position Size: ${amount:.2f} (Kelly: {self.risk_manager.kelly_fraction})")
-                            
-                            # Execute Trade (Uncomment to enable)
-                            # token_id = item['tokens']['yes'] if side == 0 else item['tokens']['no']
-                            # price_cents = int(market_prob * 100) + (1 if side == 0 else -1)
-                            # self.client.create_order(item['slug'], token_id, 0, price_cents, amount)
-                        else:
-                            print(f"    [RISK] Signal ignored (Size too small: ${amount:.2f})")
+            with timers["markets"].time():
+                if self.catalog is not None:
+                    self.catalog.refresh_if_stale()
+                    markets = self.catalog.markets(assets=self.ASSETS)
+                else:
+                    markets = self.client.get_active_markets(limit=50)
+                markets = self.owned_markets(markets)
+            with timers["evaluate"].time():
+                candidates = self.evaluate_markets(markets)
+
+            with timers["orderbooks"].time():
+                orderbooks = self.client.get_orderbooks([c['item']['slug'] for c in candidates])
+            with timers["signals"].time():
+                self.process_candidates(candidates, orderbooks)
+
+        except Exception as e:
+            logger.exception("Error in CryptoStrategy: %s", e)
+
+    async def run_async(self):
+        """
+        Same scan as run(), against an AsyncLimitlessClient. The top_k
+        candidates' orderbooks are fetched concurrently in a single fan-out.
+        """
+        logger.debug("[%s] Scanning for Crypto opportunities...", self.__class__.__name__)
+        timers = self.stage_timers
+        try:
+            with timers["markets"].time():
+                if self.catalog is not None:
+                    await self.catalog.refresh_if_stale_async()
+                    markets = self.catalog.markets(assets=self.ASSETS)
+                else:
+                    markets = await self.client.get_active_markets(limit=50)
+                markets = self.owned_markets(markets)
+            # DataFeed is still blocking I/O, keep it off the event loop
+            with timers["evaluate"].time():
+                candidates = await asyncio.to_thread(self.evaluate_markets, markets)
+
+            with timers["orderbooks"].time():
+                orderbooks = await self.client.get_orderbooks([c['item']['slug'] for c in candidates])
+            with timers["signals"].time():
+                await self.process_candidates_async(candidates, orderbooks)
 
         except Exception as e:
-            print(f"Error in CryptoStrategy: {e}")
+            logger.exception("Error in CryptoStrategy: %s", e)
@@ -1,48 +1,182 @@
+import asyncio
+import json
 import time
+from collections import deque
 from strategy import BaseStrategy
+from market_index import MarketIndex, normalize_key
+from log import get_logger
+
+logger = get_logger("latency_strategy")
+
+def load_rules(path):
+    """News rules from a JSON list file; no file means no rules."""
+    if not path:
+        return []
+    with open(path) as f:
+        return json.load(f)
 
 class LatencyArbitrageStrategy(BaseStrategy):
     """
     Strategy to exploit latency between real-world events and market updates.
-    Requires a fast external news source (e.g. WebSocket feed).
+    News arrives through NewsPipeline (news_feed.py) as "news" events.
+
+    Markets are found through a MarketIndex (token/entity -> slugs) rather
+    than scanning titles, and orders for every rule are built and signed
+    ahead of time. A matching news event only looks up its pre-armed order
+    bodies and submits them.
     """
-    def __init__(self, client):
+    def __init__(self, client, catalog=None, rules=(), execute=False, history=100):
+        """
+        :param catalog: MarketCatalog the keyword index is built from and follows
+        :param rules: Dicts of {"keyword", "action", "outcome" ("YES"/"NO"),
+                      "price_cents", "shares"}: when news with that keyword and
+                      action arrives, buy `outcome` in every matching market
+        :param execute: Submit the armed orders (otherwise matches are only logged)
+        :param history: Number of recent news events kept in news_buffer
+        """
         super().__init__(client)
-        self.news_buffer = []
+        self.news_buffer = deque(maxlen=history)
+        self.index = MarketIndex()
+        if catalog is not None:
+            self.index.attach(catalog)
+        self.rules = {}
+        for rule in rules:
+            self.add_rule(rule)
+        self.execute = execute
+
+        # rule key -> {slug: signed order body}, rebuilt when the index changes
+        self.armed = {}
+        # rule key -> slugs it has already fired in; those are never re-armed
+        self.fired = {}
+        self._armed_version = None
+        self.pending = deque()
+        self._tasks = set()
+        self._async_client = asyncio.iscoroutinefunction(getattr(client, "submit_order", None))
+
+        # Stats
+        self.matched = 0
+        self.submitted = 0
+        self.last_match_latency = None
+
+    @staticmethod
+    def _rule_key(keyword, action):
+        return normalize_key(keyword), (action or "").strip().lower()
+
+    def add_rule(self, rule):
+        self.rules[self._rule_key(rule["keyword"], rule.get("action"))] = rule
+        self._armed_version = None
+
+    # --- Arming ---
+
+    def arm_orders(self):
+        """
+        Build and sign an order body for every (rule, matching market) pair
+        that isn't armed or fired yet, and drop ones whose market has closed.
+        Runs off the news path, from run()/run_async().
+        """
+        if self._armed_version == self.index.version:
+            return
+        for key, rule in self.rules.items():
+            slugs = self.index.lookup(rule["keyword"])
+            armed = self.armed.setdefault(key, {})
+            for slug in list(armed):
+                if slug not in slugs:
+                    del armed[slug]
+            for slug in slugs - armed.keys() - self.fired.get(key, set()):
+                token_id = self.index.token_id(slug, rule.get("outcome", "YES"))
+                if token_id is None:
+                    continue
+                armed[slug] = self.client.build_order_payload(
+                    slug, token_id, 0, rule["price_cents"], rule["shares"]
+                )
+        self._armed_version = self.index.version
+
+    # --- News path ---
+
+    def on_event(self, event, payload):
+        if event == "news":
+            self.on_news_event(payload)
 
     def on_news_event(self, event):
         """
         Called when a fast news event is received.
         Event format: {"keyword": "Biden", "action": "dropout", "timestamp": 1234567890}
         """
-        print(f"[LatencyArb] Received fast news: {event}")
         self.news_buffer.append(event)
-        self.process_news(event)
+        orders = self.process_news(event)
+        if not orders:
+            return
+        logger.info("%s %s: %d armed orders (matched in %.0fus)",
+                    event.get('keyword'), event.get('action'), len(orders), self.last_match_latency * 1e6)
+        if not self.execute:
+            return
+        if not self._async_client:
+            self.submit(orders)
+            return
+        self.pending.extend(orders)
+        try:
+            task = asyncio.get_running_loop().create_task(self.submit_pending_async())
+        except RuntimeError:
+            return  # no loop on this thread; run_async picks them up
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     def process_news(self, event):
         """
-        Check if news impacts any active markets.
+        Return the pre-armed (slug, order body) pairs for an event and move
+        them to the fired set, so a later story with the same keyword and
+        action can't submit them again. Markets that start matching the rule
+        afterwards are still armed.
         """
-        # Example: If "Biden drops out" news comes in, immediately buy "NO" on "Biden Nominee" markets.
-        # This is a placeholder logic.
-        
-        # 1. Scan relevant markets (cached)
-        # markets = self.client.get_cached_markets() 
-        
-        # 2. Match keywords
-        # if event['keyword'] in market.title:
-        #    execute_trade()
-        pass
+        start = time.perf_counter()
+        key = self._rule_key(event.get("keyword", ""), event.get("action"))
+        armed = self.armed.get(key)
+        orders = []
+        if armed:
+            orders = list(armed.items())
+            self.fired.setdefault(key, set()).update(armed)
+            armed.clear()
+            self.matched += 1
+        self.last_match_latency = time.perf_counter() - start
+        return orders
+
+    def submit(self, orders):
+        for slug, body in orders:
+            try:
+                self.client.submit_order(body)
+                self.submitted += 1
+            except Exception as e:
+                logger.error("Order in %s failed: %s", slug, e)
+
+    async def submit_pending_async(self):
+        orders = []
+        while self.pending:
+            orders.append(self.pending.popleft())
+        results = await asyncio.gather(
+            *(self.client.submit_order(body) for _, body in orders), return_exceptions=True
+        )
+        for (slug, _), result in zip(orders, results):
+            if isinstance(result, Exception):
+                logger.error("Order in %s failed: %s", slug, result)
+            else:
+                self.submitted += 1
+
+    # --- Scheduler entry points ---
 
     def run(self):
-        """
-        Main loop. In a real latency bot, this would be waiting on a socket.
-        Here we simulate checking a news source.
-        """
-        # Simulate checking a news queue
-        if self.news_buffer:
-            event = self.news_buffer.pop(0)
-            # Process...
-        else:
-            # Poll for news (slow) or wait for socket push
-            pass
+        """Submit queued orders and arm markets that started matching a rule."""
+        if self.pending:
+            orders = list(self.pending)
+            self.pending.clear()
+            self.submit(orders)
+        self.arm_orders()
+
+    async def run_async(self):
+        if self.pending:
+            await self.submit_pending_async()
+        if self._armed_version != self.index.version:
+            sessions = getattr(self.client, "sessions", None)
+            if sessions is not None and self._async_client:
+                # build_order_payload signs synchronously; log in first without blocking the loop
+                await sessions.ensure_async()
+            self.arm_orders()
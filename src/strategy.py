@@ -1,31 +1,63 @@
 from abc import ABC, abstractmethod
-import random
-import time
+import asyncio
+try:
+    from .analytics import monotonic_time
+    from .orderbook import OrderBook
+    from .log import get_logger
+except ImportError:
+    from analytics import monotonic_time
+    from orderbook import OrderBook
+    from log import get_logger
+
+logger = get_logger("strategy")
 
 class BaseStrategy(ABC):
     def __init__(self, client):
         self.client = client
+        # Source of "now" in epoch seconds; the backtester swaps in its simulated clock
+        self.clock = monotonic_time
 
     @abstractmethod
     def run(self):
         """Main execution logic for the strategy."""
         pass
 
+    async def run_async(self):
+        """
+        Async entry point used with AsyncLimitlessClient.
+        Strategies without a native async path run in a worker thread, which
+        only works for a run() that doesn't call the client: the async
+        client's methods return coroutines.
+        """
+        await asyncio.to_thread(self.run)
+
+    def on_event(self, event, payload):
+        """
+        Called by StrategyScheduler when a subscribed event fires, just before
+        the strategy is woken. Override to capture the payload.
+        """
+        pass
+
 class SimpleStrategy(BaseStrategy):
     """
     A simple strategy that looks for markets with specific probability ranges
     and places small orders if the spread is favorable.
     """
-    def __init__(self, client, min_prob=40, max_prob=60, max_spend_usdc=1.0):
+    def __init__(self, client, min_prob=40, max_prob=60, max_spend_usdc=1.0, catalog=None):
         super().__init__(client)
+        self.catalog = catalog
         self.min_prob = min_prob
         self.max_prob = max_prob
         self.max_spend_usdc = max_spend_usdc
 
     def run(self):
-        print(f"[{self.__class__.__name__}] Scanning markets...")
+        logger.info("[%s] Scanning markets...", self.__class__.__name__)
         try:
-            markets = self.client.get_active_markets(limit=50)
+            if self.catalog is not None:
+                self.catalog.refresh_if_stale()
+                markets = self.catalog.markets()
+            else:
+                markets = self.client.get_active_markets(limit=50)
             
             # The API response structure for 'markets/active' returns a list of groups/markets.
             # We need to handle the specific structure.
@@ -51,43 +83,61 @@ class SimpleStrategy(BaseStrategy):
                 # Fetch full details/orderbook to make a decision
                 # Optimization: Don't fetch orderbook for every market, filter by basic data first if available.
                 
-                # For this demo, let's pick one random market to analyze to avoid rate limits
-                if random.random() > 0.1: 
-                    continue
-                    
-                print(f"Analyzing market: {slug}")
-                orderbook = self.client.get_orderbook(slug)
-                
-                if not orderbook or 'bids' not in orderbook or 'asks' not in orderbook:
-                    continue
-                    
-                best_bid = float(orderbook['bids'][0]['price']) if orderbook['bids'] else 0
-                best_ask = float(orderbook['asks'][0]['price']) if orderbook['asks'] else 1
-                
-                spread = best_ask - best_bid
-                mid_price = (best_ask + best_bid) / 2 * 100 # Convert to cents
-                
-                print(f"  > Bid: {best_bid}, Ask: {best_ask}, Spread: {spread:.4f}")
-                
-                # Strategy Logic:
-                # If probability (mid price) is within range and spread is tight enough
-                if self.min_prob <= mid_price <= self.max_prob and spread < 0.05:
-                    print(f"  >>> OPPORTUNITY FOUND in {slug}!")
-                    
-                    # Example Action: Place a BUY order slightly better than best bid
-                    # BUT for safety in this demo, we will just LOG it.
-                    # Uncomment below to enable trading.
-                    
-                    # my_price = int(best_bid * 100) + 1 # 1 cent better
-                    # token_id = item['tokens']['yes'] # Assuming structure
-                    # self.client.create_order(slug, token_id, 0, my_price, 10)
+                logger.debug("Analyzing market: %s", slug)
+                self.check_market(slug, self.client.get_orderbook(slug))
                     
         except Exception as e:
-            print(f"Error in strategy run: {e}")
+            logger.exception("Error in strategy run: %s", e)
+
+    async def run_async(self):
+        """Same scan against AsyncLimitlessClient, fetching the orderbooks concurrently."""
+        logger.info("[%s] Scanning markets...", self.__class__.__name__)
+        try:
+            if self.catalog is not None:
+                await self.catalog.refresh_if_stale_async()
+                markets = self.catalog.markets()
+            else:
+                markets = await self.client.get_active_markets(limit=50)
+
+            slugs = [item['slug'] for item in markets if 'slug' in item]
+            orderbooks = await self.client.get_orderbooks(slugs)
+            for slug in slugs:
+                self.check_market(slug, orderbooks.get(slug))
+        except Exception as e:
+            logger.exception("Error in strategy run: %s", e)
+
+    def check_market(self, slug, orderbook):
+        """Look for an opportunity in one market's orderbook snapshot. Returns True if found."""
+        if not orderbook or 'bids' not in orderbook or 'asks' not in orderbook:
+            return False
+            
+        book = OrderBook.from_snapshot(orderbook, slug)
+        best_bid = book.best_bid() if book.best_bid() is not None else 0
+        best_ask = book.best_ask() if book.best_ask() is not None else 1
+        
+        spread = best_ask - best_bid
+        mid_price = (best_ask + best_bid) / 2 * 100 # Convert to cents
+        
+        logger.debug("  > Bid: %s, Ask: %s, Spread: %.4f", best_bid, best_ask, spread)
+        
+        # Strategy Logic:
+        # If probability (mid price) is within range and spread is tight enough
+        if self.min_prob <= mid_price <= self.max_prob and spread < 0.05:
+            logger.info("  >>> OPPORTUNITY FOUND in %s!", slug)
+            
+            # Example Action: Place a BUY order slightly better than best bid
+            # BUT for safety in this demo, we will just LOG it.
+            # Uncomment below to enable trading.
+            
+            # my_price = int(best_bid * 100) + 1 # 1 cent better
+            # token_id = item['tokens']['yes'] # Assuming structure
+            # self.client.create_order(slug, token_id, 0, my_price, 10)
+            return True
+        return False
 
 class RandomStrategy(BaseStrategy):
     """
     A chaos strategy for testing.
     """
     def run(self):
-        print("Random strategy running (doing nothing for safety).")
+        logger.info("Random strategy running (doing nothing for safety).")
@@ -0,0 +1,230 @@
+import math
+import threading
+from array import array
+try:
+    from .config import Config
+except ImportError:
+    from config import Config
+
+# Annualizes both volatility and time to expiry; they must agree, so every
+# module imports it from here. Crypto trades around the clock.
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# Annualized priors, used until a symbol has enough bars of its own
+DEFAULT_VOLATILITY = {
+    "BTCUSDT": 0.6,
+    "ETHUSDT": 0.7,
+    "SOLUSDT": 0.8,
+}
+FALLBACK_VOLATILITY = 0.6
+
+def nearest_horizon(half_lives, time_to_expiry_years):
+    """Index of the half-life closest (in log terms) to the time to expiry."""
+    seconds = max(time_to_expiry_years * SECONDS_PER_YEAR, 1.0)
+    return min(range(len(half_lives)), key=lambda i: abs(math.log(half_lives[i] / seconds)))
+
+class RingBuffer:
+    """Fixed-size array('d') window with O(1) push and rolling sum / sum of squares."""
+    def __init__(self, size):
+        self.size = size
+        self.values = array('d', [0.0] * size)
+        self.count = 0
+        self.head = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, value):
+        if self.count == self.size:
+            old = self.values[self.head]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        self.values[self.head] = value
+        self.total += value
+        self.total_sq += value * value
+        self.head = (self.head + 1) % self.size
+        if self.head == 0:
+            # Re-sum once per lap so add/subtract rounding never accumulates;
+            # amortized this is still O(1) per push
+            window = self.values[:self.count]
+            self.total = math.fsum(window)
+            self.total_sq = math.fsum(v * v for v in window)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def variance(self):
+        """Sample variance of the window."""
+        if self.count < 2:
+            return 0.0
+        mean = self.total / self.count
+        return max(0.0, (self.total_sq - self.count * mean * mean) / (self.count - 1))
+
+class VolatilityEstimator:
+    """
+    Streaming realized volatility for one symbol.
+
+    Ticks are folded into fixed-length OHLC bars. Each closed bar updates,
+    in O(1):
+      - one EWMA of squared log returns per half-life (the horizons),
+      - ring buffers of the Parkinson and Yang-Zhang per-bar terms over
+        the last `window` bars.
+    Memory is bounded by the window size, whatever the tick rate.
+    All estimates are annualized.
+    """
+    def __init__(self, prior=FALLBACK_VOLATILITY, bar_seconds=None, window=None, half_lives=None, min_bars=None):
+        """
+        :param prior: Annualized volatility reported until min_bars bars have closed
+        :param bar_seconds: Bar length in seconds
+        :param window: Number of bars kept for the range-based estimators
+        :param half_lives: EWMA half-lives in seconds, one per horizon
+        :param min_bars: Bars needed before estimates replace the prior
+        """
+        self.prior = prior
+        self.bar_seconds = bar_seconds or Config.VOL_BAR_SECONDS
+        self.window = window or Config.VOL_WINDOW_BARS
+        self.half_lives = tuple(sorted(half_lives or Config.VOL_HALF_LIVES))
+        self.min_bars = min_bars if min_bars is not None else Config.VOL_MIN_BARS
+        self.bars_per_year = SECONDS_PER_YEAR / self.bar_seconds
+
+        # EWMA of per-bar squared returns, seeded with the prior
+        seed = prior * prior / self.bars_per_year
+        self.decays = tuple(0.5 ** (self.bar_seconds / h) for h in self.half_lives)
+        self.ewma = [seed] * len(self.half_lives)
+
+        # Per-bar terms for the range-based estimators
+        self.parkinson_terms = RingBuffer(self.window)   # ln(H/L)^2
+        self.open_returns = RingBuffer(self.window)      # ln(O / previous C)
+        self.close_returns = RingBuffer(self.window)     # ln(C / O)
+        self.rogers_satchell = RingBuffer(self.window)
+
+        self.bars = 0
+        self._bar_index = None
+        self._open = self._high = self._low = self._close = None
+        self._prev_close = None
+
+    def update(self, price, timestamp):
+        """Feed one trade tick."""
+        if price <= 0:
+            return
+        index = int(timestamp // self.bar_seconds)
+        if index != self._bar_index:
+            if self._bar_index is not None:
+                self._close_bar()
+            self._bar_index = index
+            self._open = self._high = self._low = self._close = price
+            return
+        if price > self._high:
+            self._high = price
+        elif price < self._low:
+            self._low = price
+        self._close = price
+
+    def _close_bar(self):
+        o, h, l, c = self._open, self._high, self._low, self._close
+        self.parkinson_terms.push(math.log(h / l) ** 2)
+        self.close_returns.push(math.log(c / o))
+        self.rogers_satchell.push(math.log(h / c) * math.log(h / o) + math.log(l / c) * math.log(l / o))
+        if self._prev_close is not None:
+            self.open_returns.push(math.log(o / self._prev_close))
+            r2 = math.log(c / self._prev_close) ** 2
+            self.ewma = [d * v + (1.0 - d) * r2 for d, v in zip(self.decays, self.ewma)]
+        self._prev_close = c
+        self.bars += 1
+
+    def is_warm(self):
+        return self.bars >= self.min_bars
+
+    def ewma_volatility(self, horizon=0):
+        """Annualized EWMA volatility for the horizon at that index of half_lives."""
+        if not self.is_warm():
+            return self.prior
+        return math.sqrt(self.ewma[horizon] * self.bars_per_year)
+
+    def parkinson(self):
+        """Annualized Parkinson (high-low range) volatility over the window."""
+        if not self.is_warm():
+            return self.prior
+        return math.sqrt(self.parkinson_terms.mean() / (4.0 * math.log(2.0)) * self.bars_per_year)
+
+    def yang_zhang(self):
+        """Annualized Yang-Zhang volatility over the window."""
+        n = len(self.open_returns)
+        if not self.is_warm() or n < 2:
+            return self.prior
+        k = 0.34 / (1.34 + (n + 1) / (n - 1))
+        variance = (
+            self.open_returns.variance()
+            + k * self.close_returns.variance()
+            + (1.0 - k) * self.rogers_satchell.mean()
+        )
+        return math.sqrt(max(0.0, variance) * self.bars_per_year)
+
+    def horizon_for(self, time_to_expiry_years):
+        """Index of the EWMA half-life closest (in log terms) to the time to expiry."""
+        return nearest_horizon(self.half_lives, time_to_expiry_years)
+
+    def volatility(self, time_to_expiry_years):
+        """
+        Annualized volatility for pricing a market with this time to expiry.
+        Expiries inside the bar window use Yang-Zhang, which makes the most
+        of intrabar ranges; longer ones use the EWMA with the nearest
+        half-life.
+        """
+        if not self.is_warm():
+            return self.prior
+        if time_to_expiry_years * SECONDS_PER_YEAR <= len(self.close_returns) * self.bar_seconds:
+            return self.yang_zhang()
+        return self.ewma_volatility(self.horizon_for(time_to_expiry_years))
+
+    def state(self):
+        """
+        (window_seconds, yang_zhang, [ewma per horizon]): everything
+        volatility() chooses from, for publishing to other processes.
+        Before warm-up every estimate is the prior and the window is empty.
+        """
+        if not self.is_warm():
+            return 0.0, self.prior, [self.prior] * len(self.half_lives)
+        return (
+            len(self.close_returns) * self.bar_seconds,
+            self.yang_zhang(),
+            [self.ewma_volatility(i) for i in range(len(self.half_lives))],
+        )
+
+class VolatilityEngine:
+    """
+    Realized volatility for every streamed symbol, fed from DataFeed ticks.
+    Symbols are keyed by their Binance pair (e.g. "BTCUSDT").
+    """
+    def __init__(self, priors=None, **estimator_kwargs):
+        """
+        :param priors: Dict of pair -> annualized volatility used before warm-up
+        :param estimator_kwargs: Passed to each VolatilityEstimator
+        """
+        self.priors = priors if priors is not None else DEFAULT_VOLATILITY
+        self.estimator_kwargs = estimator_kwargs
+        self.estimators = {}
+        self._lock = threading.Lock()
+
+    def _estimator(self, pair):
+        estimator = self.estimators.get(pair)
+        if estimator is None:
+            with self._lock:
+                estimator = self.estimators.get(pair)
+                if estimator is None:
+                    prior = self.priors.get(pair, FALLBACK_VOLATILITY)
+                    estimator = self.estimators[pair] = VolatilityEstimator(prior, **self.estimator_kwargs)
+        return estimator
+
+    def update(self, pair, price, timestamp):
+        self._estimator(pair).update(price, timestamp)
+
+    def volatility(self, pair, time_to_expiry_years):
+        estimator = self.estimators.get(pair)
+        if estimator is None:
+            return self.priors.get(pair, FALLBACK_VOLATILITY)
+        return estimator.volatility(time_to_expiry_years)
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analytics import SECONDS_PER_YEAR, ProbabilityEngine, market_deadline, parse_deadline
+
+class TestBatchPricing(unittest.TestCase):
+    def test_matches_scalar_pricing(self):
+        rng = np.random.default_rng(7)
+        spots = rng.uniform(20_000, 120_000, 500)
+        strikes = rng.uniform(20_000, 120_000, 500)
+        expiries = rng.uniform(0.001, 2.0, 500)
+        vols = rng.uniform(0.2, 1.2, 500)
+
+        batch = ProbabilityEngine.calculate_probabilities(spots, strikes, expiries, vols)
+        scalar = [ProbabilityEngine.calculate_probability(*args) for args in zip(spots, strikes, expiries, vols)]
+        np.testing.assert_allclose(batch, scalar, atol=1e-6)
+
+    def test_edge_cases_are_masked(self):
+        probs = ProbabilityEngine.calculate_probabilities(
+            [100.0, 100.0, 100.0, -5.0, 100.0, 100.0],
+            [90.0, 110.0, 90.0, 90.0, 0.0, 90.0],
+            [0.0, -1.0, 0.5, 0.5, 0.5, 0.5],
+            [0.6, 0.6, 0.0, 0.6, 0.6, 0.6],
+        )
+        np.testing.assert_array_equal(probs[:5], [1.0, 0.0, 0.0, 0.0, 0.0])
+        self.assertTrue(0.0 < probs[5] < 1.0)
+
+    def test_broadcasts_single_spot(self):
+        probs = ProbabilityEngine.calculate_probabilities(95_000.0, [80_000, 95_000, 110_000], 0.25, 0.6)
+        self.assertEqual(probs.shape, (3,))
+        self.assertTrue(np.all(np.diff(probs) < 0))
+
+    def test_greeks_match_finite_differences(self):
+        S, K, T, sigma = 95_000.0, 100_000.0, 0.25, 0.6
+        out = ProbabilityEngine.calculate_probabilities(S, K, T, sigma, greeks=True)
+
+        def price(s=S, v=sigma):
+            return ProbabilityEngine.calculate_probability(s, K, T, v)
+
+        h = 1.0
+        self.assertAlmostEqual(out["delta"], (price(S + h) - price(S - h)) / (2 * h), places=8)
+        self.assertAlmostEqual(out["gamma"], (price(S + h) - 2 * price() + price(S - h)) / h ** 2, places=9)
+        self.assertAlmostEqual(out["vega"], (price(v=sigma + 1e-5) - price(v=sigma - 1e-5)) / 2e-5, places=4)
+
+class TestTimeToExpiry(unittest.TestCase):
+    DEADLINE = "2024-12-31T00:00:00Z"
+    EPOCH = 1735603200.0
+
+    def test_parses_iso_formats(self):
+        self.assertEqual(parse_deadline(self.DEADLINE), self.EPOCH)
+        self.assertEqual(parse_deadline("2024-12-31T01:00:00+01:00"), self.EPOCH)
+        self.assertEqual(parse_deadline("2024-12-31T00:00:00"), self.EPOCH)
+        for bad in ("", None, "soon", 123):
+            self.assertIsNone(parse_deadline(bad))
+
+    def test_deadline_is_cached_on_market(self):
+        market = {"slug": "m", "deadline": self.DEADLINE}
+        self.assertEqual(market_deadline(market), self.EPOCH)
+        market["deadline"] = "garbage"
+        self.assertEqual(market_deadline(market), self.EPOCH)
+        self.assertIsNone(market_deadline({"slug": "n"}))
+
+    def test_scalar_accepts_iso_or_epoch(self):
+        now = self.EPOCH - SECONDS_PER_YEAR / 2
+        self.assertAlmostEqual(ProbabilityEngine.get_time_to_expiry(self.DEADLINE, now=now), 0.5)
+        self.assertAlmostEqual(ProbabilityEngine.get_time_to_expiry(self.EPOCH, now=now), 0.5)
+        self.assertEqual(ProbabilityEngine.get_time_to_expiry(self.EPOCH, now=self.EPOCH + 1), 0.0)
+        self.assertEqual(ProbabilityEngine.get_time_to_expiry("soon", now=now), 0.0)
+
+    def test_batch_matches_scalar(self):
+        now = self.EPOCH - SECONDS_PER_YEAR
+        deadlines = [self.EPOCH, self.EPOCH - SECONDS_PER_YEAR / 4, now - 60, None, float("nan")]
+        years = ProbabilityEngine.get_times_to_expiry(deadlines, now=now)
+        np.testing.assert_allclose(years, [1.0, 0.75, 0.0, 0.0, 0.0])
+        for deadline, expected in zip(deadlines[:3], years):
+            self.assertAlmostEqual(ProbabilityEngine.get_time_to_expiry(deadline, now=now), expected)
+        np.testing.assert_allclose(ProbabilityEngine.get_times_to_expiry([self.DEADLINE, "soon"], now=now), [1.0, 0.0])
+        np.testing.assert_allclose(ProbabilityEngine.get_times_to_expiry(np.array(deadlines[:3]), now=now), years[:3])
+
+if __name__ == '__main__':
+    unittest.main()
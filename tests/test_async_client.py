@@ -0,0 +1,156 @@
+import asyncio
+import unittest
+import os
+import sys
+import time
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from aiohttp import web
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from async_client import AsyncLimitlessClient
+from api_client import diff_quotes
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttled_once = False
+
+        async def orderbook(request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.05)
+            self.in_flight -= 1
+            slug = request.match_info['slug']
+            if slug == "flaky" and not self.throttled_once:
+                self.throttled_once = True
+                return web.Response(status=429, headers={"Retry-After": "0"})
+            if slug == "missing":
+                return web.Response(status=404)
+            return web.json_response({"bids": [], "asks": [{"price": "0.5", "size": "10"}], "slug": slug})
+
+        self.posted = []
+        self.cancelled = []
+        self.resting = [
+            {"id": "keep", "tokenId": "1", "side": "BUY", "price": 0.45, "remainingSize": 10},
+            {"id": "stale", "tokenId": "1", "side": "SELL", "price": 0.60, "remainingSize": 10},
+        ]
+
+        async def post_order(request):
+            body = await request.json()
+            self.posted.append(body)
+            if body["order"]["takerAmount"] == 0:
+                return web.json_response({"message": "amount too small"}, status=400)
+            return web.json_response({"id": f"o{len(self.posted)}"}, status=201)
+
+        async def user_orders(request):
+            return web.json_response(self.resting)
+
+        async def cancel_batch(request):
+            self.cancelled.extend((await request.json())["orderIds"])
+            return web.json_response({"cancelled": len(self.cancelled)})
+
+        async def market_details(request):
+            # Only the freshest cookie is accepted
+            if request.cookies.get("limitless_session") != f"cookie-{self.logins}":
+                return web.json_response({"message": "Unauthorized"}, status=401)
+            return web.json_response({"slug": request.match_info['slug']})
+
+        app = web.Application()
+        app.router.add_get('/markets/{slug}', market_details)
+        app.router.add_get('/markets/{slug}/orderbook', orderbook)
+        app.router.add_post('/orders', post_order)
+        app.router.add_get('/markets/{slug}/user-orders', user_orders)
+        app.router.add_post('/orders/cancel-batch', cancel_batch)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        with patch('async_client.LimitlessAuth', MagicMock()):
+            self.client = AsyncLimitlessClient(max_concurrency=10)
+        self.client.api_url = f"http://127.0.0.1:{port}"
+        self.client.auth.get_address.return_value = "0x0000000000000000000000000000000000000001"
+        self.client.auth.user_data = {"id": 7, "rank": {"feeRateBps": 0}}
+        self.client.auth.sign_orders.side_effect = lambda payloads, processes=None: ["0xsig"] * len(payloads)
+        # Start already logged in with cookie-0
+        self.logins = 0
+        self.client.sessions.cookie = "cookie-0"
+        self.client.sessions.expires_at = time.time() + 3600
+        await self.client.start()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_get_orderbooks_fans_out(self):
+        slugs = [f"market-{i}" for i in range(10)]
+        start = time.perf_counter()
+        books = await self.client.get_orderbooks(slugs)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(list(books), slugs)
+        self.assertEqual(books["market-3"]["slug"], "market-3")
+        # Ten 50ms requests should take about one round trip, not ten
+        self.assertLess(elapsed, 0.3)
+
+    async def test_get_orderbooks_respects_concurrency_cap(self):
+        slugs = [f"market-{i}" for i in range(12)]
+        await self.client.get_orderbooks(slugs, max_concurrency=3)
+        self.assertEqual(self.max_in_flight, 3)
+
+    async def test_missing_orderbook_is_none(self):
+        books = await self.client.get_orderbooks(["missing", "market-1"])
+        self.assertIsNone(books["missing"])
+        self.assertIsNotNone(books["market-1"])
+
+    async def test_429_is_retried_after_backoff(self):
+        book = await self.client.get_orderbook("flaky")
+        self.assertEqual(book["slug"], "flaky")
+        self.assertEqual(self.client.limiter.rate_limited, 1)
+
+    async def test_401_relogs_in_and_retries_once(self):
+        self.client._install_cookie("cookie-0")
+        self.logins = 1  # server has moved on; our cookie-0 is stale
+        self.client.auth.login.side_effect = lambda: "cookie-1"
+        self.client.auth.session_expires_at = time.time() + 3600
+
+        details = await self.client.get_market_details("btc")
+        self.assertEqual(details, {"slug": "btc"})
+        self.assertEqual(self.client.sessions.cookie, "cookie-1")
+        self.assertEqual(self.client.auth.login.call_count, 1)
+
+    async def test_create_orders_reports_per_order_results(self):
+        results = await self.client.create_orders([
+            {"market_slug": "m", "token_id": "1", "side": 0, "price_cents": 40, "amount_shares": 5},
+            {"market_slug": "m", "token_id": "1", "side": 0, "price_cents": 40, "amount_shares": 0},
+            {"market_slug": "m", "token_id": "2", "side": 1, "price_cents": 60, "amount_shares": 5},
+        ])
+        self.assertEqual([r["ok"] for r in results], [True, False, True])
+        self.assertIn("400", results[1]["error"])
+        # Every order in a batch gets its own salt
+        self.assertEqual(len({body["order"]["salt"] for body in self.posted}), 3)
+
+    async def test_replace_quotes_only_sends_changes(self):
+        result = await self.client.replace_quotes("m", [
+            {"token_id": "1", "side": 0, "price_cents": 45, "amount_shares": 10},
+            {"token_id": "1", "side": 1, "price_cents": 58, "amount_shares": 10},
+        ])
+        self.assertEqual([o["id"] for o in result["kept"]], ["keep"])
+        self.assertEqual(self.cancelled, ["stale"])
+        self.assertEqual(len(self.posted), 1)
+        self.assertEqual(self.posted[0]["order"]["side"], 1)
+        self.assertTrue(result["placed"][0]["ok"])
+
+class TestDiffQuotes(unittest.TestCase):
+    def test_size_change_replaces_order(self):
+        resting = [{"id": "a", "tokenId": "1", "side": 0, "price": "0.50", "size": "10"}]
+        keep, cancel, place = diff_quotes(resting, [{"token_id": 1, "side": 0, "price_cents": 50, "amount_shares": 20}])
+        self.assertEqual((keep, [o["id"] for o in cancel], len(place)), ([], ["a"], 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backtester import Backtester, SimClock, SimulatedClient, crypto_strategy_factory, load_events, run_sweep
+
+START = 1_700_000_000.0  # 2023-11-14
+
+MARKET = {
+    "slug": "bitcoin-above-50k",
+    "title": "Bitcoin above $50,000 by Dec 1 2023",
+    "deadline": "2023-12-01T00:00:00Z",
+    "tokens": {"yes": "1", "no": "2"},
+}
+BOOK = {"bids": [{"price": "0.49", "size": "100"}], "asks": [{"price": "0.50", "size": "100"}]}
+
+def recording():
+    events = [
+        {"ts": START, "type": "markets", "markets": [MARKET]},
+        {"ts": START, "type": "orderbook", "slug": MARKET["slug"], "book": BOOK},
+    ]
+    events += [{"ts": START + i, "type": "price", "pair": "BTCUSDT", "price": 95000.0 + i} for i in range(0, 60, 5)]
+    events.append({"ts": START + 120, "type": "resolution", "slug": MARKET["slug"], "outcome": "YES"})
+    return events
+
+class TestSimulatedClient(unittest.TestCase):
+    def setUp(self):
+        self.client = SimulatedClient(SimClock(START), starting_cash=100.0)
+        self.client.load_markets([MARKET])
+        self.client.load_orderbook(MARKET["slug"], {
+            "bids": [{"price": "0.40", "size": "10"}, {"price": "0.38", "size": "10"}],
+            "asks": [{"price": "0.45", "size": "10"}, {"price": "0.50", "size": "10"}],
+        })
+
+    def test_buy_walks_levels_up_to_limit(self):
+        response = self.client.create_order(MARKET["slug"], "1", 0, 45, 15)
+        self.assertEqual(response["status"], "PARTIAL")
+        self.assertEqual(response["filledSize"], 10)
+        self.assertAlmostEqual(self.client.cash, 95.5)
+        # The taken level stays gone until the next snapshot
+        self.assertEqual(self.client.get_orderbook(MARKET["slug"])["asks"], [{"price": 0.5, "size": 10.0}])
+
+    def test_buy_no_hits_yes_bids(self):
+        response = self.client.create_order(MARKET["slug"], "2", 0, 62, 20)
+        self.assertEqual(response["filledSize"], 20)
+        # NO costs 1 - 0.40 and 1 - 0.38
+        self.assertAlmostEqual(self.client.cash, 100.0 - 6.0 - 6.2)
+        self.client.resolve(MARKET["slug"], "NO")
+        self.assertAlmostEqual(self.client.cash, 100.0 - 12.2 + 20)
+
+class TestBacktester(unittest.TestCase):
+    def test_replay_trades_and_settles(self):
+        result = Backtester(crypto_strategy_factory, interval=10).run(recording())
+        self.assertEqual(result["events"], 15)
+        self.assertGreater(result["runs"], 5)
+        # Half-Kelly capped at 5% of $1000 buys 100 YES at 0.50; the book
+        # is then empty, so later runs find nothing to fill
+        self.assertEqual(result["fills"], 1)
+        self.assertAlmostEqual(result["pnl"], 50.0)
+        self.assertGreater(result["speedup"], 1.0)
+
+    def test_sweep_over_process_pool(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recording.jsonl")
+            with open(path, "w") as f:
+                for event in recording():
+                    f.write(json.dumps(event) + "\n")
+            self.assertEqual(len(list(load_events(path))), 15)
+
+            results = run_sweep(path, {"kelly_fraction": [0.5, 0.02], "min_confidence": [0.8]}, processes=2)
+        self.assertEqual([r["params"]["kelly_fraction"] for r in results], [0.5, 0.02])
+        # A smaller Kelly fraction takes the same 100 shares in 40-share clips
+        self.assertEqual([r["fills"] for r in results], [1, 3])
+        self.assertAlmostEqual(results[1]["pnl"], 50.0)
+
+if __name__ == '__main__':
+    unittest.main()
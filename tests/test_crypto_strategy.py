@@ -0,0 +1,177 @@
+import asyncio
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from orderbook import OrderBook
+from strategies.crypto_strategy import CryptoPriceStrategy
+
+DEADLINE = "2099-01-01T00:00:00Z"
+
+class FakeFeed:
+    def get_crypto_price(self, symbol):
+        return 95_000.0 if symbol == "BTC" else None
+
+    def get_volatility(self, symbol, time_to_expiry_years):
+        return 0.6
+
+def market(slug, strike, prices=None, liquidity=None):
+    item = {"slug": slug, "title": f"Bitcoin above ${strike:,}?", "deadline": DEADLINE}
+    if prices is not None:
+        item["prices"] = prices
+    if liquidity is not None:
+        item["liquidity"] = liquidity
+    return item
+
+class TestMispricingScan(unittest.TestCase):
+    def setUp(self):
+        self.strategy = CryptoPriceStrategy(None, data_feed=FakeFeed(), top_k=3)
+        # Pin the clock so model probabilities don't drift with the date
+        self.strategy.clock = lambda: 4_070_908_800.0 - 30 * 86400
+
+    def probability(self, strike):
+        return self.strategy.evaluate_markets([market("probe", strike, prices=[0, 100])])[0]["true_prob"]
+
+    def test_near_the_money_mispricing_is_examined(self):
+        fair = self.probability(95_000)
+        self.assertLess(abs(fair - 0.5), 0.3)
+        underpriced = market("atm", 95_000, prices=[round((fair - 0.2) * 100, 1), round((1.2 - fair) * 100, 1)])
+        fairly_priced = market("atm-fair", 95_000, prices=[round(fair * 100, 1), round((1 - fair) * 100, 1)])
+        candidates = self.strategy.evaluate_markets([fairly_priced, underpriced])
+        self.assertEqual([c["item"]["slug"] for c in candidates], ["atm"])
+        self.assertAlmostEqual(candidates[0]["expected_edge"], 0.2, places=2)
+
+    def test_ranks_by_edge_times_liquidity_and_keeps_top_k(self):
+        items = [
+            market("deep", 95_000, prices=[0, 100], liquidity=10_000),
+            market("thin", 95_000, prices=[0, 100], liquidity=10),
+            market("no-liquidity-hint", 95_000, prices=[0, 100]),
+            market("no-hint-deep-itm", 50_000),
+            market("no-hint-atm", 95_000),
+        ]
+        candidates = self.strategy.evaluate_markets(items)
+        slugs = [c["item"]["slug"] for c in candidates]
+        # Same edge on the hinted ones, so liquidity decides; unknown liquidity
+        # counts as the median (5005) and the unhinted ITM market as priced at 0.5
+        self.assertEqual(slugs, ["deep", "no-hint-deep-itm", "no-liquidity-hint"])
+        self.assertEqual(candidates, sorted(candidates, key=lambda c: -c["score"]))
+
+        self.strategy.top_k = None
+        slugs = [c["item"]["slug"] for c in self.strategy.evaluate_markets(items)]
+        # At the money with no hint still needs min_confidence
+        self.assertNotIn("no-hint-atm", slugs)
+        self.assertEqual(len(slugs), 4)
+
+    def test_cached_book_beats_listing_hint(self):
+        fair = self.probability(95_000)
+        item = market("btc", 95_000, prices=[round(fair * 100, 1), round((1 - fair) * 100, 1)])
+        self.assertEqual(self.strategy.evaluate_markets([item]), [])
+        self.strategy.books["btc"] = OrderBook.from_snapshot({
+            "bids": [{"price": 0.01, "size": 100}],
+            "asks": [{"price": round(fair - 0.3, 2), "size": 100}],
+        })
+        self.strategy.book_times["btc"] = self.strategy.clock()
+        bid, ask, liquidity = self.strategy.price_hint(item)
+        self.assertEqual((bid, ask), (0.01, round(fair - 0.3, 2)))
+        self.assertAlmostEqual(liquidity, 1.0 + ask * 100)
+        self.assertEqual(len(self.strategy.evaluate_markets([item])), 1)
+
+    def test_stale_book_falls_back_to_listing_hint(self):
+        fair = self.probability(95_000)
+        listed = round(fair * 100, 1)
+        item = market("btc", 95_000, prices=[listed, round(100 - listed, 1)], liquidity=500)
+        self.strategy.build_signal({"item": item, "parsed": {"direction": "ABOVE"}, "true_prob": fair}, {
+            "bids": [{"price": 0.01, "size": 100}],
+            "asks": [{"price": round(fair - 0.3, 2), "size": 100}],
+        })
+        self.assertEqual(len(self.strategy.evaluate_markets([item])), 1)
+
+        # Dropped out of the top_k scans ago: its old book no longer ranks it
+        now = self.strategy.clock() + self.strategy.book_hint_max_age + 1
+        self.strategy.clock = lambda: now
+        self.assertEqual(self.strategy.price_hint(item), (listed / 100, listed / 100, 500.0))
+        self.assertEqual(self.strategy.evaluate_markets([item]), [])
+
+    def test_old_catalog_listing_ranks_on_confidence(self):
+        # Listed as underpriced at the last full sync, deep in the money since
+        item = market("btc", 50_000, prices=[50, 50], liquidity=500)
+        item["_listed_at"] = self.strategy.clock()
+        self.assertEqual(self.strategy.price_hint(item), (0.5, 0.5, 500.0))
+
+        item["_listed_at"] -= self.strategy.book_hint_max_age + 1
+        self.assertEqual(self.strategy.price_hint(item), (None, None, 500.0))
+        [candidate] = self.strategy.evaluate_markets([item])
+        self.assertAlmostEqual(candidate["expected_edge"], candidate["true_prob"] - 0.5)
+
+class RecordingClient:
+    def __init__(self):
+        self.orders = []
+
+    def create_order(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        self.orders.append((market_slug, token_id, side, price_cents, amount_shares))
+        return {"status": "QUEUED"}
+
+class TestExecution(unittest.TestCase):
+    def test_buy_no_is_sized_at_the_no_price(self):
+        client = RecordingClient()
+        strategy = CryptoPriceStrategy(client, data_feed=FakeFeed(), execute=True)
+        item = market("btc", 95_000)
+        item["tokens"] = {"yes": "1", "no": "2"}
+        candidate = {"item": item, "parsed": {"asset": "BTC", "direction": "ABOVE"}, "true_prob": 0.5,
+                     "time_to_expiry": 0.1}
+        signal = strategy.build_signal(candidate, {
+            "bids": [{"price": 0.89, "size": 10_000}],
+            "asks": [{"price": 0.90, "size": 10_000}],
+        })
+        self.assertEqual(signal["side"], 1)
+        self.assertAlmostEqual(signal["price"], 0.11)
+
+        strategy.execute_signal(signal, 50.0)
+        [(slug, token_id, side, price_cents, shares)] = client.orders
+        self.assertEqual((slug, token_id, side, price_cents), ("btc", "2", 0, 11))
+        # $50 of NO at $0.11, not $50 / the $0.90 YES ask
+        self.assertAlmostEqual(shares, 50.0 / 0.11)
+
+class AsyncFakeClient:
+    """Coroutine-returning stand-in for AsyncLimitlessClient."""
+    def __init__(self, markets, orderbooks):
+        self.markets = markets
+        self.orderbooks = orderbooks
+        self.orders = []
+
+    async def get_active_markets(self, limit=50):
+        return self.markets
+
+    async def get_orderbooks(self, slugs):
+        return {slug: self.orderbooks[slug] for slug in slugs}
+
+    async def create_order(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        await asyncio.sleep(0)
+        if token_id == "bad":
+            raise RuntimeError("rejected")
+        self.orders.append((market_slug, token_id, side, price_cents))
+        return {"id": f"o{len(self.orders)}", "status": "LIVE"}
+
+class TestAsyncExecution(unittest.IsolatedAsyncioTestCase):
+    async def test_run_async_awaits_orders(self):
+        items = [market("bad", 50_000), market("btc", 50_000)]
+        items[0]["tokens"] = {"yes": "bad", "no": "x"}
+        items[1]["tokens"] = {"yes": "1", "no": "2"}
+        book = {"bids": [{"price": 0.49, "size": 10_000}], "asks": [{"price": 0.50, "size": 10_000}]}
+        client = AsyncFakeClient(items, {"bad": book, "btc": book})
+        strategy = CryptoPriceStrategy(client, data_feed=FakeFeed(), execute=True)
+        strategy.clock = lambda: 4_070_908_800.0 - 30 * 86400
+        # Portfolio bookkeeping sees real acks, not coroutines
+        responses = []
+        strategy.on_order_placed = lambda args, response, asset: responses.append(response)
+
+        await strategy.run_async()
+        # The rejected order doesn't stop the rest of the scan
+        self.assertEqual(client.orders, [("btc", "1", 0, 50)])
+        self.assertEqual(responses, [{"id": "o1", "status": "LIVE"}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+import unittest
+import os
+import sys
+import time
+from unittest.mock import patch, MagicMock
+
+import websockets
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_feed import DataFeed
+
+class LocalTradeServer:
+    """Stand-in for the Binance combined trade stream, on a background thread."""
+    def __init__(self):
+        self.ready = threading.Event()
+        self.paths = []
+        self.loop = None
+        self.port = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self.ready.wait(5)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.stop_future.set_result, None)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self._serve())
+
+    async def _handler(self, ws):
+        self.paths.append(ws.request.path if hasattr(ws, "request") else ws.path)
+        for i in range(3):
+            await ws.send(json.dumps({
+                "stream": "btcusdt@trade",
+                "data": {"e": "trade", "s": "BTCUSDT", "p": f"{95000 + i}.50", "q": "0.1"},
+            }))
+        await ws.send(json.dumps({"stream": "ethusdt@trade", "data": {"e": "trade", "s": "ETHUSDT", "p": "3500.0"}}))
+        await ws.wait_closed()
+
+    async def _serve(self):
+        self.stop_future = asyncio.get_running_loop().create_future()
+        async with websockets.serve(self._handler, "127.0.0.1", 0) as server:
+            self.port = list(server.sockets)[0].getsockname()[1]
+            self.ready.set()
+            await self.stop_future
+
+class TestDataFeed(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalTradeServer()
+        self.server.start()
+        self.ticks = []
+        self.feed = DataFeed(
+            ws_url=f"ws://127.0.0.1:{self.server.port}/stream",
+            stale_after=5,
+            on_tick=lambda pair, price, ts: self.ticks.append((pair, price)),
+        )
+
+    def tearDown(self):
+        self.feed.stop_stream()
+        self.server.stop()
+
+    def wait_for_ticks(self, count):
+        deadline = time.time() + 5
+        while len(self.ticks) < count and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_stream_populates_cache(self):
+        self.feed.start_stream(["BTC", "ETH"])
+        self.wait_for_ticks(4)
+
+        self.assertTrue(self.feed.is_streaming())
+        self.assertEqual(self.feed.get_tick("BTC")[0], 95002.5)
+        self.assertEqual(self.server.paths[0], "/stream?streams=btcusdt@trade/ethusdt@trade")
+
+        # Fresh ticks are served from memory without touching REST
+        with patch.object(self.feed.session, 'get') as rest_get:
+            self.assertEqual(self.feed.get_crypto_price("BTC"), 95002.5)
+            self.assertEqual(self.feed.get_crypto_price("eth"), 3500.0)
+            rest_get.assert_not_called()
+
+    def test_stale_tick_falls_back_to_rest(self):
+        self.feed.start_stream(["BTC"])
+        self.wait_for_ticks(3)
+        self.feed.ticks["BTCUSDT"] = (90000.0, time.time() - 60)
+
+        response = MagicMock()
+        response.json.return_value = {"symbol": "BTCUSDT", "price": "96000.00"}
+        with patch.object(self.feed.session, 'get', return_value=response) as rest_get:
+            self.assertEqual(self.feed.get_crypto_price("BTC"), 96000.0)
+            rest_get.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import json
+import logging
+import os
+import queue
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from log import DroppingQueueHandler, get_logger, parse_levels, setup_logging, shutdown_logging, suppressed
+
+class Exploding:
+    """Fails the test if anything tries to format it."""
+    def __str__(self):
+        raise AssertionError("formatted a disabled log record")
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        shutdown_logging()
+        for name in ("test_a", "test_b"):
+            get_logger(name).setLevel(logging.NOTSET)
+
+    def lines(self):
+        shutdown_logging()  # flushes the writer thread
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_json_output_with_extras(self):
+        setup_logging(level="INFO", levels={}, fmt="json", path="", stream=self.stream)
+        get_logger("test_a").info("filled %d @ %.2f", 10, 0.55, extra={"slug": "btc-100k"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            get_logger("test_a").exception("order failed")
+        first, second = self.lines()
+        self.assertEqual(first["logger"], "test_a")
+        self.assertEqual(first["level"], "INFO")
+        self.assertEqual(first["msg"], "filled 10 @ 0.55")
+        self.assertEqual(first["slug"], "btc-100k")
+        self.assertIn("ValueError: boom", second["exc"])
+
+    def test_per_module_levels_and_lazy_formatting(self):
+        setup_logging(level="INFO", levels="test_b=DEBUG", fmt="json", path="", stream=self.stream)
+        get_logger("test_a").debug("hidden %s", Exploding())
+        get_logger("test_b").debug("shown %s", 1)
+        self.assertEqual([line["msg"] for line in self.lines()], ["shown 1"])
+
+    def test_mutable_args_are_captured_at_call_time(self):
+        setup_logging(level="INFO", levels={}, fmt="json", path="", stream=self.stream)
+        parsed = {"asset": "BTC"}
+        get_logger("test_a").info("parsed %s", parsed)
+        parsed["asset"] = "ETH"
+        self.assertEqual(self.lines()[0]["msg"], "parsed {'asset': 'BTC'}")
+
+    def test_suppressed(self):
+        setup_logging(level="INFO", levels={}, fmt="json", path="", stream=self.stream)
+        with suppressed():
+            get_logger("test_a").error("quiet")
+        get_logger("test_a").info("loud")
+        self.assertEqual([line["msg"] for line in self.lines()], ["loud"])
+
+    def test_full_queue_drops_without_blocking(self):
+        handler = DroppingQueueHandler(queue.Queue(1))
+        before = handler.dropped.value
+        for i in range(3):
+            handler.handle(logging.LogRecord("limitless.test_a", logging.INFO, "", 0, "msg %d", (i,), None))
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped.value - before, 2)
+
+    def test_parse_levels(self):
+        self.assertEqual(parse_levels("crypto_strategy=debug, api_client=WARNING,,bad"),
+                         {"crypto_strategy": "DEBUG", "api_client": "WARNING"})
+
+if __name__ == '__main__':
+    unittest.main()
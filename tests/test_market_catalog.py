@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_catalog import MarketCatalog
+
+def market(i, title=None, deadline="2099-01-01T00:00:00Z"):
+    return {"slug": f"m-{i}", "title": title or f"Bitcoin above {i}k", "deadline": deadline}
+
+class FakeClient:
+    """Serves a newest-first listing with ETag support."""
+    def __init__(self, markets):
+        self.markets = markets
+        self.version = 1
+        self.calls = []
+
+    def get_active_markets_page(self, page=1, limit=100, etag=None, last_modified=None):
+        self.calls.append((page, etag))
+        current = f'"v{self.version}"'
+        if etag == current:
+            return None, etag, last_modified
+        start = (page - 1) * limit
+        return {"data": self.markets[start:start + limit]}, current, None
+
+class TestMarketCatalog(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient([market(i) for i in range(25, 0, -1)])
+        self.catalog = MarketCatalog(self.client, page_size=10, refresh_interval=0, full_sync_interval=3600)
+
+    def test_full_sync_pages_everything(self):
+        self.catalog.refresh()
+        self.assertEqual(len(self.catalog), 25)
+        self.assertEqual([page for page, _ in self.client.calls], [1, 2, 3])
+
+    def test_unchanged_listing_costs_one_conditional_request(self):
+        self.catalog.refresh()
+        self.client.calls.clear()
+        self.catalog.refresh()
+        self.assertEqual(self.client.calls, [(1, '"v1"')])
+
+    def test_delta_refresh_stops_at_known_market(self):
+        self.catalog.refresh()
+        self.client.markets = [market(27), market(26)] + self.client.markets
+        self.client.version = 2
+        self.client.calls.clear()
+
+        added = []
+        self.catalog.subscribe(on_add=lambda m: added.append(m["slug"]))
+        self.catalog.refresh()
+
+        self.assertEqual(added, ["m-27", "m-26"])
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(len(self.catalog), 27)
+
+    def test_indexes_by_asset_and_deadline(self):
+        self.client.markets = [
+            market(1, "Bitcoin above 100k", "2030-01-01T00:00:00Z"),
+            market(2, "Ethereum above 5k", "2030-06-01T00:00:00Z"),
+            market(3, "Who wins the election?", "2031-01-01T00:00:00Z"),
+            market(4, "Solana below $100", "2000-01-01T00:00:00Z"),
+        ]
+        self.catalog.full_sync()
+
+        self.assertEqual([m["slug"] for m in self.catalog.markets(assets=("ETH",))], ["m-2"])
+        soon = self.catalog.expiring_between(0, time.mktime((2030, 12, 31, 0, 0, 0, 0, 0, 0)))
+        self.assertEqual([m["slug"] for m in soon], ["m-4", "m-1", "m-2"])
+
+        removed = []
+        self.catalog.subscribe(on_remove=removed.append)
+        self.assertEqual(self.catalog.prune_expired(), 1)
+        self.assertEqual(removed, ["m-4"])
+        self.assertEqual(self.catalog.markets(assets=("SOL",)), [])
+
+    def test_full_sync_drops_closed_markets(self):
+        self.catalog.full_sync()
+        self.client.markets = self.client.markets[1:]
+        removed = []
+        self.catalog.subscribe(on_remove=removed.append)
+        self.catalog.full_sync()
+        self.assertEqual(removed, ["m-25"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from market_catalog import MarketCatalog
+from market_index import MarketIndex, entities, normalize_key
+from strategies.latency_strategy import LatencyArbitrageStrategy
+
+def market(slug, title, yes="1", no="2"):
+    return {"slug": slug, "title": title, "tokens": {"yes": yes, "no": no}}
+
+MARKETS = [
+    market("biden-nominee", "Will Joe Biden be the Democratic nominee?", "11", "12"),
+    market("biden-debate", "Will Joe Biden attend the debate?", "21", "22"),
+    market("trump-nominee", "Will Donald Trump be the Republican nominee?", "31", "32"),
+    market("btc-100k", "Bitcoin above $100,000 on Friday?", "41", "42"),
+]
+
+class TestMarketIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MarketIndex()
+        for m in MARKETS:
+            self.index.add(m)
+
+    def test_normalization(self):
+        self.assertEqual(normalize_key("Joe Biden's"), "joe biden")
+        self.assertEqual(normalize_key("  The NOMINEE! "), "nominee")
+        self.assertEqual(entities("Will Joe Biden attend the debate?"), ["joe biden"])
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("Biden"), {"biden-nominee", "biden-debate"})
+        self.assertEqual(self.index.lookup("Joe Biden"), {"biden-nominee", "biden-debate"})
+        self.assertEqual(self.index.lookup("biden nominee"), {"biden-nominee"})
+        self.assertEqual(self.index.lookup("nominee"), {"biden-nominee", "trump-nominee"})
+        self.assertEqual(self.index.lookup("biden bitcoin"), set())
+        self.assertEqual(self.index.lookup("the"), set())
+        self.assertEqual(self.index.token_id("btc-100k", "no"), "42")
+
+    def test_remove_cleans_postings(self):
+        version = self.index.version
+        self.index.remove("biden-debate")
+        self.assertEqual(self.index.lookup("Biden"), {"biden-nominee"})
+        self.assertNotIn("debate", self.index.postings)
+        self.assertGreater(self.index.version, version)
+        self.assertEqual(len(self.index), 3)
+
+    def test_follows_catalog(self):
+        catalog = MarketCatalog(MagicMock())
+        catalog._add(dict(MARKETS[0]))
+        index = MarketIndex()
+        index.attach(catalog)
+        self.assertEqual(index.lookup("biden"), {"biden-nominee"})
+        catalog._add(dict(MARKETS[2]))
+        catalog._remove("biden-nominee")
+        self.assertEqual(index.lookup("nominee"), {"trump-nominee"})
+
+class TestLatencyArbitrageStrategy(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.build_order_payload.side_effect = lambda slug, token, side, price, shares: {
+            "slug": slug, "token": token, "price": price, "shares": shares,
+        }
+        rules = [{"keyword": "Biden", "action": "dropout", "outcome": "NO", "price_cents": 90, "shares": 10}]
+        self.strategy = LatencyArbitrageStrategy(self.client, rules=rules, execute=True)
+        for m in MARKETS:
+            self.strategy.index.add(m)
+        self.strategy.run()
+
+    def test_orders_are_signed_before_news(self):
+        self.assertEqual(self.client.build_order_payload.call_count, 2)
+        self.client.submit_order.assert_not_called()
+
+    def test_news_submits_armed_orders(self):
+        self.strategy.on_event("news", {"keyword": "biden", "action": "Dropout"})
+        submitted = sorted(call.args[0]["token"] for call in self.client.submit_order.call_args_list)
+        self.assertEqual(submitted, ["12", "22"])
+        self.assertEqual(self.client.build_order_payload.call_count, 2)
+        self.assertLess(self.strategy.last_match_latency, 1e-3)
+
+    def test_rule_fires_once_per_market(self):
+        self.strategy.on_event("news", {"keyword": "Biden", "action": "dropout", "headline": "Biden drops out"})
+        # The scheduler runs the strategy right after every news event
+        self.strategy.run()
+        self.strategy.on_event("news", {"keyword": "Biden", "action": "dropout", "headline": "Biden quits race"})
+        self.strategy.run()
+        self.assertEqual(self.client.submit_order.call_count, 2)
+        self.assertEqual(self.client.build_order_payload.call_count, 2)
+
+        # A market that starts matching later is still armed, and fires once
+        self.strategy.index.add(market("biden-vp", "Will Joe Biden pick a VP?", "51", "52"))
+        self.strategy.run()
+        self.strategy.on_event("news", {"keyword": "Biden", "action": "dropout"})
+        self.assertEqual(self.client.submit_order.call_args.args[0]["token"], "52")
+        self.assertEqual(self.client.submit_order.call_count, 3)
+
+    def test_unmatched_news_is_kept_but_ignored(self):
+        self.strategy.on_event("news", {"keyword": "Trump", "action": "dropout"})
+        self.client.submit_order.assert_not_called()
+        self.assertEqual(len(self.strategy.news_buffer), 1)
+
+    def test_closed_market_is_disarmed(self):
+        self.strategy.index.remove("biden-debate")
+        self.strategy.run()
+        self.strategy.on_event("news", {"keyword": "Biden", "action": "dropout"})
+        self.assertEqual(self.client.submit_order.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
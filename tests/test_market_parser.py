@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import market_parser
+from market_parser import MarketParser, parse_title
+
+class TestParseTitle(unittest.TestCase):
+    def test_directions_and_suffixes(self):
+        cases = {
+            "Bitcoin above $50,000 by Dec 31 2024": ("BTC", "ABOVE", 50_000.0),
+            "Bitcoin above 100k by 2024": ("BTC", "ABOVE", 100_000.0),
+            "Will ETH be below $2,500.50 on Friday?": ("ETH", "BELOW", 2_500.5),
+            "BTC over 1.2m this cycle?": ("BTC", "ABOVE", 1_200_000.0),
+            "Solana under $0.5b market cap": ("SOL", "BELOW", 500_000_000.0),
+        }
+        for title, (asset, direction, strike) in cases.items():
+            parsed = parse_title(title)
+            self.assertEqual((parsed["asset"], parsed["direction"], parsed["strike"]), (asset, direction, strike), title)
+
+    def test_between(self):
+        parsed = parse_title("SOL between $175 and $150 on May 1")
+        self.assertEqual(parsed, {"asset": "SOL", "strike": 150.0, "strike_high": 175.0, "direction": "BETWEEN"})
+
+    def test_unparseable(self):
+        self.assertIsNone(parse_title("Will Bitcoin hit $100k?"))
+        self.assertIsNone(parse_title("Whether it rains above 5 inches"))
+
+class TestMarketParser(unittest.TestCase):
+    def test_memoizes_including_negative_results(self):
+        parser = MarketParser()
+        with patch.object(market_parser, 'parse_title', wraps=parse_title) as spy:
+            for _ in range(3):
+                parser.parse("Bitcoin above 100k by 2024", "btc-100k")
+                parser.parse("Who wins the election?", "election")
+            self.assertEqual(spy.call_count, 2)
+        self.assertEqual((parser.hits, parser.misses), (4, 2))
+
+    def test_title_change_reparses(self):
+        parser = MarketParser()
+        parser.parse("Bitcoin above 100k by 2024", "btc")
+        self.assertEqual(parser.parse("Bitcoin above 120k by 2024", "btc")["strike"], 120_000.0)
+
+    def test_retain_evicts_closed_markets(self):
+        parser = MarketParser()
+        parser.parse("Bitcoin above 100k", "a")
+        parser.parse("Ethereum above 5k", "b")
+        parser.retain(["b"])
+        self.assertEqual(list(parser.cache), ["b"])
+
+if __name__ == '__main__':
+    unittest.main()
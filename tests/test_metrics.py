@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import sys
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import Histogram, MetricsRegistry, MetricsServer, bucket_index, bucket_value, route
+
+class TestHistogram(unittest.TestCase):
+    def test_bucket_error_is_bounded(self):
+        for value in (0, 1, 31, 32, 33, 100, 999, 12345, 10**6 + 7, 3 * 10**9, 2**62):
+            estimate = bucket_value(bucket_index(value))
+            self.assertLessEqual(abs(estimate - value), max(0.5, value * 0.035), value)
+
+    def test_quantiles(self):
+        h = Histogram()
+        for value in range(1, 10001):
+            h.record(value * 1000)  # 1us .. 10ms
+        self.assertEqual(h.count, 10000)
+        self.assertAlmostEqual(h.quantile(0.5) / 5e6, 1.0, delta=0.04)
+        self.assertAlmostEqual(h.quantile(0.99) / 9.9e6, 1.0, delta=0.04)
+        # max is the upper edge of its bucket, never an underestimate
+        self.assertTrue(1e7 <= h.max <= 1.07e7)
+        self.assertAlmostEqual(h.mean(), 5000.5 * 1000)
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_same_labels_same_metric(self):
+        a = self.registry.counter("requests_total", endpoint="/orders", method="POST")
+        b = self.registry.counter("requests_total", method="POST", endpoint="/orders")
+        self.assertIs(a, b)
+        self.assertIsNot(a, self.registry.counter("requests_total", endpoint="/markets"))
+        with self.assertRaises(ValueError):
+            self.registry.timer("requests_total", endpoint="/orders", method="POST")
+
+    def test_decorators_time_sync_and_async(self):
+        timer = self.registry.timer("work_seconds")
+
+        @timer
+        def work():
+            return 1
+
+        @timer
+        async def work_async():
+            await asyncio.sleep(0)
+            return 2
+
+        self.assertEqual(work(), 1)
+        self.assertEqual(asyncio.run(work_async()), 2)
+        self.assertEqual(timer.histogram.count, 2)
+
+    def test_exports(self):
+        self.registry.counter("http_requests_total", endpoint='/a"b').inc(3)
+        timer = self.registry.timer("http_request_seconds", endpoint="/orders")
+        timer.record(0.25)
+        text = self.registry.to_prometheus()
+        self.assertIn("# TYPE http_requests_total counter", text)
+        self.assertIn('http_requests_total{endpoint="/a\\"b"} 3', text)
+        self.assertIn("# TYPE http_request_seconds summary", text)
+        self.assertIn('http_request_seconds_count{endpoint="/orders"} 1', text)
+        self.assertIn('http_request_seconds{endpoint="/orders",quantile="0.99"}', text)
+
+        snapshot = json.loads(self.registry.to_json())
+        entry = snapshot["http_request_seconds"][0]
+        self.assertEqual(entry["labels"], {"endpoint": "/orders"})
+        self.assertAlmostEqual(entry["p50"], 0.25, delta=0.01)
+
+    def test_spans_record_every_section(self):
+        timer = self.registry.timer("noop_seconds")
+        for _ in range(100):
+            with timer.time():
+                with timer.time():
+                    pass
+        self.assertEqual(timer.histogram.count, 200)
+        # Nested spans each got their own Span, both reused afterwards
+        self.assertEqual(len(timer._free), 2)
+
+    @staticmethod
+    def best_per_call(run, n=1000, bound=1e-6, budget=2.0):
+        """
+        Fastest seconds per call over batches of `run(n)`. Keeps sampling
+        for up to `budget` seconds until one batch meets `bound`, so a host
+        going through a slow patch doesn't fail the test.
+        """
+        best = float("inf")
+        deadline = time.perf_counter() + budget
+        while best >= bound and time.perf_counter() < deadline:
+            start = time.perf_counter()
+            run(n)
+            best = min(best, (time.perf_counter() - start) / n)
+        return best
+
+    def test_span_overhead(self):
+        timer = self.registry.timer("noop_seconds")
+        def run(n):
+            for _ in range(n):
+                with timer.time():
+                    pass
+        # Both clock reads included
+        self.assertLess(self.best_per_call(run), 1e-6)
+
+    def test_decorator_overhead(self):
+        timed = self.registry.timer("noop_seconds")(lambda: None)
+        def run(n):
+            for _ in range(n):
+                timed()
+        # Includes the wrapped call itself
+        self.assertLess(self.best_per_call(run), 1e-6)
+
+    def test_record_ns_overhead(self):
+        timer = self.registry.timer("noop_seconds")
+        now = time.perf_counter_ns
+        def run(n):
+            for _ in range(n):
+                began = now()
+                timer.record_ns(now() - began)
+        # Both clock reads included
+        self.assertLess(self.best_per_call(run), 1e-6)
+
+    def test_route_collapses_ids(self):
+        self.assertEqual(route("/markets/btc-100k/orderbook"), "/markets/{id}/orderbook")
+        self.assertEqual(route("/markets/active"), "/markets/active")
+        self.assertEqual(route("/orders/abc123"), "/orders/{id}")
+        self.assertEqual(route("/orders/all/btc-100k"), "/orders/all/{id}")
+
+class TestMetricsServer(unittest.IsolatedAsyncioTestCase):
+    async def fetch(self, port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.decode().partition("\r\n\r\n")
+        return head.split("\r\n")[0], body
+
+    async def test_serves_prometheus_and_json(self):
+        registry = MetricsRegistry()
+        registry.counter("orders_total").inc()
+        server = await MetricsServer(registry, host="127.0.0.1", port=0).start()
+        try:
+            status, body = await self.fetch(server.port, "/metrics")
+            self.assertIn("200", status)
+            self.assertIn("orders_total 1", body)
+            status, body = await self.fetch(server.port, "/metrics.json")
+            self.assertEqual(json.loads(body)["orders_total"][0]["value"], 1)
+            status, _ = await self.fetch(server.port, "/nope")
+            self.assertIn("404", status)
+        finally:
+            await server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import aiohttp
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import auth
+from api_client import LimitlessClient
+from async_client import AsyncLimitlessClient
+from mock_exchange import MockExchange
+from orderbook import OrderBook
+
+KEY = "0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+
+class TestMockExchange(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.key_patcher = patch.object(auth.Config, "PRIVATE_KEY", KEY)
+        self.key_patcher.start()
+        self.exchange = await MockExchange(markets=6).start_async()
+        self.market = self.exchange.markets[0]
+        self.slug = self.market["slug"]
+        self.client = AsyncLimitlessClient()
+        self.client.api_url = self.client.auth.api_url = self.exchange.url
+        await self.client.start()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.exchange.stop_async()
+        self.key_patcher.stop()
+
+    def best(self, side):
+        return getattr(self.exchange.books[self.slug], side).best()
+
+    async def test_marketable_order_fills_against_book(self):
+        ask, size = self.best("asks")
+        balance = self.exchange.balance
+        order = await self.client.create_order(self.slug, self.market["tokens"]["yes"], 0, round(ask * 100), 5)
+        self.assertEqual(order["status"], "MATCHED")
+        self.assertEqual(order["filledSize"], 5)
+        self.assertEqual((await self.client.get_orderbook(self.slug))["asks"][0]["size"], size - 5)
+        self.assertAlmostEqual(self.exchange.balance, balance - 5 * ask)
+        positions = await self.client.get_positions()
+        self.assertEqual([(p["tokenId"], p["size"]) for p in positions], [(self.market["tokens"]["yes"], 5)])
+
+    async def test_resting_order_shows_in_book_and_cancels(self):
+        bid, size = self.best("bids")
+        order = await self.client.create_order(self.slug, self.market["tokens"]["yes"], 0, round(bid * 100), 7)
+        self.assertEqual(order["status"], "LIVE")
+        self.assertEqual([o["id"] for o in await self.client.get_open_orders(self.slug)], [order["id"]])
+        self.assertEqual(self.best("bids"), (bid, size + 7))
+
+        result = await self.client.cancel_orders([order["id"]])
+        self.assertEqual(result["canceled"], [order["id"]])
+        self.assertEqual(await self.client.get_open_orders(self.slug), [])
+        self.assertEqual(self.best("bids"), (bid, size))
+
+    async def test_no_orders_trade_as_the_complement(self):
+        bid, size = self.best("bids")
+        # Buying NO at 1 - bid is selling YES into the best bid
+        order = await self.client.create_order(self.slug, self.market["tokens"]["no"], 0, round((1 - bid) * 100), 3)
+        self.assertEqual(order["status"], "MATCHED")
+        self.assertEqual(self.best("bids"), (bid, size - 3))
+        self.assertEqual(self.exchange.positions[self.market["tokens"]["no"]]["size"], 3)
+
+    async def test_own_resting_order_is_filled_first(self):
+        bid, _ = self.best("bids")
+        resting = await self.client.create_order(self.slug, self.market["tokens"]["yes"], 0, round(bid * 100), 2)
+        await self.client.create_order(self.slug, self.market["tokens"]["yes"], 1, round(bid * 100), 2)
+        self.assertEqual(self.exchange.orders, {})
+        self.assertEqual(self.exchange.positions[self.market["tokens"]["yes"]]["size"], 0)
+        self.assertNotIn(resting["id"], [o["id"] for o in await self.client.get_open_orders(self.slug)])
+
+    async def test_expired_session_relogs_in(self):
+        self.exchange.expire_sessions()
+        self.assertEqual(await self.client.get_open_orders(self.slug), [])
+        self.assertEqual(self.exchange.statuses[401], 1)
+
+    async def test_injected_faults(self):
+        self.exchange.error_rate = 1.0
+        with self.assertRaises(aiohttp.ClientResponseError) as ctx:
+            await self.client.get_orderbook(self.slug)
+        self.assertEqual(ctx.exception.status, 500)
+
+        self.exchange.error_rate = 0.0
+        self.exchange.rate_limit = 1
+        self.exchange.statuses.clear()
+        with patch("async_client.Config.RATE_LIMIT_MAX_RETRIES", 0):
+            statuses = []
+            for _ in range(3):
+                async with await self.client._request("GET", f"/markets/{self.slug}/orderbook") as response:
+                    statuses.append(response.status)
+        self.assertEqual(statuses[0], 200)
+        self.assertIn(429, statuses)
+
+    async def test_websocket_streams_book_deltas(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(self.exchange.ws_url) as ws:
+                await ws.send_json({"type": "subscribe", "markets": [self.slug]})
+                snapshot = await ws.receive_json(timeout=2)
+                self.assertEqual(snapshot["type"], "orderbook")
+                book = OrderBook.from_snapshot(snapshot)
+
+                ask, _ = self.best("asks")
+                await self.client.create_order(self.slug, self.market["tokens"]["yes"], 0, round(ask * 100), 5)
+                delta = await ws.receive_json(timeout=2)
+                self.assertEqual(delta["type"], "delta")
+                book.apply_deltas(delta["changes"])
+                self.assertEqual(book.asks.levels(), self.exchange.books[self.slug].asks.levels())
+                self.assertEqual((await ws.receive_json(timeout=2))["type"], "order")
+
+class TestMockExchangeThread(unittest.TestCase):
+    def test_serves_sync_client_from_background_thread(self):
+        with patch.object(auth.Config, "PRIVATE_KEY", KEY), MockExchange(markets=3) as exchange:
+            client = LimitlessClient()
+            client.api_url = client.auth.api_url = exchange.url
+            try:
+                payload, etag, _ = client.get_active_markets_page(limit=2)
+                self.assertEqual(len(payload["data"]), 2)
+                self.assertIsNone(client.get_active_markets_page(limit=2, etag=etag)[0])
+                self.assertIsNone(client.get_orderbook("missing"))
+                self.assertEqual(client.get_balance(), {"balance": 1000.0})
+            finally:
+                client.close()
+
+if __name__ == '__main__':
+    unittest.main()
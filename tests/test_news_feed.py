@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from metrics import MetricsRegistry
+from news_feed import DropOldestQueue, FileNewsSource, NewsPipeline, SocketNewsSource, content_hash, parse_news
+
+class TestParsing(unittest.TestCase):
+    def test_parse_and_hash(self):
+        self.assertIsNone(parse_news("not json"))
+        self.assertIsNone(parse_news({"action": "dropout"}))
+        event = parse_news(b'{"keyword": "Biden", "action": "dropout", "timestamp": 1}')
+        self.assertEqual(event["keyword"], "Biden")
+        # Same story from another source, different timestamp
+        self.assertEqual(content_hash(event), content_hash({"keyword": "biden", "action": "Dropout", "timestamp": 2}))
+        self.assertNotEqual(content_hash(event), content_hash({"keyword": "Biden", "action": "wins"}))
+
+class TestNewsPipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_drops_oldest(self):
+        queue = DropOldestQueue(2)
+        for i in range(5):
+            queue.put_nowait(i)
+        self.assertEqual([queue.get_nowait(), queue.get_nowait()], [3, 4])
+        self.assertEqual(queue.dropped, 3)
+
+    async def test_backpressure_keeps_newest(self):
+        delivered = []
+        pipeline = NewsPipeline([], delivered.append, queue_size=3, dedup_ttl=60)
+        for i in range(10):
+            pipeline.ingest({"keyword": f"k{i}"})
+        pipeline.start()
+        await pipeline.drain()
+        await pipeline.stop()
+        self.assertEqual([e["keyword"] for e in delivered], ["k7", "k8", "k9"])
+        self.assertEqual(pipeline.stats()["dropped"], 7)
+
+    async def test_file_replay_dedups_and_measures_latency(self):
+        lines = [
+            {"keyword": "Biden", "action": "dropout", "timestamp": 100},
+            {"keyword": "biden", "action": "dropout", "timestamp": 101},
+            "garbage",
+            {"keyword": "Trump", "action": "wins", "timestamp": 102},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            for line in lines:
+                f.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+        self.addCleanup(os.remove, f.name)
+
+        delivered = []
+        pipeline = NewsPipeline(
+            [FileNewsSource(f.name)], delivered.append, queue_size=10, dedup_ttl=60, registry=MetricsRegistry()
+        )
+        pipeline.start()
+        await asyncio.wait_for(self._until(lambda: len(delivered) == 2), 2)
+        await pipeline.stop()
+
+        self.assertEqual([e["keyword"] for e in delivered], ["Biden", "Trump"])
+        self.assertEqual(delivered[0]["source"], f.name)
+        stats = pipeline.stats()
+        self.assertEqual((stats["received"], stats["invalid"], stats["duplicates"]), (4, 1, 1))
+        self.assertEqual(stats["dispatch_latency"]["count"], 2)
+        self.assertLess(stats["dispatch_latency"]["max"], 0.5)
+        self.assertEqual(stats["source_lag"]["count"], 2)
+
+    async def test_broken_replay_is_not_restarted(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.write(json.dumps({"keyword": "Biden", "action": "dropout", "timestamp": 100}) + "\n")
+            # Pacing parses every line, so this one raises mid-replay
+            f.write("garbage\n")
+        self.addCleanup(os.remove, f.name)
+
+        delivered = []
+        pipeline = NewsPipeline(
+            [FileNewsSource(f.name, speed=1000)], delivered.append, queue_size=10, dedup_ttl=60, registry=MetricsRegistry()
+        )
+        pipeline.start()
+        source_task = pipeline._tasks[1]
+        await asyncio.wait_for(self._until(source_task.done), 2)
+        await pipeline.drain()
+        await pipeline.stop()
+
+        self.assertEqual(pipeline.errors, 1)
+        self.assertEqual(pipeline.stats()["received"], 1)
+        self.assertEqual([e["keyword"] for e in delivered], ["Biden"])
+
+    async def test_socket_source(self):
+        async def serve(reader, writer):
+            writer.write(b'{"keyword": "ETF", "action": "approved"}\n')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        delivered = []
+        pipeline = NewsPipeline([SocketNewsSource("127.0.0.1", port)], delivered.append, queue_size=10, dedup_ttl=60)
+        pipeline.start()
+        await asyncio.wait_for(self._until(lambda: delivered), 2)
+        await pipeline.stop()
+        server.close()
+        await server.wait_closed()
+        self.assertEqual(delivered[0]["action"], "approved")
+
+    @staticmethod
+    async def _until(condition):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+if __name__ == '__main__':
+    unittest.main()
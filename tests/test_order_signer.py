@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import auth as auth_module
+from order_signer import OrderSigner
+
+PRIVATE_KEY = "0x0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef"
+
+class TestOrderSigner(unittest.TestCase):
+    def setUp(self):
+        with patch.object(auth_module.Config, "PRIVATE_KEY", PRIVATE_KEY):
+            self.auth = auth_module.LimitlessAuth()
+        address = self.auth.get_address()
+        self.orders = [{
+            "salt": 1_700_000_000_000 + i,
+            "maker": address,
+            "signer": address,
+            "taker": "0x0000000000000000000000000000000000000000",
+            "tokenId": str(10**70 + i),
+            "makerAmount": 500_000 * i,
+            "takerAmount": 1_000_000,
+            "expiration": str(i),
+            "nonce": i,
+            "feeRateBps": 10 * i,
+            "side": i % 2,
+            "signatureType": 0,
+        } for i in range(6)]
+
+    def test_matches_encode_typed_data(self):
+        for market_type in ("CLOB", "NEGRISK"):
+            for order in self.orders:
+                self.assertEqual(
+                    self.auth.sign_order(order, market_type),
+                    self.auth.sign_order_reference(order, market_type),
+                )
+
+    def test_pure_python_fallback_matches(self):
+        signer = OrderSigner(PRIVATE_KEY)
+        signer._fast_key = None
+        self.assertEqual(signer.sign(self.orders[1]), self.auth.sign_order_reference(self.orders[1]))
+
+    def test_sign_batch_across_processes(self):
+        signer = OrderSigner(PRIVATE_KEY)
+        try:
+            signatures = signer.sign_batch(self.orders, "NEGRISK", processes=2)
+        finally:
+            signer.close()
+        self.assertEqual(signatures, [self.auth.sign_order_reference(o, "NEGRISK") for o in self.orders])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from orderbook import OrderBook
+
+SNAPSHOT = {
+    "bids": [{"price": "0.48", "size": "50"}, {"price": "0.49", "size": "100"}, {"price": "0.45", "size": "200"}],
+    "asks": [{"price": "0.52", "size": "80"}, {"price": "0.50", "size": "100"}, {"price": "0.55", "size": "300"}],
+}
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook.from_snapshot(SNAPSHOT, "btc-100k")
+
+    def test_snapshot_sorted_best_first(self):
+        self.assertEqual(self.book.best_bid(), 0.49)
+        self.assertEqual(self.book.best_ask(), 0.50)
+        self.assertAlmostEqual(self.book.spread(), 0.01)
+        self.assertEqual(self.book.bids.levels(), [(0.49, 100.0), (0.48, 50.0), (0.45, 200.0)])
+
+    def test_deltas(self):
+        self.book.apply_deltas([
+            {"side": "asks", "price": "0.50", "size": "0"},     # remove best ask
+            {"side": "SELL", "price": "0.51", "size": "25"},    # new level
+            {"side": "bids", "price": 0.48, "size": 75},         # resize
+        ])
+        self.assertEqual(self.book.best_ask(), 0.51)
+        self.assertEqual(self.book.depth_at("asks", 0.51), 25.0)
+        self.assertEqual(self.book.depth_at("bids", 0.48), 75.0)
+        self.assertEqual(self.book.depth_at("bids", 0.47), 0.0)
+        with self.assertRaisesRegex(ValueError, "middle"):
+            self.book.apply_delta("middle", 0.5, 1)
+
+    def test_sweep_and_vwap(self):
+        # 150 shares: 100 @ 0.50 + 50 @ 0.52
+        filled, notional, worst = self.book.sweep_cost("asks", 150)
+        self.assertEqual((filled, worst), (150, 0.52))
+        self.assertAlmostEqual(notional, 100 * 0.50 + 50 * 0.52)
+        self.assertAlmostEqual(self.book.vwap("asks", 150), notional / 150)
+
+        # Selling into the bids walks down from 0.49
+        self.assertAlmostEqual(self.book.vwap("bids", 120), (100 * 0.49 + 20 * 0.48) / 120)
+
+    def test_sweep_beyond_book(self):
+        filled, notional, worst = self.book.sweep_cost("asks", 10_000)
+        self.assertEqual((filled, worst), (480, 0.55))
+        self.assertAlmostEqual(notional, 100 * 0.50 + 80 * 0.52 + 300 * 0.55)
+        self.assertAlmostEqual(self.book.liquidity(), notional + 100 * 0.49 + 50 * 0.48 + 200 * 0.45)
+
+    def test_depth_through_and_cache_invalidation(self):
+        self.assertEqual(self.book.asks.depth_through(0.52), 180.0)
+        self.book.apply_delta("asks", 0.51, 20)
+        self.assertEqual(self.book.asks.depth_through(0.52), 200.0)
+        self.assertEqual(self.book.bids.depth_through(0.48), 150.0)
+
+    def test_empty_book(self):
+        book = OrderBook.from_snapshot({"bids": [], "asks": []})
+        self.assertIsNone(book.best_ask())
+        self.assertIsNone(book.vwap("asks", 10))
+        self.assertEqual(book.sweep_cost("bids", 10), (0.0, 0.0, None))
+        self.assertEqual(book.liquidity(), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_limiter import RateLimiter, classify, ORDER, CANCEL, MARKET_DATA
+
+class TestRateLimiter(unittest.TestCase):
+    def make_limiter(self, **kwargs):
+        params = dict(global_rps=10, global_burst=10,
+                      category_rps={ORDER: 10, CANCEL: 10, MARKET_DATA: 10},
+                      priority_reserve=0.3)
+        params.update(kwargs)
+        return RateLimiter(**params)
+
+    def test_classify(self):
+        self.assertEqual(classify("POST", "/orders"), ORDER)
+        self.assertEqual(classify("DELETE", "/orders/abc"), CANCEL)
+        self.assertEqual(classify("POST", "/orders/cancel-batch"), CANCEL)
+        self.assertEqual(classify("GET", "/markets/btc/orderbook"), MARKET_DATA)
+
+    def test_market_data_leaves_reserve_for_orders(self):
+        limiter = self.make_limiter()
+        sent = 0
+        while limiter._try_acquire(MARKET_DATA) == 0.0:
+            sent += 1
+        # 10 burst, 3 reserved: data stops with the reserve still untouched
+        self.assertEqual(sent, 7)
+        self.assertEqual(limiter._try_acquire(ORDER), 0.0)
+        self.assertEqual(limiter._try_acquire(CANCEL), 0.0)
+
+    def test_small_burst_still_admits_market_data(self):
+        for burst in (1.0, 1.1, 1.25, 1.0 + 20 / 17 * 0.2):
+            limiter = self.make_limiter(global_burst=burst, priority_reserve=0.3)
+            self.assertLessEqual(1.0 + limiter.reserve_tokens, burst)
+            self.assertEqual(limiter._try_acquire(MARKET_DATA), 0.0)
+
+    def test_429_pauses_and_slows_down(self):
+        limiter = self.make_limiter()
+        delay = limiter.on_response(429, {"Retry-After": "2"})
+        self.assertGreaterEqual(delay, 2.0)
+        self.assertEqual(limiter.rate_scale, 0.5)
+        self.assertGreater(limiter._try_acquire(ORDER), 1.0)
+        # Successful responses recover the rate gradually
+        limiter.on_response(200, {})
+        self.assertAlmostEqual(limiter.rate_scale, 0.55)
+
+    def test_429_without_headers_backs_off_exponentially(self):
+        limiter = self.make_limiter()
+        first = limiter.on_response(429, {})
+        second = limiter.on_response(429, {})
+        self.assertGreater(second, first)
+        self.assertEqual(limiter.rate_limited, 2)
+
+    def test_remaining_header_caps_tokens(self):
+        limiter = self.make_limiter()
+        limiter.on_response(200, {"X-RateLimit-Remaining": "1"})
+        self.assertEqual(limiter._try_acquire(ORDER), 0.0)
+        self.assertGreater(limiter._try_acquire(ORDER), 0.0)
+
+    def test_acquire_async_waits_for_refill(self):
+        limiter = self.make_limiter(global_rps=50, global_burst=1, priority_reserve=0)
+        async def take_two():
+            start = time.perf_counter()
+            await limiter.acquire_async(ORDER)
+            await limiter.acquire_async(ORDER)
+            return time.perf_counter() - start
+        self.assertGreaterEqual(asyncio.run(take_two()), 0.015)
+        self.assertEqual(limiter.throttled, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from recorder import MarketDataRecorder, RecordingReader, load_recording, recording_days, TICK, SNAPSHOT_LEVEL
+from backtester import Backtester, crypto_strategy_factory
+
+DAY1 = 1_700_006_400.0  # 2023-11-15 00:00:00 UTC
+DAY2 = DAY1 + 86400
+
+MARKET = {
+    "slug": "bitcoin-above-50k",
+    "title": "Bitcoin above $50,000 by Dec 1 2023",
+    "deadline": "2023-12-01T00:00:00Z",
+    "tokens": {"yes": "1", "no": "2"},
+}
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        with MarketDataRecorder(self.dir, flush_interval=0.01) as recorder:
+            recorder.record_market(MARKET, DAY1 + 1)
+            recorder.record_snapshot(MARKET["slug"], {
+                "bids": [{"price": "0.49", "size": "100"}],
+                "asks": [{"price": "0.50", "size": "100"}, {"price": "0.55", "size": "50"}],
+            }, DAY1 + 2)
+            for i in range(10):
+                recorder.record_tick("BTCUSDT", 95000.0 + i, DAY1 + 10 + i)
+            recorder.record_delta(MARKET["slug"], "asks", 0.50, 40, DAY1 + 30)
+            recorder.record_tick("BTCUSDT", 95010.0, DAY1 + 40)
+            # Next UTC day goes to a new file
+            recorder.record_tick("BTCUSDT", 96000.0, DAY2 + 5)
+            recorder.record_tick("BTCUSDT", 96001.0, DAY2 + 6)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rotates_daily_with_fixed_width_records(self):
+        days = recording_days(self.dir)
+        self.assertEqual([os.path.basename(p) for p in days], ["2023-11-15.bin", "2023-11-16.bin"])
+        # market + snapshot header + 3 levels + 11 ticks + delta
+        self.assertEqual(os.path.getsize(days[0]), 17 * 32)
+
+    def test_reader_seeks_by_timestamp(self):
+        reader = RecordingReader(recording_days(self.dir)[0])
+        ticks = reader.between(DAY1 + 12, DAY1 + 15)
+        self.assertEqual(list(ticks["kind"]), [TICK] * 3)
+        self.assertEqual(list(ticks["price"]), [95002.0, 95003.0, 95004.0])
+        self.assertEqual(list(reader.records["kind"][:5]).count(SNAPSHOT_LEVEL), 3)
+
+    def test_events_decode_and_carry_markets_across_days(self):
+        events = list(load_recording(self.dir))
+        kinds = [e["type"] for e in events]
+        self.assertEqual(kinds[:2], ["markets", "orderbook"])
+        self.assertEqual(events[1]["book"]["asks"], [{"price": 0.5, "size": 100.0}, {"price": 0.55, "size": 50.0}])
+        self.assertEqual(events[12], {"ts": DAY1 + 30, "type": "delta", "slug": MARKET["slug"],
+                                      "side": "asks", "price": 0.5, "size": 40.0})
+
+        # Starting on day two still knows the market listed on day one
+        later = list(load_recording(self.dir, start=DAY2))
+        self.assertEqual(later[0]["markets"], [MARKET])
+        self.assertEqual([e["price"] for e in later[1:]], [96000.0, 96001.0])
+
+    def test_recording_replays_through_backtester(self):
+        backtester = Backtester(crypto_strategy_factory, interval=5)
+        backtester.run(load_recording(self.dir, end=DAY1 + 60))
+        # The snapshot's two levels are taken, then the delta puts 40 back at 0.50
+        fills = [(fill["shares"], fill["price"]) for fill in backtester.client.fills]
+        self.assertEqual(fills, [(100.0, 0.5), (50.0, 0.55), (40.0, 0.5)])
+
+    def test_record_is_cheap_for_the_caller(self):
+        recorder = MarketDataRecorder(self.dir)
+        start = time.perf_counter()
+        for i in range(10_000):
+            recorder.record_tick("ETHUSDT", 3500.0, DAY1 + i)
+        per_call = (time.perf_counter() - start) / 10_000
+        self.assertLess(per_call, 50e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from risk_manager import RiskManager
+
+class TestPortfolioKelly(unittest.TestCase):
+    def setUp(self):
+        # No per-bet or exposure caps, so the optimizer's output shows through
+        self.risk = RiskManager(max_portfolio_risk=1.0, kelly_fraction=1.0, max_market_exposure=1.0,
+                                max_asset_exposure=1.0, max_correlated_exposure=1.0)
+
+    def test_single_bet_is_binary_kelly(self):
+        f = self.risk.joint_kelly([0.7], [0.5], ["BTC"], [1])
+        self.assertAlmostEqual(f[0], (0.7 - 0.5) / (1 - 0.5), places=4)
+
+    def test_correlated_strikes_share_one_budget(self):
+        # A dozen "BTC above X" strikes the model likes about equally
+        n = 12
+        p = np.linspace(0.80, 0.85, n)
+        c = p - 0.08
+        correlated = self.risk.joint_kelly(p, c, ["BTC"] * n, [1] * n)
+        independent = self.risk.joint_kelly(p, c, [f"X{i}" for i in range(n)], [1] * n)
+        self.assertTrue((correlated >= 0).all())
+        self.assertLess(correlated.sum(), 0.5 * independent.sum())
+        np.testing.assert_allclose(independent, (p - c) / (1 - c), rtol=1e-4)
+
+    def test_correlation_from_nested_events(self):
+        corr = self.risk.correlation_matrix([0.9, 0.6, 0.6, 0.5], ["BTC", "BTC", "ETH", "BTC"], [1, 1, 1, 0])
+        pi, pj = 0.9, 0.6
+        self.assertAlmostEqual(corr[0, 1], (pj - pi * pj) / np.sqrt(pi * (1 - pi) * pj * (1 - pj)))
+        self.assertAlmostEqual(corr[1, 2], 0.7 * 1.0)
+        self.assertEqual(corr[0, 3], 0.0)
+        self.assertTrue(np.allclose(corr, corr.T))
+
+    def test_limits_scale_groups_down(self):
+        risk = RiskManager(max_portfolio_risk=0.05, kelly_fraction=0.5, max_market_exposure=0.04,
+                           max_asset_exposure=0.25, max_correlated_exposure=0.06)
+        amounts = risk.size_portfolio([0.9, 0.9, 0.9], [0.5, 0.5, 0.5], ["BTC", "ETH", "DOGE"],
+                                      directions=[1, 1, 1], slugs=["a", "b", "c"], equity=1000.0)
+        # BTC and ETH share the 6% group cap; DOGE is outside any group
+        self.assertAlmostEqual(amounts[0] + amounts[1], 60.0)
+        self.assertAlmostEqual(amounts[2], 40.0)
+
+    def test_hundreds_of_candidates_in_milliseconds(self):
+        rng = np.random.default_rng(1)
+        n = 300
+        p = rng.uniform(0.6, 0.95, n)
+        c = p - rng.uniform(0.05, 0.2, n)
+        assets = rng.choice(["BTC", "ETH", "SOL"], n)
+        directions = rng.choice([1, -1], n)
+        self.risk.size_portfolio(p, c, assets, directions, equity=1000.0)
+        start = time.perf_counter()
+        self.risk.size_portfolio(p, c, assets, directions, equity=1000.0)
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
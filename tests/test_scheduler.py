@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scheduler import StrategyScheduler, ThrottledEmitter
+from strategy import BaseStrategy
+
+class CountingStrategy(BaseStrategy):
+    def __init__(self):
+        super().__init__(client=None)
+        self.runs = 0
+        self.events = []
+
+    def run(self):
+        pass
+
+    async def run_async(self):
+        self.runs += 1
+
+    def on_event(self, event, payload):
+        self.events.append((event, payload))
+
+class TestScheduler(unittest.IsolatedAsyncioTestCase):
+    async def run_for(self, scheduler, seconds):
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def test_periodic_cadence(self):
+        scheduler = StrategyScheduler(report_interval=None)
+        strategy = CountingStrategy()
+        scheduler.add_strategy(strategy, interval=0.05)
+        await self.run_for(scheduler, 0.27)
+        # Immediate first run plus one per 50ms slot
+        self.assertTrue(5 <= strategy.runs <= 7, strategy.runs)
+
+    async def test_event_wakes_strategy(self):
+        scheduler = StrategyScheduler(report_interval=None)
+        strategy = CountingStrategy()
+        scheduler.add_strategy(strategy, events=("news",))
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.01)
+        self.assertEqual(strategy.runs, 0)
+
+        scheduler.emit("news", {"keyword": "ETF"})
+        scheduler.emit("price_tick", {"symbol": "BTC"})
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        self.assertEqual(strategy.runs, 1)
+        self.assertEqual(strategy.events, [("news", {"keyword": "ETF"})])
+
+    async def test_throttled_emitter_coalesces_ticks_from_a_thread(self):
+        scheduler = StrategyScheduler(report_interval=None)
+        strategy = CountingStrategy()
+        scheduler.add_strategy(strategy, events=("price_tick",))
+        task = asyncio.create_task(scheduler.run())
+        ticks = ThrottledEmitter(scheduler, asyncio.get_running_loop(), "price_tick", min_interval=60)
+
+        def stream():
+            for i in range(1000):
+                ticks("BTCUSDT", 95_000.0 + i, 1.0)
+
+        thread = threading.Thread(target=stream)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        self.assertEqual(ticks.emitted, 1)
+        self.assertEqual(strategy.runs, 1)
+        self.assertEqual(strategy.events, [("price_tick", ("BTCUSDT", 95_000.0, 1.0))])
+
+    async def test_loop_lag_is_measured(self):
+        scheduler = StrategyScheduler(lag_interval=0.01, report_interval=None)
+
+        class BlockingStrategy(CountingStrategy):
+            async def run_async(self):
+                time.sleep(0.05)
+
+        scheduler.add_strategy(BlockingStrategy(), interval=1.0)
+        await self.run_for(scheduler, 0.1)
+        self.assertGreater(scheduler.stats()["loop_lag"]["max"], 0.02)
+
+    def test_requires_interval_or_events(self):
+        with self.assertRaises(ValueError):
+            StrategyScheduler().add_strategy(CountingStrategy())
+
+if __name__ == '__main__':
+    unittest.main()
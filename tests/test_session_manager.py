@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from session_manager import SessionManager
+
+class FakeAuth:
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+        self.logins = 0
+        self.session_expires_at = 0.0
+
+    def login(self):
+        self.logins += 1
+        self.session_expires_at = time.time() + self.lifetime
+        return f"cookie-{self.logins}"
+
+class TestSessionManager(unittest.TestCase):
+    def test_ensure_logs_in_once_until_expiry(self):
+        auth = FakeAuth(lifetime=3600)
+        installed = MagicMock()
+        sessions = SessionManager(auth, installed, refresh_margin=60)
+
+        self.assertEqual(sessions.ensure(), "cookie-1")
+        self.assertEqual(sessions.ensure(), "cookie-1")
+        installed.assert_called_once_with("cookie-1")
+
+        # Inside the refresh margin counts as expired
+        sessions.issued_at -= 3600
+        sessions.expires_at = time.time() + 30
+        self.assertEqual(sessions.ensure(), "cookie-2")
+
+    def test_stale_cookie_refresh_is_deduplicated(self):
+        auth = FakeAuth(lifetime=3600)
+        sessions = SessionManager(auth, lambda cookie: None, refresh_margin=60)
+        stale = sessions.ensure()
+
+        # Two requests both got a 401 with the same stale cookie
+        threads = [threading.Thread(target=sessions.refresh, kwargs={"stale_cookie": stale}) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(auth.logins, 2)
+
+    def test_background_refresh_before_expiry(self):
+        auth = FakeAuth(lifetime=0.3)
+        sessions = SessionManager(auth, lambda cookie: None, refresh_margin=0.2)
+        sessions.start_background()
+        try:
+            time.sleep(0.4)
+        finally:
+            sessions.stop_background()
+        # Initial login plus at least two renewals; the margin is capped at
+        # half the 0.3s lifetime, so each comes ~0.15s in
+        self.assertGreaterEqual(auth.logins, 3)
+
+    def test_cold_start_logs_in_once(self):
+        auth = FakeAuth(lifetime=3600)
+        login = auth.login
+
+        def slow_login():
+            time.sleep(0.05)
+            return login()
+        auth.login = slow_login
+        sessions = SessionManager(auth, lambda cookie: None, refresh_margin=60)
+        # Client construction starts the background login; the first request
+        # arrives while it is still in flight
+        sessions.start_background()
+        try:
+            time.sleep(0.01)
+            self.assertEqual(sessions.ensure(), "cookie-1")
+            time.sleep(0.05)
+        finally:
+            sessions.stop_background()
+        self.assertEqual(auth.logins, 1)
+
+    def test_ttl_within_margin_does_not_relogin_continuously(self):
+        auth = FakeAuth(lifetime=10)
+        sessions = SessionManager(auth, lambda cookie: None, refresh_margin=300)
+        sessions.start_background()
+        try:
+            time.sleep(0.1)
+            self.assertEqual(sessions.ensure(), "cookie-1")
+        finally:
+            sessions.stop_background()
+        self.assertEqual(auth.logins, 1)
+        self.assertGreater(sessions.seconds_until_refresh(), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import asyncio
+import os
+import queue
+import sys
+import threading
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_limiter import CANCEL, MARKET_DATA
+from sharding import (PRICE, SEQ, GatewayClient, OrderGateway, PricePublisher, Shard, SharedPriceFeed, SharedPrices,
+                      shard_limiter, shard_of)
+from strategies.crypto_strategy import CryptoPriceStrategy
+from volatility import DEFAULT_VOLATILITY, SECONDS_PER_YEAR, VolatilityEngine
+
+def markets(count):
+    return [{"slug": f"bitcoin-above-{i}", "title": f"Bitcoin above ${90_000 + i},000?"} for i in range(count)]
+
+class FakeFeed:
+    SYMBOL_MAP = {"BTC": "BTCUSDT", "ETH": "ETHUSDT", "SOL": "SOLUSDT"}
+
+    def __init__(self, volatility=None):
+        self.volatility = volatility
+        self.ticks = {"BTCUSDT": (95_000.0, time.time())}
+
+    def get_crypto_price(self, symbol):
+        tick = self.ticks.get(self.SYMBOL_MAP[symbol])
+        return tick[0] if tick else None
+
+class TestShard(unittest.TestCase):
+    def test_partitions_are_disjoint_and_cover_the_catalog(self):
+        items = markets(300)
+        shards = [Shard(i, 4) for i in range(4)]
+        slices = [{m["slug"] for m in shard.select(items)} for shard in shards]
+        self.assertEqual(sum(len(s) for s in slices), len(items))
+        self.assertEqual(set().union(*slices), {m["slug"] for m in items})
+        # Roughly balanced
+        self.assertTrue(all(40 < len(s) < 110 for s in slices))
+
+    def test_shard_of_is_stable(self):
+        # Same answer in every process: not Python's salted hash()
+        slugs = ["bitcoin-above-100k", "ethereum-below-3k", "solana-above-200", "bitcoin-between-90k-95k"]
+        self.assertEqual([shard_of({"slug": slug}, 8) for slug in slugs], [0, 1, 3, 5])
+
+    def test_by_asset(self):
+        shard = Shard(1, 3, by="asset")
+        self.assertTrue(shard.owns({"slug": "x", "title": "Ethereum above $4,000?"}))
+        self.assertFalse(shard.owns({"slug": "y", "title": "Bitcoin above $100,000?"}))
+        with self.assertRaises(ValueError):
+            Shard(0, 2, by="title")
+
+    def test_strategy_scans_only_its_shard(self):
+        items = markets(50)
+        shard = Shard(0, 2)
+        strategy = CryptoPriceStrategy(None, data_feed=FakeFeed(), shard=shard)
+        owned = strategy.owned_markets(items)
+        self.assertEqual(owned, [m for m in items if shard_of(m, 2) == 0])
+        # Without a catalog, slugs that left the listing are forgotten
+        strategy.owned_markets(items[:10])
+        self.assertEqual(set(shard.owned), {m["slug"] for m in items[:10]})
+
+    def test_every_shard_limiter_admits_market_data(self):
+        for count in (1, 4, 17, 20, 100):
+            limiter = shard_limiter(count)
+            self.assertEqual(limiter._try_acquire(MARKET_DATA), 0.0, count)
+            self.assertEqual(limiter._try_acquire(CANCEL), 0.0, count)
+
+class TestSharedPrices(unittest.TestCase):
+    def setUp(self):
+        self.prices = SharedPrices(pairs=("BTCUSDT", "ETHUSDT"), horizons=(900, 3600))
+        self.reader = SharedPrices.attach(self.prices.spec())
+
+    def tearDown(self):
+        self.reader.close()
+        self.prices.close()
+
+    def test_attached_reader_sees_published_ticks(self):
+        self.assertIsNone(self.reader.read("BTCUSDT"))
+        now = time.time()
+        self.prices.publish("BTCUSDT", 95_000.0, now, (600.0, 0.55, [0.5, 0.45]))
+        feed = SharedPriceFeed(self.reader, stale_after=5)
+        self.assertEqual(feed.get_crypto_price("BTC"), 95_000.0)
+        self.assertEqual(feed.get_tick("BTC"), (95_000.0, now))
+        self.assertIsNone(feed.get_crypto_price("ETH"))
+        self.assertEqual(feed.get_volatility("ETH", 0.1), DEFAULT_VOLATILITY["ETHUSDT"])
+
+        self.prices.publish("BTCUSDT", 95_000.0, now - 60)
+        self.assertIsNone(feed.get_crypto_price("BTC"))
+
+    def test_volatility_matches_the_estimator(self):
+        engine = VolatilityEngine(bar_seconds=60, window=30, half_lives=(900, 3600), min_bars=5)
+        price, start = 95_000.0, 1_700_000_000
+        for i in range(40 * 60):
+            price *= 1.0005 if (i * 7919) % 13 < 6 else 0.9995
+            engine.update("BTCUSDT", price, start + i)
+        feed = FakeFeed(volatility=engine)
+        PricePublisher(self.prices, feed).publish_all()
+        shared = SharedPriceFeed(self.reader, stale_after=float("inf"))
+        for expiry_seconds in (300, 1800, 7200, 86400):
+            years = expiry_seconds / SECONDS_PER_YEAR
+            self.assertAlmostEqual(shared.get_volatility("BTC", years), engine.volatility("BTCUSDT", years))
+
+    def test_readers_never_see_torn_rows(self):
+        stop = threading.Event()
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                i += 1
+                self.prices.publish("BTCUSDT", float(i), float(i), (float(i), float(i), [float(i)] * 2))
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(5000):
+                row = self.reader.read("BTCUSDT")
+                if row is not None:
+                    self.assertEqual(len(set(row[1:].tolist())), 1)
+        finally:
+            stop.set()
+            writer.join()
+
+    def test_publish_all_leaves_streamed_pairs_alone(self):
+        feed = FakeFeed()
+        publisher = PricePublisher(self.prices, feed, stale_after=5)
+        publisher.on_tick("BTCUSDT", 96_000.0, time.time())
+        publisher.publish_all()
+        self.assertEqual(self.reader.read("BTCUSDT")[PRICE], 96_000.0)
+        # Stream went quiet: the feed's (REST) price takes over
+        publisher.streamed["BTCUSDT"] -= 10
+        publisher.publish_all()
+        self.assertEqual(self.reader.read("BTCUSDT")[PRICE], 95_000.0)
+
+    def test_concurrent_publishers_keep_the_sequence_consistent(self):
+        feed = FakeFeed()
+        publisher = PricePublisher(self.prices, feed, stale_after=0)
+        publishes = 0
+        publish = self.prices.publish
+
+        def counted(*args):
+            nonlocal publishes
+            publishes += 1
+            publish(*args)
+        self.prices.publish = counted
+
+        def stream():
+            for i in range(2000):
+                publisher.on_tick("BTCUSDT", 96_000.0 + i, time.time())
+
+        streamer = threading.Thread(target=stream)
+        streamer.start()
+        for _ in range(2000):
+            publisher.publish_all()
+        streamer.join()
+        self.assertEqual(self.prices.data[self.prices.rows["BTCUSDT"], SEQ], 2 * publishes)
+
+class FakeClient:
+    def __init__(self):
+        self.submitted = []
+
+    def build_order_payload(self, market_slug, token_id, side, price_cents, amount_shares, expiration_ts=0):
+        return {"marketSlug": market_slug, "order": {"tokenId": token_id, "price": price_cents / 100}}
+
+    async def submit_order(self, payload):
+        if payload["order"]["tokenId"] == "bad":
+            raise RuntimeError("rejected")
+        self.submitted.append(payload)
+        return {"id": f"o{len(self.submitted)}", "status": "LIVE"}
+
+class TestOrderGateway(unittest.IsolatedAsyncioTestCase):
+    async def test_worker_orders_are_signed_locally_and_submitted_by_the_gateway(self):
+        orders = queue.Queue()
+        client = FakeClient()
+        worker = GatewayClient(client, orders)
+        self.assertEqual(worker.create_order("btc", "1", 0, 55, 10)["status"], "QUEUED")
+        worker.create_order("btc", "bad", 0, 55, 10)
+
+        gateway = OrderGateway(client, orders, poll_interval=0.05)
+        failed = gateway.failed.value
+        stop = threading.Event()
+        task = asyncio.create_task(gateway.run(stop))
+        for _ in range(100):
+            if client.submitted and gateway.failed.value > failed:
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await task
+        self.assertEqual(client.submitted, [{"marketSlug": "btc", "order": {"tokenId": "1", "price": 0.55}}])
+        self.assertEqual(gateway.failed.value, failed + 1)
+
+if __name__ == '__main__':
+    unittest.main()
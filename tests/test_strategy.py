@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from strategy import SimpleStrategy
+
+TIGHT = {"bids": [{"price": 0.49, "size": 10}], "asks": [{"price": 0.51, "size": 10}]}
+WIDE = {"bids": [{"price": 0.30, "size": 10}], "asks": [{"price": 0.70, "size": 10}]}
+
+class AsyncFakeClient:
+    """Coroutine-returning stand-in for AsyncLimitlessClient."""
+    def __init__(self, orderbooks):
+        self.orderbooks = orderbooks
+        self.fetched = []
+
+    async def get_active_markets(self, limit=50):
+        return [{"slug": slug} for slug in self.orderbooks] + [{"title": "no slug"}]
+
+    async def get_orderbooks(self, slugs):
+        self.fetched.extend(slugs)
+        return {slug: self.orderbooks[slug] for slug in slugs}
+
+class TestSimpleStrategy(unittest.TestCase):
+    def test_check_market(self):
+        strategy = SimpleStrategy(None)
+        self.assertTrue(strategy.check_market("tight", TIGHT))
+        self.assertFalse(strategy.check_market("wide", WIDE))
+        self.assertFalse(strategy.check_market("missing", None))
+
+class TestSimpleStrategyAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_run_async_awaits_the_client(self):
+        client = AsyncFakeClient({"tight": TIGHT, "wide": WIDE, "gone": None})
+        strategy = SimpleStrategy(client)
+        found = []
+        check_market = strategy.check_market
+        strategy.check_market = lambda slug, book: found.append(slug) if check_market(slug, book) else None
+
+        await strategy.run_async()
+        self.assertEqual(client.fetched, ["tight", "wide", "gone"])
+        self.assertEqual(found, ["tight"])
+
+if __name__ == '__main__':
+    unittest.main()
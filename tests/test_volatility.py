@@ -0,0 +1,67 @@
+import math
+import os
+import random
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from volatility import RingBuffer, VolatilityEstimator, VolatilityEngine, SECONDS_PER_YEAR
+from data_feed import DataFeed
+
+def gbm_ticks(sigma, seconds, seed=7, start=100.0):
+    """One tick per second of a driftless geometric Brownian motion."""
+    rng = random.Random(seed)
+    step = sigma / math.sqrt(SECONDS_PER_YEAR)
+    price = start
+    for t in range(seconds):
+        price *= math.exp(rng.gauss(0.0, step))
+        yield price, float(t)
+
+class TestRingBuffer(unittest.TestCase):
+    def test_rolling_stats_match_window(self):
+        ring = RingBuffer(4)
+        for value in [1, 2, 3, 4, 5, 6, 7]:
+            ring.push(value)
+        self.assertEqual(len(ring), 4)
+        self.assertAlmostEqual(ring.mean(), 5.5)
+        self.assertAlmostEqual(ring.variance(), 5 / 3)
+
+class TestVolatilityEstimator(unittest.TestCase):
+    def setUp(self):
+        self.estimator = VolatilityEstimator(prior=0.3, bar_seconds=60, window=500,
+                                             half_lives=(3600, 6 * 3600), min_bars=20)
+
+    def test_prior_until_warm(self):
+        for price, ts in gbm_ticks(0.8, 600):
+            self.estimator.update(price, ts)
+        self.assertFalse(self.estimator.is_warm())
+        self.assertEqual(self.estimator.volatility(0.01), 0.3)
+
+    def test_estimates_converge_to_true_volatility(self):
+        for price, ts in gbm_ticks(0.8, 1000 * 60):
+            self.estimator.update(price, ts)
+        for estimate in (self.estimator.parkinson(), self.estimator.yang_zhang(),
+                         self.estimator.ewma_volatility(0), self.estimator.ewma_volatility(1)):
+            self.assertAlmostEqual(estimate, 0.8, delta=0.2)
+        # Memory stays bounded by the window
+        self.assertEqual(len(self.estimator.close_returns), 500)
+
+    def test_horizon_matches_expiry(self):
+        self.assertEqual(self.estimator.horizon_for(3600 / SECONDS_PER_YEAR), 0)
+        self.assertEqual(self.estimator.horizon_for(2 * 86400 / SECONDS_PER_YEAR), 1)
+
+class TestDataFeedVolatility(unittest.TestCase):
+    def test_streamed_ticks_feed_engine(self):
+        engine = VolatilityEngine(bar_seconds=1, min_bars=1)
+        feed = DataFeed(volatility=engine)
+        self.assertEqual(feed.get_volatility("BTC", 0.01), 0.6)
+        for price in (100.0, 101.0, 99.0):
+            feed._handle_message('{"data": {"s": "BTCUSDT", "p": "%s"}}' % price)
+        self.assertIn("BTCUSDT", engine.estimators)
+        # Without an engine the static priors are used
+        self.assertEqual(DataFeed().get_volatility("SOL", 0.01), 0.8)
+
+if __name__ == '__main__':
+    unittest.main()